@@ -3,12 +3,27 @@
 Professional dashboard combining Scrum Review, Performance Analytics, and OKR Tracking
 """
 
+import os
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-from connect_google_sheet import GoogleSheetConnector, get_sample_data, get_sample_okr_data
+from connect_google_sheet import GoogleSheetConnector, get_sample_data, get_sample_okr_data, show_diagnostics
+from data_service import (DatasetRequest, data_service, show_freshness, show_local_freshness,
+                          source_freshness_caption, sync_status_caption, sync_worker, webhook_ingest,
+                          webhook_server)
+from dataset_cache import dataset_cache
+from issue_metrics import DONE_STATUS, issue_cube, issue_filter_mask
+from linear_api import LinearApiLoader
+from linear_webhooks import webhook_caption
+from local_source import LocalFileSource
+from org_rollup import connect_team_sheets, parse_team_sheets
+from sheets_quota import quota_caption, sheets_quota
+
+# Issue columns this page reads; the loader parses only these
+ISSUE_COLUMNS = ['cycle', 'status', 'assignee', 'estimate', 'type', 'cycle_time_days']
+OKR_COLUMNS = ['objective', 'key_result', 'owner', 'target', 'current', 'progress', 'status']
 
 # Page configuration
 st.set_page_config(
@@ -647,7 +662,7 @@ def main():
         
         data_source = st.radio(
             "📊 Data Source:",
-            ["Sample Data", "Google Sheet"]
+            ["Sample Data", "Google Sheet", "Linear API", "Local File", "Org Rollup"]
         )
         
         if data_source == "Google Sheet":
@@ -700,10 +715,88 @@ def main():
             # Show connection status
             if 'connector' in st.session_state:
                 st.success("✅ Google Sheet Connected")
-                
-                # Show mapping confirmation messages
-                st.success("✅ Mapped 'Cycle Start' → 'cycle_start'")
-                st.success("✅ Mapped 'Cycle End' → 'cycle_end'")
+        
+        if data_source == "Linear API":
+            st.markdown("""
+            <div class="info-box">
+            <b>🛰️ Linear API:</b><br>
+            Live issues straight from Linear, no sheet in between<br>
+            1. Linear → Settings → API → create a personal API key<br>
+            2. Paste it below (or set <code>LINEAR_API_KEY</code>)
+            </div>
+            """, unsafe_allow_html=True)
+            
+            api_key = st.text_input("Linear API key:", value=os.environ.get("LINEAR_API_KEY", ""), type="password")
+            team_keys = st.text_input("Team keys (optional):", placeholder="ENG, MOB")
+            
+            if api_key and 'linear_loader' not in st.session_state:
+                if st.button("🔌 Connect", type="primary"):
+                    with st.spinner("🔌 Connecting to Linear..."):
+                        loader = LinearApiLoader()
+                        diagnostics = loader.connect(api_key, team_keys.split(',') if team_keys else None)
+                    show_diagnostics(diagnostics)
+                    if diagnostics.error is None:
+                        st.session_state.linear_loader = loader
+                        st.rerun()
+            
+            if 'linear_loader' in st.session_state:
+                st.success(f"✅ Linear connected ({len(st.session_state.linear_loader.teams)} teams)")
+        
+        if data_source == "Local File":
+            st.markdown("""
+            <div class="info-box">
+            <b>📂 Local File:</b><br>
+            A Linear CSV or Excel export, or a folder you drop exports into<br>
+            (the newest export is used and picked up when it changes)
+            </div>
+            """, unsafe_allow_html=True)
+            
+            local_path = st.text_input(
+                "CSV / Excel file or folder:",
+                placeholder="~/Downloads/linear-exports"
+            )
+            
+            if local_path:
+                source = st.session_state.get('local_source')
+                if source is None or source.path != LocalFileSource(local_path).path:
+                    st.session_state.local_source = LocalFileSource(local_path)
+                current = st.session_state.local_source.current_file()
+                if current is not None:
+                    st.success(f"✅ Watching {current.name}")
+                else:
+                    st.error("❌ No CSV or Excel export found at that path")
+        
+        if data_source == "Org Rollup":
+            st.markdown("""
+            <div class="info-box">
+            <b>🏢 Org Rollup:</b><br>
+            One line per team's Linear export:<br>
+            <code>Team name, sheet URL</code>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            team_sheets = st.text_area(
+                "Team sheets:",
+                placeholder="Platform, https://docs.google.com/spreadsheets/d/sheet-id/edit\nMobile, https://docs.google.com/spreadsheets/d/other-id/edit"
+            )
+            
+            if st.button("🔌 Connect all", type="primary"):
+                sources = parse_team_sheets(team_sheets)
+                if not sources:
+                    st.error("❌ Add at least one 'Team name, sheet URL' line")
+                else:
+                    # All team sheets are probed at once
+                    with st.spinner(f"🔌 Connecting to {len(sources)} team sheets..."):
+                        loaders, outcomes = connect_team_sheets(sources)
+                    for team, diagnostics in outcomes.items():
+                        if diagnostics.error:
+                            st.error(f"❌ {team}: {diagnostics.error}")
+                    if loaders:
+                        st.session_state.org_loaders = loaders
+                        st.rerun()
+            
+            if 'org_loaders' in st.session_state:
+                st.success(f"✅ {len(st.session_state.org_loaders)} team sheets connected")
         
         if data_source == "Sample Data":
             st.markdown("""
@@ -716,10 +809,30 @@ def main():
             """, unsafe_allow_html=True)
         
         if st.button("🔄 Refresh Data"):
+            if 'connector' in st.session_state:
+                st.session_state.connector.invalidate_cache()
+            for loader in st.session_state.get('org_loaders', {}).values():
+                loader.invalidate_cache()
+            if 'linear_loader' in st.session_state:
+                st.session_state.linear_loader.invalidate_cache()
             st.rerun()
+        
+        if data_source in ("Google Sheet", "Linear API", "Org Rollup"):
+            cache_stats = dataset_cache.stats()
+            st.caption(f"🗄️ Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+            if sync_worker is not None and sync_worker.metrics()['datasets']:
+                st.caption(sync_status_caption(sync_worker.metrics()))
+            if sheets_quota.metrics()['calls']:
+                st.caption(quota_caption(sheets_quota.metrics()))
+            if data_source == "Linear API" and webhook_server is not None:
+                st.caption(webhook_caption(webhook_ingest.metrics()))
+            elif webhook_server is not None:
+                st.caption("🪝 Webhooks only update the Linear API source; sheet data changes on its next sync")
     
     # Load data
     issues_df, okr_df = load_data(data_source)
+    if issues_df is None:
+        return
     
     # Main tabs
     tab1, tab2, tab3 = st.tabs([
@@ -744,21 +857,74 @@ def load_data(source):
     elif source == "Google Sheet":
         # Check if connector exists in session state
         if 'connector' in st.session_state:
+            connector = st.session_state.connector
             try:
-                issues = st.session_state.connector.load_issues_data()
-                okrs = st.session_state.connector.load_okr_data()
+                # Last good dataset right away; a stale one is refreshed in the background
+                # Issues and OKRs load side by side; the page waits for the slower one
+                loaded = data_service.load_all(connector, {
+                    'issues': DatasetRequest('issues', "Sheet1", ISSUE_COLUMNS),
+                    'OKRs': DatasetRequest('okrs', "OKRs", OKR_COLUMNS),
+                })
+                issues, okrs = loaded['issues'], loaded['OKRs']
+                
+                if issues is None:
+                    st.error("❌ Could not load issues from Google Sheet, and there is no saved copy yet")
+                    return None, None
                 
                 # Show success message if data loaded
-                if issues is not None and not issues.empty:
-                    st.success(f"✅ Loaded {len(issues)} issues from Google Sheet")
+                st.success(f"✅ Loaded {len(issues.frame)} issues from Google Sheet")
+                show_freshness(connector, issues, columns=ISSUE_COLUMNS)
                 
-                return issues, okrs
+                return issues.frame, okrs.frame if okrs is not None else None
             except Exception as e:
                 st.error(f"❌ Error loading data: {str(e)}")
-                return get_sample_data(), get_sample_okr_data()  # Fallback to sample data
+                return None, None
         else:
             # Return sample data if no connection - don't show error in main area
             return get_sample_data(), get_sample_okr_data()
+    elif source == "Linear API":
+        if 'linear_loader' not in st.session_state:
+            st.info("👈 Connect your Linear workspace in the sidebar")
+            return None, None
+        loader = st.session_state.linear_loader
+        issues = data_service.load_issues(loader, columns=ISSUE_COLUMNS)
+        if issues is None:
+            error = data_service.last_error(loader, 'issues', columns=ISSUE_COLUMNS)
+            st.error(f"❌ Could not load issues from Linear: {error}")
+            return None, None
+        st.success(f"✅ Loaded {len(issues.frame)} issues from {len(loader.teams)} Linear teams")
+        show_freshness(loader, issues, columns=ISSUE_COLUMNS)
+        # OKRs aren't tracked in Linear
+        return issues.frame, get_sample_okr_data()
+    elif source == "Local File":
+        if 'local_source' not in st.session_state:
+            st.info("👈 Enter a Linear export file or drop folder in the sidebar")
+            return None, None
+        local_source = st.session_state.local_source
+        issues, diagnostics = local_source.load_issues(columns=ISSUE_COLUMNS)
+        show_diagnostics(diagnostics)
+        if issues is None:
+            return None, None
+        st.success(f"✅ Loaded {len(issues)} issues from {local_source.path.name}")
+        show_local_freshness(local_source, columns=ISSUE_COLUMNS)
+        # OKRs aren't part of the Linear exports
+        return issues, get_sample_okr_data()
+    elif source == "Org Rollup":
+        if 'org_loaders' not in st.session_state:
+            st.info("👈 Connect your team sheets in the sidebar to see the org rollup")
+            return None, None
+        # Every team's sheet loads side by side and merges into one frame
+        rollup = data_service.load_org(st.session_state.org_loaders, columns=ISSUE_COLUMNS)
+        with st.expander(f"🏢 {len(rollup.sources)} team sheets"):
+            for team_source in rollup.sources:
+                st.caption(source_freshness_caption(team_source))
+        if rollup.frame.empty:
+            st.error("❌ None of the team sheets could be loaded, and there are no saved copies yet")
+            return None, None
+        loaded_teams = sum(1 for team_source in rollup.sources if team_source.as_of is not None)
+        st.success(f"✅ Loaded {len(rollup.frame)} issues from {loaded_teams} of {len(rollup.sources)} teams")
+        # OKRs aren't part of the Linear exports
+        return rollup.frame, None
     else:
         return get_sample_data(), get_sample_okr_data()
 
@@ -769,7 +935,7 @@ def scrum_dashboard(df):
     # Sprint filter - handle mixed data types safely with multi-select
     if 'cycle' in df.columns:
         # Clean cycle data - remove NaN and convert to string for consistent sorting
-        cycle_values = df['cycle'].dropna().astype(str).unique()
+        cycle_values = df['cycle'].dropna().unique()
         available_sprints = sorted([c for c in cycle_values if c != 'nan' and c.strip() != ''])
     else:
         available_sprints = []
@@ -788,90 +954,35 @@ def scrum_dashboard(df):
     else:
         st.warning("⚠️ No sprints selected. Please select at least one sprint to view data.")
     
-    # Filter data - handle string comparison safely with multi-select
-    if selected_sprints and 'cycle' in df.columns:
-        # Convert cycle column to string for comparison
-        df_temp = df.copy()
-        df_temp['cycle'] = df_temp['cycle'].astype(str)
-        filtered_df = df_temp[df_temp['cycle'].isin(selected_sprints)]
-    else:
-        filtered_df = df
+    # Cards and charts are slices of the dataset's cube, so changing sprints never touches the issues
+    cube = issue_cube(df)
+    sprint_filter = {'cycle': selected_sprints} if selected_sprints and 'cycle' in df.columns else {}
+    metrics = cube.metrics(**sprint_filter)
     
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         # Count completed story points instead of just completed issues
-        if 'estimate' in filtered_df.columns:
-            try:
-                completed_df = filtered_df[filtered_df['status'] == 'Done']
-                numeric_estimates = completed_df['estimate'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-                ).fillna(0)
-                completed_points = int(numeric_estimates.sum())
-            except:
-                completed_points = 0
-        else:
-            completed_points = 0
-        st.metric("✅ Completed Points", completed_points)
+        st.metric("✅ Completed Points", int(metrics.completed_points))
     
     with col2:
-        if 'estimate' in filtered_df.columns:
-            # Handle estimate column safely
-            try:
-                # Convert to numeric and sum, handling non-numeric values
-                numeric_estimates = filtered_df['estimate'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-                ).fillna(0)
-                total_points = int(numeric_estimates.sum())
-            except:
-                total_points = 0
-        else:
-            total_points = 0
-        st.metric("📊 Total Story Points", total_points)
+        st.metric("📊 Total Story Points", int(metrics.total_points))
     
     with col3:
-        if 'cycle_time_days' in filtered_df.columns:
-            try:
-                # Convert to numeric and calculate mean, handling non-numeric values
-                numeric_cycle_times = filtered_df['cycle_time_days'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else None
-                )
-                cycle_time = numeric_cycle_times.mean() if not numeric_cycle_times.isna().all() else 0
-            except:
-                cycle_time = 0
-        else:
-            cycle_time = 0
-        st.metric("⏱️ Cycle Time", f"{cycle_time:.1f}d")
+        st.metric("⏱️ Cycle Time", f"{metrics.mean_cycle_time:.1f}d")
     
     with col4:
-        # Calculate completion rate based on story points
-        if total_points > 0:
-            rate = (completed_points / total_points * 100)
-        else:
-            rate = 0
-        st.metric("🎯 Completion Rate", f"{rate:.1f}%")
+        # Completion rate based on story points
+        st.metric("🎯 Completion Rate", f"{metrics.points_rate:.1f}%")
     
     # Charts
     col1, col2 = st.columns(2)
     
     with col1:
-        # Velocity chart - handle data types safely and respect filter
+        # Velocity chart - respects the sprint filter
         if 'cycle' in df.columns and 'estimate' in df.columns:
-            # Use filtered data for velocity calculation
-            velocity_data = df[df['status'] == 'Done'].copy()
-            velocity_data['cycle'] = velocity_data['cycle'].astype(str)
-            
-            # Filter by selected sprints if any
-            if selected_sprints:
-                velocity_data = velocity_data[velocity_data['cycle'].isin(selected_sprints)]
-            
-            # Convert estimates to numeric, replacing non-numeric with 0
-            velocity_data['estimate'] = velocity_data['estimate'].apply(
-                lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-            ).fillna(0)
-            
-            velocity = velocity_data.groupby('cycle')['estimate'].sum().reset_index()
+            velocity = cube.by('cycle', status=DONE_STATUS, **sprint_filter)['total_points'].rename('estimate').reset_index()
             if not velocity.empty and len(velocity) > 0:
                 fig = px.bar(velocity, x='cycle', y='estimate', 
                            title="📈 Sprint Velocity (Filtered)",
@@ -881,28 +992,15 @@ def scrum_dashboard(df):
                 st.plotly_chart(fig, use_container_width=True)
         
         # Status pie chart
-        status_counts = filtered_df['status'].value_counts()
+        status_counts = cube.by('status', **sprint_filter)['issues']
         fig = px.pie(values=status_counts.values, names=status_counts.index, title="📊 Status Distribution")
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Burndown simulation - use filtered data
-        if 'estimate' in filtered_df.columns:
-            try:
-                # Calculate total and completed points from filtered data
-                numeric_estimates = filtered_df['estimate'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-                ).fillna(0)
-                total_points = numeric_estimates.sum()
-                
-                completed_df = filtered_df[filtered_df['status'] == 'Done']
-                completed_numeric = completed_df['estimate'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-                ).fillna(0)
-                completed_points = completed_numeric.sum()
-            except:
-                total_points = 100
-                completed_points = 50
+        if 'estimate' in df.columns:
+            total_points = metrics.total_points
+            completed_points = metrics.completed_points
         else:
             total_points = 100
             completed_points = 50
@@ -917,9 +1015,9 @@ def scrum_dashboard(df):
         fig.update_layout(title="🔥 Sprint Burndown (Filtered)", height=400)
         st.plotly_chart(fig, use_container_width=True)
         
-        # Cycle time histogram
-        if 'cycle_time_days' in filtered_df.columns:
-            cycle_data = filtered_df.dropna(subset=['cycle_time_days'])
+        # Cycle time histogram - the one chart that needs the issues themselves
+        if 'cycle_time_days' in df.columns:
+            cycle_data = df[issue_filter_mask(df, **sprint_filter)].dropna(subset=['cycle_time_days'])
             if not cycle_data.empty:
                 fig = px.histogram(cycle_data, x='cycle_time_days', title="⏳ Cycle Time Distribution")
                 st.plotly_chart(fig, use_container_width=True)
@@ -949,7 +1047,7 @@ def performance_dashboard(df):
     with col1:
         # Handle cycle data safely with multi-select
         if 'cycle' in df.columns:
-            cycle_values = df['cycle'].dropna().astype(str).unique()
+            cycle_values = df['cycle'].dropna().unique()
             available_sprints = sorted([c for c in cycle_values if c != 'nan' and c.strip() != ''])
         else:
             available_sprints = []
@@ -966,7 +1064,7 @@ def performance_dashboard(df):
     with col2:
         # Handle assignee data safely
         if 'assignee' in df.columns:
-            assignee_values = df['assignee'].dropna().astype(str).unique()
+            assignee_values = df['assignee'].dropna().unique()
             people = ['All'] + sorted([p for p in assignee_values if p != 'nan' and p.strip() != ''])
         else:
             people = ['All']
@@ -975,121 +1073,71 @@ def performance_dashboard(df):
     with col3:
         # Handle type data safely  
         if 'type' in df.columns:
-            type_values = df['type'].dropna().astype(str).unique()
+            type_values = df['type'].dropna().unique()
             types = ['All'] + sorted([t for t in type_values if t != 'nan' and t.strip() != ''])
         else:
             types = ['All']
         work_type = st.selectbox("🏷️ Type:", types, key="perf_type")
     
-    # Apply filters - handle string comparisons safely
-    filtered_df = df.copy()
+    # Apply filters - as slices of the dataset's cube rather than of the issues
+    cube = issue_cube(df)
+    perf_filter = {}
     if selected_sprints_perf and 'cycle' in df.columns:
-        filtered_df['cycle'] = filtered_df['cycle'].astype(str)
-        filtered_df = filtered_df[filtered_df['cycle'].isin(selected_sprints_perf)]
+        perf_filter['cycle'] = selected_sprints_perf
     if person != 'All' and 'assignee' in df.columns:
-        filtered_df['assignee'] = filtered_df['assignee'].astype(str)
-        filtered_df = filtered_df[filtered_df['assignee'] == person]
+        perf_filter['assignee'] = person
     if work_type != 'All' and 'type' in df.columns:
-        filtered_df['type'] = filtered_df['type'].astype(str)
-        filtered_df = filtered_df[filtered_df['type'] == work_type]
+        perf_filter['type'] = work_type
+    metrics = cube.metrics(**perf_filter)
+    by_person = cube.by('assignee', **perf_filter) if 'assignee' in df.columns else None
     
     # Metrics
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.metric("📋 Assigned", len(filtered_df))
+        st.metric("📋 Assigned", metrics.issues)
     with col2:
         # Count completed story points instead of just completed issues
-        if 'estimate' in filtered_df.columns:
-            try:
-                completed_df = filtered_df[filtered_df['status'] == 'Done']
-                numeric_estimates = completed_df['estimate'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-                ).fillna(0)
-                completed_points = int(numeric_estimates.sum())
-            except:
-                completed_points = 0
-        else:
-            completed_points = 0
-        st.metric("✅ Completed Points", completed_points)
+        st.metric("✅ Completed Points", int(metrics.completed_points))
     with col3:
-        # Calculate completion rate based on story points
-        if 'estimate' in filtered_df.columns:
-            try:
-                total_numeric = filtered_df['estimate'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-                ).fillna(0)
-                total_points = total_numeric.sum()
-                rate = (completed_points / total_points * 100) if total_points > 0 else 0
-            except:
-                rate = 0
-        else:
-            rate = 0
-        st.metric("🎯 Points Rate", f"{rate:.1f}%")
+        # Completion rate based on story points
+        st.metric("🎯 Points Rate", f"{metrics.points_rate:.1f}%")
     with col4:
-        # Handle cycle time safely
-        if 'cycle_time_days' in filtered_df.columns:
-            try:
-                numeric_cycle_times = filtered_df['cycle_time_days'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else None
-                )
-                cycle_avg = numeric_cycle_times.mean() if not numeric_cycle_times.isna().all() else 0
-            except:
-                cycle_avg = 0
-        else:
-            cycle_avg = 0
-        st.metric("⏱️ Cycle Time", f"{cycle_avg:.1f}d")
+        st.metric("⏱️ Cycle Time", f"{metrics.mean_cycle_time:.1f}d")
     with col5:
-        # Handle estimate safely
-        if 'estimate' in filtered_df.columns:
-            try:
-                numeric_estimates = filtered_df['estimate'].apply(
-                    lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0
-                ).fillna(0)
-                points = int(numeric_estimates.sum())
-            except:
-                points = 0
-        else:
-            points = 0
-        st.metric("📈 Points", points)
+        st.metric("📈 Points", int(metrics.total_points))
     
     # Charts
     col1, col2 = st.columns(2)
     
     with col1:
         # Completion by person
-        if 'assignee' in filtered_df.columns:
-            completion_data = filtered_df.groupby('assignee').agg({
-                'status': lambda x: (x == 'Done').sum(),
-                'assignee': 'count'
-            }).rename(columns={'status': 'completed', 'assignee': 'total'}).reset_index()
+        if 'assignee' in df.columns:
+            completion_data = by_person[['completed_issues', 'issues']].rename(
+                columns={'completed_issues': 'completed', 'issues': 'total'}).reset_index()
             
             fig = px.bar(completion_data, x='assignee', y=['completed', 'total'],
                         title="👥 Completed vs Assigned", barmode='group')
             st.plotly_chart(fig, use_container_width=True)
         
         # Cycle time by person
-        if 'assignee' in filtered_df.columns and 'cycle_time_days' in filtered_df.columns:
-            cycle_data = filtered_df.dropna(subset=['cycle_time_days'])
-            if not cycle_data.empty:
-                avg_cycle = cycle_data.groupby('assignee')['cycle_time_days'].mean().reset_index()
+        if 'assignee' in df.columns and 'cycle_time_days' in df.columns:
+            avg_cycle = by_person['mean_cycle_time'].dropna().rename('cycle_time_days').reset_index()
+            if not avg_cycle.empty:
                 fig = px.bar(avg_cycle, x='assignee', y='cycle_time_days', title="⏳ Cycle Time by Person")
                 st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Workload distribution
-        if 'assignee' in filtered_df.columns:
-            workload = filtered_df['assignee'].value_counts().reset_index()
-            workload.columns = ['assignee', 'issues']
+        if 'assignee' in df.columns:
+            workload = by_person['issues'].reset_index()
             
             fig = px.pie(workload, values='issues', names='assignee', title="📈 Workload Distribution")
             st.plotly_chart(fig, use_container_width=True)
         
         # Points comparison
-        if 'assignee' in filtered_df.columns and 'estimate' in filtered_df.columns:
-            points_data = filtered_df.groupby('assignee').agg({
-                'estimate': ['sum', lambda x: x[filtered_df.loc[x.index, 'status'] == 'Done'].sum()]
-            }).round(1)
+        if 'assignee' in df.columns and 'estimate' in df.columns:
+            points_data = by_person[['total_points', 'completed_points']].round(1)
             points_data.columns = ['estimated', 'completed']
             points_data = points_data.reset_index()
             
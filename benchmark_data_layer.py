@@ -0,0 +1,723 @@
+"""
+⏱️ Data Layer Benchmarks
+Measures the ingestion pipeline against a local stand-in for the Google Sheets CSV export
+
+Usage:
+    python benchmark_data_layer.py ingest --rows 50000
+    python benchmark_data_layer.py schema --rows 50000
+    python benchmark_data_layer.py coalesce --sessions 20
+    python benchmark_data_layer.py xlsx --rows 5000 10000 20000 40000
+    python benchmark_data_layer.py linear --teams 6 --rows 12000
+    python benchmark_data_layer.py webhooks --events 20000 --rows 10000
+    python benchmark_data_layer.py metrics --rows 50000
+    python benchmark_data_layer.py cube --rows 10000 50000 200000
+    python benchmark_data_layer.py filters --rows 10000 50000 200000
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import hmac
+import http.client
+import http.server
+import io
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+LINEAR_HEADER = [
+    'ID', 'Team', 'Title', 'Description', 'Status', 'Estimate', 'Priority', 'Project ID', 'Project',
+    'Creator', 'Assignee', 'Labels', 'Cycle Number', 'Cycle Name', 'Cycle Start', 'Cycle End',
+    'Created', 'Updated', 'Started', 'Triaged', 'Completed', 'Canceled', 'Archived', 'Due Date',
+    'Parent issue', 'Initiatives', 'Project Milestone ID', 'Project Milestone', 'SLA Status', 'Roadmaps',
+]
+
+
+def make_linear_csv(rows: int, seed: int = 7) -> bytes:
+    """
+    Build a Linear-shaped CSV export with realistic column widths
+    """
+    rng = random.Random(seed)
+    date_format = '%m/%d/%Y %H:%M:%S'
+    people = [f'person{i}@hedral.co' for i in range(12)]
+    statuses = ['Backlog', 'Todo', 'In Progress', 'In Review', 'Done', 'Canceled']
+    words = ['zoning', 'parser', 'onboarding', 'API', 'setbacks', 'chatbot', 'SSO', 'export', 'retry', 'cache']
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(LINEAR_HEADER)
+    start = datetime(2023, 1, 1)
+    for i in range(rows):
+        created = start + timedelta(minutes=rng.randint(0, 60 * 24 * 900))
+        cycle = rng.randint(1, 60)
+        done = rng.random() < 0.6
+        started = created + timedelta(hours=rng.randint(1, 72))
+        completed = started + timedelta(hours=rng.randint(2, 400)) if done else None
+        description = ' '.join(rng.choice(words) for _ in range(rng.randint(20, 120)))
+        writer.writerow([
+            f'SWE-{i + 1}', 'Software', f'{rng.choice(words).title()} {rng.choice(words)} #{i}', description,
+            'Done' if done else rng.choice(statuses[:4]), rng.choice(['', 1, 2, 3, 5, 8]),
+            rng.choice(['No priority', 'Low', 'Medium', 'High', 'Urgent']),
+            f'd48fc7ec-c55e-4011-91a2-e4bde2d8{rng.randint(100, 999)}', rng.choice(['Development', 'API Integration']),
+            rng.choice(people), rng.choice(people), rng.choice(['Bug', 'Feature', 'Task', 'Bug, Feature']),
+            cycle, f'Cycle {cycle}', created.strftime(date_format), (created + timedelta(days=14)).strftime(date_format),
+            created.strftime(date_format), (created + timedelta(days=rng.randint(0, 30))).strftime(date_format),
+            started.strftime(date_format), '', completed.strftime(date_format) if completed else '',
+            '', '', '', '', 'Q3 roadmap' if rng.random() < 0.1 else '', '', '', '', 'Platform 2025',
+        ])
+    return out.getvalue().encode()
+
+
+def make_linear_xlsx(rows: int, path: str) -> None:
+    """
+    Write the same Linear-shaped export as an Excel workbook
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Issues')
+    for row in csv.reader(io.StringIO(make_linear_csv(rows).decode())):
+        sheet.append([value or None for value in row])
+    workbook.save(path)
+
+
+def serve_bytes(body: bytes, delay: float = 0.0):
+    """
+    Serve body for every GET on a local port, after delay seconds (a slow
+    upstream); returns (server, base_url). server.requests counts the GETs.
+    """
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with self.server.requests_lock:
+                self.server.requests += 1
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.requests = 0
+    server.requests_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def _linear_node(row: dict) -> dict:
+    """
+    One export row as the issue node Linear's GraphQL API would return
+    """
+    def iso(value):
+        return datetime.strptime(value, '%m/%d/%Y %H:%M:%S').strftime('%Y-%m-%dT%H:%M:%S.000Z') if value else None
+
+    def person(email):
+        return {'email': email} if email else None
+
+    return {
+        'identifier': row['ID'], 'team': {'name': row['Team']}, 'title': row['Title'],
+        'description': row['Description'], 'state': {'name': row['Status']},
+        'estimate': float(row['Estimate']) if row['Estimate'] else None, 'priorityLabel': row['Priority'],
+        'project': {'id': row['Project ID'], 'name': row['Project']},
+        'creator': person(row['Creator']), 'assignee': person(row['Assignee']),
+        'labels': {'nodes': [{'name': name} for name in row['Labels'].split(', ') if name]},
+        'cycle': {'number': int(row['Cycle Number']), 'name': row['Cycle Name'],
+                  'startsAt': iso(row['Cycle Start']), 'endsAt': iso(row['Cycle End'])},
+        'createdAt': iso(row['Created']), 'updatedAt': iso(row['Updated']), 'startedAt': iso(row['Started']),
+        'triagedAt': iso(row['Triaged']), 'completedAt': iso(row['Completed']),
+        'canceledAt': iso(row['Canceled']), 'archivedAt': None, 'dueDate': row['Due Date'] or None,
+        'parent': None, 'projectMilestone': None,
+    }
+
+
+def serve_linear_api(export: bytes, teams: int, delay: float = 0.0):
+    """
+    A local stand-in for Linear's GraphQL API serving the export's rows,
+    split across teams, with cursor pagination; returns (server, url).
+    server.requests counts the queries and server.selections the issue
+    field selections asked for. Append (status, body, headers) to
+    server.failures to answer the next queries with those instead.
+    """
+    nodes = [_linear_node(row) for row in csv.DictReader(io.StringIO(export.decode()))]
+    team_nodes = {f'team-{i}': nodes[i::teams] for i in range(teams)}
+
+    def page(items, variables):
+        start = int(variables.get('after') or 0)
+        end = start + variables['first']
+        return {'nodes': items[start:end],
+                'pageInfo': {'hasNextPage': end < len(items), 'endCursor': str(min(end, len(items)))}}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            query, variables = request['query'], request['variables']
+            with self.server.requests_lock:
+                self.server.requests += 1
+                failure = self.server.failures.pop(0) if self.server.failures else None
+            time.sleep(delay)
+            if failure is not None:
+                status, body, headers = failure
+                return self._reply(status, body, headers)
+            if 'organization' in query:
+                teams_page = page([{'id': team_id, 'key': f'T{i}', 'name': f'Team {i}'}
+                                   for i, team_id in enumerate(team_nodes)], variables)
+                data = {'organization': {'id': 'org-bench', 'name': 'Bench'}, 'teams': teams_page}
+            else:
+                with self.server.requests_lock:
+                    self.server.selections.add(query[query.index('nodes {') + 7:query.index('} pageInfo')].strip())
+                data = {'team': {'issues': page(team_nodes[variables['team']], variables)}}
+            self._reply(200, json.dumps({'data': data}).encode())
+
+        def _reply(self, status, body, headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.requests = 0
+    server.failures = []
+    server.selections = set()
+    server.requests_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/graphql'
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _ingest_worker(csv_url: str, sheet_id: str, streaming: bool, columns, results):
+    """
+    Load the sheet once in a fresh process so ru_maxrss reflects only this mode
+    """
+    from sheet_loader import SheetLoader
+
+    loader = SheetLoader(streaming=streaming)
+    loader.sheet_id, loader.gid, loader.csv_url = sheet_id, '0', csv_url
+    baseline = _peak_rss_mb()
+    df, diagnostics = loader.load_issues(columns=columns)
+    results.put({
+        'rows': len(df),
+        'seconds': diagnostics.seconds,
+        'peak_growth_mb': _peak_rss_mb() - baseline,
+        'frame_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
+        'source': diagnostics.source,
+    })
+
+
+def benchmark_ingest(rows: int):
+    body = make_linear_csv(rows)
+    server, base_url = serve_bytes(body)
+    print(f"📦 Export: {rows} rows, {len(body) / 1024 / 1024:.1f} MB of CSV")
+
+    context = multiprocessing.get_context('spawn')
+    # The column set the main dashboards declare
+    dashboard_columns = ['cycle', 'status', 'assignee', 'estimate', 'type', 'cycle_time_days']
+    # Each mode loads its own sheet id so it can't start from another mode's snapshot;
+    # the last one restarts against the snapshot the one before it saved
+    modes = [
+        ('buffered (response.text + StringIO)', 'buffered', False, None),
+        ('streaming (chunked)', 'streaming', True, None),
+        ('streaming, dashboard columns only', 'projected', True, dashboard_columns),
+        ('restart from local snapshot', 'projected', True, dashboard_columns),
+    ]
+    for label, sheet_id, streaming, columns in modes:
+        results = context.Queue()
+        process = context.Process(target=_ingest_worker,
+                                  args=(f'{base_url}/export', sheet_id, streaming, columns, results))
+        process.start()
+        result = results.get()
+        process.join()
+        print(f"  {label:38s} {result['seconds']:.2f}s  "
+              f"peak RSS +{result['peak_growth_mb']:.0f} MB  final frame {result['frame_mb']:.0f} MB  "
+              f"(from {result['source']})")
+    server.shutdown()
+
+
+def _xlsx_worker(path: str, streaming: bool, results):
+    """
+    Read the workbook once in a fresh process so ru_maxrss reflects only this mode
+    """
+    import openpyxl
+    import pandas as pd
+    from linear_schema import apply_column_plan, apply_issue_schema, compile_column_plan
+    from local_source import read_linear_xlsx
+
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    if streaming:
+        df = read_linear_xlsx(path)
+    else:
+        # Full workbook object model, every cell loaded before the frame is built
+        sheet = openpyxl.load_workbook(path).worksheets[0]
+        header, *rows = sheet.values
+        df = pd.DataFrame(rows, columns=header)
+        df = apply_issue_schema(apply_column_plan(df, compile_column_plan(tuple(df.columns))))
+    frame_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    results.put({
+        'rows': len(df),
+        'seconds': time.perf_counter() - start,
+        'peak_growth_mb': _peak_rss_mb() - baseline,
+        'frame_mb': frame_mb,
+    })
+
+
+def benchmark_xlsx(row_counts):
+    context = multiprocessing.get_context('spawn')
+    workdir = tempfile.mkdtemp(prefix='dashboard-xlsx-')
+    print("📗 Excel import: peak RSS growth as the export grows")
+    for rows in row_counts:
+        path = os.path.join(workdir, f'linear-{rows}.xlsx')
+        make_linear_xlsx(rows, path)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        for label, streaming in [('workbook model', False), ('streamed (read-only)', True)]:
+            results = context.Queue()
+            process = context.Process(target=_xlsx_worker, args=(path, streaming, results))
+            process.start()
+            result = results.get()
+            process.join()
+            print(f"  {rows:>7} rows ({size_mb:4.1f} MB)  {label:22s} {result['seconds']:6.2f}s  "
+                  f"peak RSS +{result['peak_growth_mb']:4.0f} MB  final frame {result['frame_mb']:3.0f} MB")
+
+
+def benchmark_linear(teams: int, rows: int):
+    import linear_api
+    from linear_api import LinearApiLoader
+
+    export = make_linear_csv(rows)
+    # 20ms per query, roughly a nearby API's round trip
+    server, url = serve_linear_api(export, teams, delay=0.02)
+    columns = ['cycle', 'status', 'assignee', 'estimate', 'type', 'cycle_time_days']
+    print(f"🛰️ Linear GraphQL stand-in: {rows} issues across {teams} teams, {linear_api.PAGE_SIZE} per page")
+
+    for label, workers in [('one team at a time', 1), (f'{linear_api.TEAM_WORKERS} teams at once', linear_api.TEAM_WORKERS)]:
+        linear_api.TEAM_WORKERS = workers
+        loader = LinearApiLoader(api_url=url)
+        loader.connect('bench-key')
+        loader.invalidate_cache()
+        server.requests = 0
+        df, diagnostics = loader.load_issues(columns=columns)
+        print(f"  {label:22s} {diagnostics.seconds:.2f}s  {server.requests} queries  {len(df)} issues")
+    server.shutdown()
+    print(f"  fields requested: {' | '.join(sorted(server.selections))}")
+
+
+def record_webhook_payloads(export: bytes, events: int, teams: int, seed: int = 11) -> list:
+    """
+    Issue webhook payloads shaped like Linear's, against the export's issues:
+    mostly status/assignee updates, some creates and removes
+    """
+    rng = random.Random(seed)
+    rows = list(csv.DictReader(io.StringIO(export.decode())))
+    statuses = ['Todo', 'In Progress', 'In Review', 'Done']
+    now = datetime.utcnow()
+    payloads = []
+    for i in range(events):
+        index = rng.randrange(len(rows))
+        node = _linear_node(rows[index])
+        action = rng.choices(['update', 'create', 'remove'], weights=[93, 5, 2])[0]
+        if action == 'create':
+            node['identifier'] = f'SWE-{len(rows) + i + 1}'
+        node.update(state={'name': rng.choice(statuses)}, assignee={'name': 'x', 'email': f'person{rng.randrange(12)}@hedral.co'},
+                    updatedAt=(now + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                    teamId=f'team-{index % teams}')
+        # Webhooks send labels as a plain list
+        node['labels'] = node['labels']['nodes']
+        payloads.append({'action': action, 'type': 'Issue', 'organizationId': 'org-bench', 'data': node})
+    return payloads
+
+
+def benchmark_webhooks(events: int, rows: int, clients: int = 8):
+    from data_service import DataService
+    from linear_api import LinearApiLoader
+    from linear_webhooks import WebhookIngest, serve_webhooks
+
+    teams = 4
+    export = make_linear_csv(rows)
+    api, url = serve_linear_api(export, teams)
+    loader = LinearApiLoader(api_url=url)
+    loader.connect('bench-key')
+    columns = ['cycle', 'status', 'assignee', 'estimate', 'type', 'cycle_time_days']
+    service = DataService()
+    before = service.load_issues(loader, columns=columns)
+    api_queries = api.requests
+
+    secret = 'bench-secret'
+    ingest = WebhookIngest(service)
+    server = serve_webhooks(ingest, port=0, secret=secret)
+    payloads = record_webhook_payloads(export, events, teams)
+    print(f"🪝 Replaying {events} recorded issue webhooks into a {len(before.frame)}-issue dataset "
+          f"from {clients} senders")
+
+    # Recorded deliveries: bodies serialized and signed up front, so the replay measures the receiver
+    sent_at = int(time.time() * 1000)
+    bodies = [json.dumps(dict(payload, webhookTimestamp=sent_at)).encode() for payload in payloads]
+    signatures = [hmac.new(secret.encode(), body, hashlib.sha256).hexdigest() for body in bodies]
+
+    def send(sender):
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+        codes = []
+        for i in range(sender, events, clients):
+            connection.request('POST', '/linear', body=bodies[i], headers={'Linear-Signature': signatures[i]})
+            response = connection.getresponse()
+            response.read()
+            codes.append(response.status)
+        connection.close()
+        return codes
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=clients) as pool:
+        statuses = [code for codes in pool.map(send, range(clients)) for code in codes]
+    accepted = time.perf_counter() - start
+    ingest.wait_for(events)
+    applied = time.perf_counter() - start
+    server.shutdown()
+    api.shutdown()
+
+    metrics = ingest.metrics()
+    after = service.load_issues(loader, columns=columns)
+    print(f"  accepted {statuses.count(200)}/{events} in {accepted:.2f}s ({events / accepted:,.0f}/s over HTTP)")
+    print(f"  applied  {metrics['applied']} in {applied:.2f}s ({events / applied:,.0f}/s end to end) "
+          f"in {metrics['batches']} batches; {metrics['ignored']} arrived after a newer change and were skipped")
+    print(f"  dataset: version {before.number} → {after.number}, {len(before.frame)} → {len(after.frame)} issues, "
+          f"{api.requests - api_queries} API queries during the replay")
+
+    # The receiver alone: payloads queued in-process, no HTTP
+    direct_service = DataService()
+    direct_service.load_issues(loader, columns=columns)
+    direct = WebhookIngest(direct_service)
+    start = time.perf_counter()
+    for payload in payloads:
+        direct.submit(payload)
+    direct.wait_for(events)
+    elapsed = time.perf_counter() - start
+    print(f"  in-process apply: {events} in {elapsed:.2f}s ({events / elapsed:,.0f}/s) "
+          f"in {direct.metrics()['batches']} batches")
+
+    # Whatever order they arrived in, an issue's newest change decides its state
+    final = {}
+    for payload in sorted(payloads, key=lambda payload: payload['data']['updatedAt']):
+        final[payload['data']['identifier']] = payload
+    statuses_now = after.frame.set_index('id')['status']
+    matches = sum(1 for issue_id, payload in final.items()
+                  if (payload['action'] == 'remove') == (issue_id not in statuses_now.index)
+                  and (payload['action'] == 'remove' or statuses_now[issue_id] == payload['data']['state']['name']))
+    print(f"  issues matching their last event: {matches}/{len(final)}")
+
+
+def benchmark_coalesce(sessions: int, rows: int):
+    from sheet_loader import SheetLoader
+    from single_flight import single_flight
+
+    # A slow upstream so every session's load overlaps the first one
+    server, base_url = serve_bytes(make_linear_csv(rows), delay=0.5)
+    print(f"👥 {sessions} sessions pressing 🔄 Refresh Data on one {rows}-row sheet at once")
+
+    start_together = threading.Barrier(sessions)
+    frames = [None] * sessions
+
+    def session(i):
+        # Each session has its own loader, as each browser tab has its own connector
+        loader = SheetLoader()
+        loader.sheet_id, loader.gid, loader.csv_url = 'coalesce', '0', f'{base_url}/export'
+        loader.invalidate_cache()
+        start_together.wait()
+        frames[i] = loader.load_issues().frame
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    loaded = sum(1 for df in frames if df is not None and len(df) == rows)
+    stats = single_flight.stats()
+    print(f"  upstream requests: {server.requests}")
+    print(f"  sessions with data: {loaded}/{sessions}  "
+          f"({stats['executions']} load ran, {stats['coalesced']} joined it) in {elapsed:.2f}s")
+
+
+def _untyped_issues(raw):
+    """
+    The pre-schema pipeline: object columns, inferred dates, float64 numbers
+    """
+    import pandas as pd
+
+    df = raw.rename(columns={'Status': 'status', 'Assignee': 'assignee', 'Cycle Name': 'cycle',
+                             'Priority': 'priority', 'Team': 'team', 'Labels': 'labels',
+                             'Estimate': 'estimate', 'Created': 'createdat', 'Started': 'startedat',
+                             'Completed': 'completedat', 'Updated': 'updatedat'})
+    for col in ['status', 'assignee', 'cycle', 'priority', 'team', 'labels']:
+        df[col] = df[col].astype(object)
+    for col in ['createdat', 'completedat', 'updatedat', 'startedat']:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+    df['estimate'] = pd.to_numeric(df['estimate'], errors='coerce')
+    return df
+
+
+def _time_filters(df, repeats: int = 20) -> float:
+    """
+    Seconds per rerun of the dashboards' typical filter + groupby work
+    """
+    cycles = list(df['cycle'].dropna().unique()[:5])
+    start = time.perf_counter()
+    for _ in range(repeats):
+        filtered = df[df['cycle'].isin(cycles) & (df['assignee'] != 'nobody')]
+        filtered.groupby('assignee', observed=True)['estimate'].sum()
+        filtered['status'].value_counts()
+    return (time.perf_counter() - start) / repeats
+
+
+def benchmark_schema(rows: int):
+    import pandas as pd
+    from linear_schema import apply_issue_schema, memory_report
+
+    raw = pd.read_csv(io.BytesIO(make_linear_csv(rows)))
+    before = _untyped_issues(raw)
+
+    start = time.perf_counter()
+    after = apply_issue_schema(before.copy())
+    schema_seconds = time.perf_counter() - start
+
+    columns = ['status', 'assignee', 'cycle', 'priority', 'team', 'labels', 'estimate',
+               'createdat', 'startedat', 'completedat', 'updatedat', 'cycle_time_days']
+    report = memory_report(before[columns[:-1]], after[columns])
+    print(f"📋 Memory report for {rows} issues (schema applied in {schema_seconds:.2f}s)")
+    print(report.to_string())
+    print(f"  total: {report['mb_before'].sum():.1f} MB → {report['mb_after'].sum():.1f} MB")
+    print(f"⚡ filter + groupby per rerun: {_time_filters(before) * 1000:.1f} ms untyped, "
+          f"{_time_filters(after) * 1000:.1f} ms typed")
+
+
+def _per_card_metrics(filtered_df):
+    """
+    The KPI cards as the scrum and performance pages computed them: each
+    card converting its own column cell by cell
+    """
+    import pandas as pd
+
+    def points(frame):
+        return frame['estimate'].apply(lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else 0).fillna(0)
+
+    completed_df = filtered_df[filtered_df['status'] == 'Done']
+    completed_points = int(points(completed_df).sum())
+    total_points = int(points(filtered_df).sum())
+    cycle_times = filtered_df['cycle_time_days'].apply(
+        lambda x: pd.to_numeric(x, errors='coerce') if pd.notnull(x) else None)
+    cycle_time = cycle_times.mean() if not cycle_times.isna().all() else 0
+    # Burndown, then the performance page's points rate and points cards
+    points(filtered_df).sum()
+    points(filtered_df[filtered_df['status'] == 'Done']).sum()
+    rate = completed_points / total_points * 100 if total_points > 0 else 0
+    int(points(filtered_df).sum())
+    return len(filtered_df), completed_points, total_points, cycle_time, rate
+
+
+def benchmark_metrics(rows: int, repeats: int = 5):
+    from issue_metrics import issue_metrics
+    from local_source import read_linear_csv
+
+    df = read_linear_csv(make_linear_csv(rows))
+    cycles = list(df['cycle'].dropna().unique()[:3])
+    mask = df['cycle'].isin(cycles).to_numpy()
+    print(f"📐 KPI cards for {mask.sum()} of {rows} issues ({len(cycles)} sprints selected)")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        before = _per_card_metrics(df[mask])
+    per_card = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        metrics = issue_metrics(df, mask)
+    one_pass = (time.perf_counter() - start) / repeats
+
+    after = (metrics.issues, int(metrics.completed_points), int(metrics.total_points),
+             metrics.mean_cycle_time, metrics.points_rate)
+    same = before[:3] == after[:3] and abs(before[3] - after[3]) < 1e-6 and abs(before[4] - after[4]) < 1e-6
+    print(f"  per-card conversions: {per_card * 1000:8.1f} ms per rerun")
+    print(f"  one vectorized pass:  {one_pass * 1000:8.1f} ms per rerun  ({per_card / one_pass:.0f}x)")
+    print(f"  same numbers: {'✅' if same else '❌'}  {after[:3]}, {after[3]:.2f}d, {after[4]:.1f}%")
+
+
+def _filter_changes(df, count: int = 20) -> list:
+    """
+    A session clicking through the Performance tab's filters
+    """
+    rng = random.Random(3)
+    cycles = sorted(df['cycle'].dropna().unique())
+    people = sorted(df['assignee'].dropna().unique())
+    return [{'cycle': rng.sample(cycles, 3), 'assignee': rng.choice([None, rng.choice(people)])} for _ in range(count)]
+
+
+def benchmark_cube(row_counts):
+    import numpy as np
+
+    from issue_metrics import issue_cube, issue_filter_mask, issue_metrics, metrics_by
+    from local_source import read_linear_csv
+
+    print("🧊 One filter change = 4 KPI cards + per-person, per-status and per-sprint charts")
+    for rows in row_counts:
+        df = read_linear_csv(make_linear_csv(rows))
+        changes = _filter_changes(df)
+
+        start = time.perf_counter()
+        for filters in changes:
+            mask = issue_filter_mask(df, **filters)
+            rows_result = (issue_metrics(df, mask), metrics_by(df, 'assignee', mask),
+                           metrics_by(df, 'status', mask), metrics_by(df, 'cycle', mask))
+        per_rows = (time.perf_counter() - start) / len(changes)
+
+        start = time.perf_counter()
+        cube = issue_cube(df)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for filters in changes:
+            cube = issue_cube(df)
+            cube_result = (cube.metrics(**filters), cube.by('assignee', **filters),
+                           cube.by('status', **filters), cube.by('cycle', **filters))
+        per_cube = (time.perf_counter() - start) / len(changes)
+
+        same = rows_result[0] == cube_result[0] and all(
+            a.index.equals(b.index) and np.allclose(a.fillna(-1).to_numpy(), b.fillna(-1).to_numpy())
+            for a, b in zip(rows_result[1:], cube_result[1:]))
+        print(f"  {rows:7d} issues → {len(cube):6d} cells (built in {build * 1000:5.1f} ms):  "
+              f"rows {per_rows * 1000:6.1f} ms  cube {per_cube * 1000:5.1f} ms per change  "
+              f"same {'✅' if same else '❌'}")
+
+
+def benchmark_filters(row_counts):
+    import numpy as np
+
+    from issue_metrics import filter_index
+    from local_source import read_linear_csv
+
+    print("🔎 One filter change = a multiselect of sprints, a person and a status → row mask")
+    for rows in row_counts:
+        df = read_linear_csv(make_linear_csv(rows))
+        changes = [{**filters, 'status': ['Done', 'In Progress']} for filters in _filter_changes(df)]
+
+        def timed(select):
+            start = time.perf_counter()
+            masks = [select(filters) for filters in changes]
+            return (time.perf_counter() - start) / len(changes), masks
+
+        def as_strings(filters):
+            mask = np.ones(len(df), dtype=bool)
+            for column, wanted in filters.items():
+                if wanted is not None:
+                    wanted = wanted if isinstance(wanted, list) else [wanted]
+                    mask &= df[column].astype(str).isin(wanted).to_numpy()
+            return mask
+
+        def categorical(filters):
+            mask = np.ones(len(df), dtype=bool)
+            for column, wanted in filters.items():
+                if wanted is not None:
+                    wanted = wanted if isinstance(wanted, list) else [wanted]
+                    mask &= df[column].isin(wanted).to_numpy(dtype=bool, na_value=False)
+            return mask
+
+        per_str, str_masks = timed(as_strings)
+        per_cat, cat_masks = timed(categorical)
+        start = time.perf_counter()
+        filter_index(df).mask(**changes[0])
+        build = time.perf_counter() - start
+        per_bits, bit_masks = timed(lambda filters: filter_index(df).mask(**filters))
+
+        same = all((a == b).all() and (b == c).all() for a, b, c in zip(str_masks, cat_masks, bit_masks))
+        print(f"  {rows:7d} issues (bitmaps built in {build * 1000:5.1f} ms):  astype(str) {per_str * 1000:6.1f} ms  "
+              f"isin {per_cat * 1000:5.1f} ms  bitmaps {per_bits * 1000:5.2f} ms per change  "
+              f"same {'✅' if same else '❌'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    ingest = subparsers.add_parser('ingest', help='Peak memory of buffered vs streaming CSV ingestion')
+    ingest.add_argument('--rows', type=int, default=50000)
+
+    schema = subparsers.add_parser('schema', help='Memory and filter speed of untyped vs typed issue frames')
+    schema.add_argument('--rows', type=int, default=50000)
+
+    coalesce = subparsers.add_parser('coalesce', help='Upstream requests when many sessions refresh one sheet at once')
+    coalesce.add_argument('--sessions', type=int, default=20)
+    coalesce.add_argument('--rows', type=int, default=20000)
+
+    xlsx = subparsers.add_parser('xlsx', help='Peak memory of streamed vs whole-workbook Excel import as rows grow')
+    xlsx.add_argument('--rows', type=int, nargs='+', default=[5000, 10000, 20000, 40000])
+
+    linear = subparsers.add_parser('linear', help='Sequential vs concurrent team paging against a Linear API stand-in')
+    linear.add_argument('--teams', type=int, default=6)
+    linear.add_argument('--rows', type=int, default=12000)
+
+    webhooks = subparsers.add_parser('webhooks', help='Ingest throughput of replayed Linear issue webhooks')
+    webhooks.add_argument('--events', type=int, default=20000)
+    webhooks.add_argument('--rows', type=int, default=10000)
+
+    metrics = subparsers.add_parser('metrics', help='KPI cards: per-card cell-by-cell conversion vs one vectorized pass')
+    metrics.add_argument('--rows', type=int, default=50000)
+
+    cube = subparsers.add_parser('cube', help='Filter-change cost of row-level KPIs vs slices of the aggregate cube')
+    cube.add_argument('--rows', type=int, nargs='+', default=[10000, 50000, 200000])
+
+    filters = subparsers.add_parser('filters', help='Filter-change cost of string/categorical isin vs the bitmap filter index')
+    filters.add_argument('--rows', type=int, nargs='+', default=[10000, 50000, 200000])
+
+    args = parser.parse_args()
+
+    # Keep snapshots and the gid map out of the real cache directory
+    os.environ['DASHBOARD_CACHE_DIR'] = tempfile.mkdtemp(prefix='dashboard-bench-')
+
+    if args.benchmark == 'ingest':
+        benchmark_ingest(args.rows)
+    elif args.benchmark == 'schema':
+        benchmark_schema(args.rows)
+    elif args.benchmark == 'coalesce':
+        benchmark_coalesce(args.sessions, args.rows)
+    elif args.benchmark == 'webhooks':
+        benchmark_webhooks(args.events, args.rows)
+    elif args.benchmark == 'linear':
+        benchmark_linear(args.teams, args.rows)
+    elif args.benchmark == 'xlsx':
+        benchmark_xlsx(args.rows)
+    elif args.benchmark == 'metrics':
+        benchmark_metrics(args.rows)
+    elif args.benchmark == 'cube':
+        benchmark_cube(args.rows)
+    elif args.benchmark == 'filters':
+        benchmark_filters(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Data Service Module
+Stale-while-revalidate front for GoogleSheetConnector: pages render at once
+from the last good dataset while a background refresh fetches the sheet and
+swaps the new dataset in when it arrives
+"""
+
+import copy
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from dataset_cache import DEFAULT_TTL_SECONDS
+from issue_metrics import tag_version
+from org_rollup import OrgRollup, SourceFreshness, combine_team_frames
+from linear_schema import resolve_projection
+from linear_webhooks import WEBHOOK_PORT, WebhookIngest, serve_webhooks
+from sheet_loader import LoadResult
+from sheets_quota import BACKGROUND
+from sync_worker import SyncWorker
+
+# Hand all sheet I/O to one scheduled worker thread instead of per-session refreshes
+SYNC_WORKER_ENABLED = os.environ.get("DASHBOARD_SYNC_WORKER", "1") == "1"
+
+# A failed background refresh is not retried sooner than this
+RETRY_AFTER_SECONDS = 30
+
+# How often a page showing stale data checks whether the refresh has landed
+WATCH_INTERVAL_SECONDS = 2
+
+# load_all gives up on whatever hasn't loaded after this long, across all its datasets
+LOAD_TIMEOUT_SECONDS = 90
+
+# Threads shared by every session's load_all
+LOAD_POOL_WORKERS = 8
+
+_service_ids = itertools.count()
+
+
+class DatasetVersion(NamedTuple):
+    """
+    One published, immutable dataset
+    """
+    frame: pd.DataFrame
+    as_of: float  # epoch seconds when the data was last confirmed against the sheet
+    source: str  # 'network', 'snapshot' (last good local copy), 'webhook' (pushed changes) or 'sample'
+    number: int  # increases every time a newer frame is published for the dataset
+
+
+class DatasetRequest(NamedTuple):
+    """
+    One dataset a page wants from load_all
+    """
+    kind: str  # 'issues' or 'okrs'
+    worksheet_name: str
+    columns: Optional[List[str]] = None
+
+
+class DataService:
+    """
+    Latest DatasetVersion per dataset, shared by every session in the
+    process. Reads never wait for the network once any version exists: a
+    stale version is returned immediately and refreshed on a background
+    thread, and the replacement is published with a single dict assignment.
+
+    With a SyncWorker attached, that thread is the worker: datasets are
+    synced on its hourly schedule (or on "🔄 Refresh Data") and sessions
+    never touch the network.
+    """
+
+    def __init__(self, stale_after_seconds: float = DEFAULT_TTL_SECONDS):
+        self.stale_after_seconds = stale_after_seconds
+        self._versions: Dict[Hashable, DatasetVersion] = {}
+        self._refreshing: Set[Hashable] = set()
+        self._attempted_at: Dict[Hashable, float] = {}
+        self._errors: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+        self.worker: Optional[SyncWorker] = None
+        # Last org rollup built per (teams, worksheet, projection), with the dataset versions it was built from
+        self._rollups: Dict[tuple, Tuple[tuple, pd.DataFrame]] = {}
+        # Tells this service's dataset versions apart from another's in the metric caches
+        self._id = next(_service_ids)
+
+    def attach_worker(self, worker: SyncWorker) -> None:
+        self.worker = worker
+
+    def load_issues(self, connector, columns=None, worksheet_name: str = "Sheet1") -> Optional[DatasetVersion]:
+        return self._load(connector, 'issues', worksheet_name, columns)
+
+    def load_okrs(self, connector, columns=None, worksheet_name: str = "OKRs") -> Optional[DatasetVersion]:
+        return self._load(connector, 'okrs', worksheet_name, columns)
+
+    def load_all(self, connector, requests: Dict[str, DatasetRequest],
+                 timeout: float = LOAD_TIMEOUT_SECONDS) -> Dict[str, Optional[DatasetVersion]]:
+        """
+        Load several datasets (issues, OKRs, extra worksheets) at once on the
+        shared pool, so the page waits for the slowest one instead of their
+        sum. Anything not loaded within timeout comes back as None and keeps
+        loading in the background.
+        """
+        # Loads go through the UI-free data layer, so pool threads never touch the page
+        loads = {name: _load_pool.submit(self._load, connector, request.kind, request.worksheet_name, request.columns)
+                 for name, request in requests.items()}
+
+        done, _ = wait(loads.values(), timeout=timeout)
+
+        results = {}
+        for name, future in loads.items():
+            results[name] = None
+            if future not in done:
+                st.warning(f"⏱️ Loading {name} took longer than {timeout:.0f}s; it will show up on a later rerun")
+            elif future.exception() is not None:
+                st.error(f"Failed to load {name}: {future.exception()}")
+            else:
+                results[name] = future.result()
+                request = requests[name]
+                error = self.last_error(connector, request.kind, request.worksheet_name, request.columns)
+                if results[name] is None and error:
+                    st.error(error)
+        return results
+
+    def load_org(self, loaders: Dict[str, object], columns=None, worksheet_name: str = "Sheet1",
+                 timeout: float = LOAD_TIMEOUT_SECONDS) -> OrgRollup:
+        """
+        Every team's issues as one frame, loaded side by side on the shared
+        pool (each team's dataset is kept fresh like any other), with how
+        current each team's part is. The merged frame is rebuilt only when a
+        team publishes a new version.
+        """
+        if columns is not None and 'updatedat' not in columns:
+            # Lets the merge keep the newest copy of an issue several teams export
+            columns = list(columns) + ['updatedat']
+        loads = {team: _load_pool.submit(self._load, loader, 'issues', worksheet_name, columns)
+                 for team, loader in loaders.items()}
+        done, _ = wait(loads.values(), timeout=timeout)
+
+        versions, sources = {}, []
+        for team, future in loads.items():
+            version = future.result() if future in done and future.exception() is None else None
+            if future not in done:
+                error = f"took longer than {timeout:.0f}s to load"
+            elif future.exception() is not None:
+                error = str(future.exception())
+            else:
+                error = self.last_error(loaders[team], 'issues', worksheet_name, columns)
+            if version is not None:
+                versions[team] = version
+            sources.append(SourceFreshness(team, len(version.frame) if version else 0,
+                                           version.as_of if version else None,
+                                           version.source if version else None, error))
+
+        teams = tuple(loaders)
+        # Pages loading other columns of the same teams get their own rollup
+        rollup_key = (teams, worksheet_name, resolve_projection(columns))
+        built_from = tuple((team, versions[team].as_of, versions[team].number) for team in teams if team in versions)
+        with self._lock:
+            cached = self._rollups.get(rollup_key)
+        if cached is not None and cached[0] == built_from:
+            frame = cached[1]
+        else:
+            frame = combine_team_frames({team: version.frame for team, version in versions.items()})
+            with self._lock:
+                self._rollups[rollup_key] = (built_from, frame)
+        frame = frame.copy(deep=False)
+        tag_version(frame, (self._id, rollup_key, built_from))
+        return OrgRollup(frame, sources)
+
+    def _load(self, connector, kind: str, worksheet_name: str, columns) -> Optional[DatasetVersion]:
+        key, snapshot = connector.dataset_ref(kind, worksheet_name, columns)
+        if key is None:
+            # Sample OKRs or no connection: nothing to keep fresh
+            frame = _fetch(connector, kind, worksheet_name, columns).frame
+            return DatasetVersion(frame, time.time(), 'sample', 0) if frame is not None else None
+
+        with self._lock:
+            current = self._versions.get(key)
+
+        if current is None and snapshot is not None:
+            # Last good local copy, however old: render now, refresh below
+            frame = snapshot.load_frame()
+            if frame is not None:
+                current = self._publish(key, frame, snapshot.meta.get('saved_at', 0.0), 'snapshot')
+
+        if self.worker is not None:
+            return _shared(self._load_from_worker(connector, kind, worksheet_name, columns, key, current), (self._id, key))
+
+        if current is None:
+            # Nothing local yet: this one load has to wait for the network,
+            # unless it just failed (one broken sheet mustn't stall every rerun)
+            with self._lock:
+                backing_off = self._backing_off(key, connector)
+            if not backing_off:
+                self._refresh(connector, kind, worksheet_name, columns, key)
+            with self._lock:
+                return _shared(self._versions.get(key), (self._id, key))
+
+        if self._is_stale(current, connector):
+            self._refresh_in_background(connector, kind, worksheet_name, columns, key)
+        return _shared(current, (self._id, key))
+
+    def _load_from_worker(self, connector, kind, worksheet_name, columns, key, current) -> Optional[DatasetVersion]:
+        self.worker.track(connector, kind, worksheet_name, columns, key, current)
+        if connector.refresh_requested_at > (current.as_of if current else 0.0):
+            self.worker.request_sync(key, connector.refresh_requested_at)
+        if current is None:
+            # Nothing local yet: wait for the worker's first sync rather than fetching here
+            self.worker.wait_for_first_sync(key)
+            with self._lock:
+                current = self._versions.get(key)
+        return current
+
+    def _is_stale(self, version: DatasetVersion, connector) -> bool:
+        return (time.time() - version.as_of > self.stale_after_seconds
+                or connector.refresh_requested_at > version.as_of)
+
+    def _refresh_in_background(self, connector, kind, worksheet_name, columns, key) -> None:
+        with self._lock:
+            if key in self._refreshing or self._backing_off(key, connector):
+                return
+            self._refreshing.add(key)
+        # A copy queued behind interactive loads in the Sheets API quota
+        background = copy.copy(connector)
+        background.priority = BACKGROUND
+        threading.Thread(
+            target=self._refresh, args=(background, kind, worksheet_name, columns, key),
+            name=f"refresh-{kind}", daemon=True,
+        ).start()
+
+    def _backing_off(self, key, connector) -> bool:
+        # Failed refreshes back off, unless "🔄 Refresh Data" was pressed since
+        attempted_at = self._attempted_at.get(key, 0.0)
+        return (key in self._errors and time.time() - attempted_at < RETRY_AFTER_SECONDS
+                and connector.refresh_requested_at <= attempted_at)
+
+    def _refresh(self, connector, kind, worksheet_name, columns, key) -> bool:
+        """
+        Load through the connector (cache, snapshot revalidation, network) and
+        publish the result if it is newer than the current version. Returns
+        whether the load succeeded.
+        """
+        with self._lock:
+            self._refreshing.add(key)
+            self._attempted_at[key] = time.time()
+        try:
+            frame, diagnostics = _fetch(connector, kind, worksheet_name, columns)
+            if frame is None or frame.empty:
+                with self._lock:
+                    self._errors[key] = diagnostics.error or "No data found in the sheet"
+                return False
+            fetched_at = time.time()
+            _, snapshot = connector.dataset_ref(kind, worksheet_name, columns)
+            if diagnostics.source in ('network', 'revalidated') or snapshot is None:
+                # Confirmed just now, whether or not the snapshot managed to record it (a full disk)
+                as_of = fetched_at
+            else:
+                # Served from the cache or a fresh snapshot: as of when that copy was confirmed
+                as_of = snapshot.meta.get('saved_at', fetched_at)
+            with self._lock:
+                self._errors.pop(key, None)
+            self._publish(key, frame, as_of, 'network')
+            return True
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _publish(self, key, frame: pd.DataFrame, as_of: float, source: str) -> DatasetVersion:
+        with self._lock:
+            current = self._versions.get(key)
+            if current is not None and as_of <= current.as_of:
+                return current
+            version = DatasetVersion(frame, as_of, source, current.number + 1 if current else 1)
+            self._versions[key] = version
+            return version
+
+    def update_versions(self, prefix: str,
+                        update: Callable[[Hashable, pd.DataFrame], Optional[pd.DataFrame]]) -> Dict[Hashable, DatasetVersion]:
+        """
+        Publish update(key, frame) as the next version of every dataset whose
+        key starts with prefix (pushed changes, no fetch); update returns None
+        to leave a dataset as it is. Returns the versions published.
+        """
+        with self._lock:
+            keys = [key for key in self._versions if key[0] == prefix]
+        published = {}
+        for key in keys:
+            while True:
+                with self._lock:
+                    current = self._versions[key]
+                frame = update(key, current.frame)
+                if frame is None:
+                    break
+                with self._lock:
+                    # A sync may have published meanwhile; apply the update to that instead
+                    if self._versions[key] is not current:
+                        continue
+                    version = DatasetVersion(frame, max(time.time(), current.as_of), 'webhook', current.number + 1)
+                    self._versions[key] = version
+                published[key] = version
+                break
+        return published
+
+    def is_refreshing(self, connector, kind: str = 'issues', worksheet_name: str = "Sheet1", columns=None) -> bool:
+        key, _ = connector.dataset_ref(kind, worksheet_name, columns)
+        with self._lock:
+            if key in self._refreshing:
+                return True
+        return self.worker is not None and self.worker.is_pending(key)
+
+    def latest_number(self, connector, kind: str = 'issues', worksheet_name: str = "Sheet1", columns=None) -> int:
+        key, _ = connector.dataset_ref(kind, worksheet_name, columns)
+        with self._lock:
+            version = self._versions.get(key)
+            return version.number if version else 0
+
+    def last_error(self, connector, kind: str = 'issues', worksheet_name: str = "Sheet1", columns=None) -> Optional[str]:
+        key, _ = connector.dataset_ref(kind, worksheet_name, columns)
+        with self._lock:
+            return self._errors.get(key)
+
+
+def _shared(version: Optional[DatasetVersion], dataset: tuple) -> Optional[DatasetVersion]:
+    # Published frames are shared by every session; hand out views so a page
+    # adding a column can't change what the others see (copy-on-write keeps this cheap)
+    if version is None:
+        return None
+    frame = version.frame.copy(deep=False)
+    # Cubes and filter indexes of the view are the version's
+    tag_version(frame, dataset + (version.number,))
+    return version._replace(frame=frame)
+
+
+def _fetch(connector, kind: str, worksheet_name: str, columns) -> LoadResult:
+    if kind == 'okrs':
+        return connector.load_okrs(worksheet_name, columns=columns)
+    return connector.load_issues(worksheet_name, columns=columns)
+
+
+def freshness_caption(version: DatasetVersion, refreshing: bool = False, error: Optional[str] = None) -> str:
+    """
+    "🕒 Data as of ..." line for the page, noting a running or failed refresh
+    """
+    as_of = datetime.fromtimestamp(version.as_of).strftime('%b %d, %H:%M')
+    caption = f"🕒 Data as of {as_of}"
+    if version.source == 'snapshot':
+        caption += " (last saved copy)"
+    if refreshing:
+        caption += " · 🔄 refreshing in the background…"
+    elif error:
+        caption += f" · ⚠️ refresh failed: {error}"
+    return caption
+
+
+def source_freshness_caption(source: SourceFreshness) -> str:
+    """
+    One team's line in the org rollup: its issue count and how current it is
+    """
+    if source.as_of is None:
+        return f"🏷️ {source.team}: ⚠️ not loaded" + (f" ({source.error})" if source.error else "")
+    as_of = datetime.fromtimestamp(source.as_of).strftime('%b %d, %H:%M')
+    caption = f"🏷️ {source.team}: {source.rows} issues as of {as_of}"
+    if source.source == 'snapshot':
+        caption += " (last saved copy)"
+    if source.error:
+        caption += f" · ⚠️ refresh failed: {source.error}"
+    return caption
+
+
+def sync_status_caption(metrics: dict) -> str:
+    """
+    Sidebar line summarising the sync worker's last success and next run
+    """
+    def clock(ts):
+        return datetime.fromtimestamp(ts).strftime('%H:%M') if ts else "never"
+
+    caption = f"🛰️ Last sync {clock(metrics['last_success_at'])} · next {clock(metrics['next_run_at'])}"
+    if metrics['failing']:
+        caption += f" · ⚠️ {metrics['failing']} failing: {metrics['last_error']}"
+    return caption
+
+
+def show_freshness(connector, version: Optional[DatasetVersion], columns=None, worksheet_name: str = "Sheet1") -> None:
+    """
+    Caption the issues dataset's age and, while a refresh is running, poll
+    for its result and rerun the page once the new version is published
+    """
+    if version is None or version.source == 'sample':
+        return
+    refreshing = data_service.is_refreshing(connector, 'issues', worksheet_name, columns)
+    error = data_service.last_error(connector, 'issues', worksheet_name, columns)
+    st.caption(freshness_caption(version, refreshing, error))
+    if refreshing:
+        _watch_for_new_version(connector, version.number, columns, worksheet_name)
+
+
+@st.fragment(run_every=WATCH_INTERVAL_SECONDS)
+def _watch_for_new_version(connector, rendered_number: int, columns, worksheet_name: str) -> None:
+    # Rerun on a new version, or once the refresh gives up so the caption shows why
+    if (data_service.latest_number(connector, 'issues', worksheet_name, columns) > rendered_number
+            or not data_service.is_refreshing(connector, 'issues', worksheet_name, columns)):
+        st.rerun(scope="app")
+
+
+def show_local_freshness(source, columns=None) -> None:
+    """
+    Caption which local export the page shows and when it was read, and
+    poll the file or folder so a new export reruns the page once it settles
+    """
+    ingested_at = source.ingested_at(columns)
+    current = source.current_file()
+    if ingested_at is None or current is None:
+        return
+    as_of = datetime.fromtimestamp(ingested_at).strftime('%b %d, %H:%M')
+    st.caption(f"📂 {current.name} as of {as_of} · watching for changes")
+    _watch_local_file(source, columns)
+
+
+@st.fragment(run_every=WATCH_INTERVAL_SECONDS)
+def _watch_local_file(source, columns) -> None:
+    # has_update only stats the file; the rerun re-ingests it
+    if source.has_update(columns):
+        st.rerun(scope="app")
+
+
+# Shared by every session in this process
+_load_pool = ThreadPoolExecutor(max_workers=LOAD_POOL_WORKERS, thread_name_prefix="dataset-load")
+data_service = DataService()
+sync_worker = SyncWorker(data_service) if SYNC_WORKER_ENABLED else None
+if sync_worker is not None:
+    data_service.attach_worker(sync_worker)
+webhook_ingest = WebhookIngest(data_service)
+webhook_server = None
+if WEBHOOK_PORT:
+    try:
+        webhook_server = serve_webhooks(webhook_ingest)
+    except OSError:
+        # Port taken (a second server process, say): this one goes without pushed updates
+        pass
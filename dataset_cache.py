@@ -0,0 +1,90 @@
+"""
+Dataset Cache Module
+Process-wide, TTL-bound cache for normalized Linear DataFrames
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+# Linear only pushes to the sheet hourly, so a few minutes of staleness is invisible
+DEFAULT_TTL_SECONDS = float(os.environ.get("DASHBOARD_CACHE_TTL", 300))
+
+
+class DatasetCache:
+    """
+    Thread-safe cache of normalized DataFrames keyed by (sheet_id, gid).
+
+    Streamlit re-runs the page script on every widget interaction but keeps
+    imported modules alive, so a module-level instance is shared by every
+    session in the server process.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """
+        Return the cached frame for key, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self.hits += 1
+                # Shallow copy: callers can add/drop columns without touching the cached frame
+                return entry[1].copy(deep=False)
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> None:
+        """
+        Store a normalized frame under key
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), df)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one entry, or every entry when key is None (used by "🔄 Refresh Data")
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def invalidate_sheet(self, sheet_id: str) -> None:
+        """
+        Drop every entry belonging to one spreadsheet, whatever its tab
+        """
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == sheet_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters for display in the sidebar
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total * 100) if total else 0.0,
+                'entries': len(self._entries),
+                'ttl_seconds': self.ttl_seconds,
+            }
+
+
+# Shared by every GoogleSheetConnector in this process
+dataset_cache = DatasetCache()
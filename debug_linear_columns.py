@@ -6,7 +6,8 @@ Shows exactly what columns Linear exports to your Google Sheet
 import streamlit as st
 import pandas as pd
 from connect_google_sheet import GoogleSheetConnector
-import requests
+from gid_discovery import csv_export_url, discover_linear_gid, parse_sheet_url
+from sheet_http import fetch
 from io import StringIO
 
 st.set_page_config(page_title="🔍 Linear Column Debugger", page_icon="🔍", layout="wide")
@@ -27,13 +28,8 @@ if sheet_url and st.button("🔍 Analyze Columns"):
         st.error("❌ Please enter a valid Google Sheets URL")
     else:
         try:
-            # Extract sheet ID
-            sheet_id = sheet_url.split("/spreadsheets/d/")[1].split("/")[0]
-            
-            # Extract gid (sheet tab) from URL if present
-            gid = "0"  # default
-            if "gid=" in sheet_url:
-                gid = sheet_url.split("gid=")[1].split("&")[0].split("#")[0]
+            # Extract sheet ID and gid (sheet tab) from URL
+            sheet_id, gid = parse_sheet_url(sheet_url)
             
             st.info(f"📊 **Detected Sheet ID:** {sheet_id}")
             st.info(f"📋 **Detected Sheet Tab (gid):** {gid}")
@@ -41,32 +37,34 @@ if sheet_url and st.button("🔍 Analyze Columns"):
             # Try multiple approaches to access the sheet
             success = False
             df = None
-            
-            # List of gids to try (including common Linear export gids)
-            gids_to_try = [gid, "0", "1413191165", "2", "1"]
+            fetch_error = None
             
             with st.spinner("Fetching data from Google Sheet..."):
-                for try_gid in gids_to_try:
-                    csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={try_gid}"
-                    st.info(f"🔗 **Trying CSV Export URL:** {csv_url}")
-                    
+                # Probe the URL's gid and common Linear export gids concurrently (header bytes only)
+                found_gid, outcomes = discover_linear_gid(sheet_id, gid, use_saved=False)
+                
+                for try_gid, outcome in outcomes.items():
+                    if outcome == "match":
+                        st.info(f"🔗 **Linear data on:** {csv_export_url(sheet_id, try_gid)}")
+                    elif outcome == "cancelled":
+                        st.info(f"⏭️ gid={try_gid} skipped (another tab matched first)")
+                    elif outcome == "no Linear data":
+                        st.warning(f"⚠️ gid={try_gid} accessible but no Linear data found")
+                    else:
+                        st.warning(f"❌ gid={try_gid} failed with {outcome}")
+                
+                if found_gid is not None:
                     try:
-                        response = requests.get(csv_url, timeout=10)
-                        
+                        response = fetch(csv_export_url(sheet_id, found_gid))
+                        st.caption(f"⏱️ {response.timings.summary()}")
                         if response.status_code == 200:
-                            # Check if we got actual data (not empty or error page)
-                            lines = response.text.strip().split('\n')
-                            if len(lines) > 1 and 'ID' in lines[0]:  # Linear data should have ID column
-                                df = pd.read_csv(StringIO(response.text))
-                                st.success(f"✅ **SUCCESS with gid={try_gid}!** Found {len(df)} rows of data")
-                                success = True
-                                break
-                            else:
-                                st.warning(f"⚠️ gid={try_gid} accessible but no Linear data found")
+                            df = pd.read_csv(StringIO(response.text))
+                            st.success(f"✅ **SUCCESS with gid={found_gid}!** Found {len(df)} rows of data")
+                            success = True
                         else:
-                            st.warning(f"❌ gid={try_gid} failed with status {response.status_code}")
+                            fetch_error = f"HTTP {response.status_code}"
                     except Exception as e:
-                        st.warning(f"❌ gid={try_gid} failed with error: {str(e)}")
+                        fetch_error = str(e)
                 
                 if success and df is not None:
                     
@@ -130,8 +128,17 @@ if sheet_url and st.button("🔍 Analyze Columns"):
                         help="You can copy this list to help with manual mapping if needed"
                     )
                     
+                elif fetch_error is not None:
+                    # The tab was found; it's the full download that failed
+                    st.error(f"❌ Found Linear data on gid={found_gid}, but fetching it failed: {fetch_error}")
+                    st.markdown("""
+                    **Troubleshooting:**
+                    1. Try again: the sheet may have been briefly unavailable or rate limited
+                    2. Check that the sheet is still public (Anyone with link can view)
+                    """)
+                
                 else:
-                    st.error(f"❌ Cannot access sheet. Status code: {response.status_code}")
+                    st.error("❌ Cannot access sheet. No tab with Linear data was found.")
                     st.markdown("""
                     **Troubleshooting:**
                     1. Make sure your sheet is public (Anyone with link can view)
@@ -0,0 +1,138 @@
+"""
+Delta Sync Module
+Upserts a fresh Linear export into the previous normalized issues frame,
+re-typing only the rows whose content changed and reporting their IDs
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, FrozenSet, Hashable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from linear_schema import concat_issue_chunks
+
+# Datasets whose previous frame and row hashes are kept; the least recently synced is dropped first
+MAX_DATASETS = int(os.environ.get("DASHBOARD_DELTA_DATASETS", 16))
+
+
+class DeltaResult(NamedTuple):
+    """
+    Outcome of one sync: the merged frame and what changed in it
+    """
+    frame: pd.DataFrame
+    changed_ids: FrozenSet[str]  # new or modified issues
+    removed_ids: FrozenSet[str]  # issues no longer in the export
+    watermark: Optional[pd.Timestamp]  # newest 'updatedat' seen so far
+    full_reload: bool  # True when there was nothing to diff against
+
+
+class _SyncState(NamedTuple):
+    frame: pd.DataFrame  # normalized, in export order
+    ids: pd.Index  # frame's issue IDs, positionally aligned
+    fingerprints: np.ndarray  # per-row hash of the un-normalized columns
+    columns: tuple
+    watermark: Optional[pd.Timestamp]
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """
+    One uint64 per row over every column; equal rows hash equally
+    """
+    # Most cells are unique text, so factorizing before hashing only costs time
+    return pd.util.hash_pandas_object(df, index=False, categorize=False).to_numpy()
+
+
+def _updated_watermark(frame: pd.DataFrame) -> Optional[pd.Timestamp]:
+    if 'updatedat' not in frame.columns or not pd.api.types.is_datetime64_any_dtype(frame['updatedat']):
+        return None
+    watermark = frame['updatedat'].max()
+    return None if pd.isna(watermark) else watermark
+
+
+class DeltaSync:
+    """
+    Previous normalized frame per dataset, keyed like the dataset cache.
+
+    A row counts as changed when its issue is new or its fingerprint
+    differs. 'updatedat' is hashed with the rest of the row, so every issue
+    Linear re-stamps past the watermark is caught, and so are edits it
+    doesn't stamp, such as hand edits in the sheet. Only changed rows are
+    passed to normalize; every other row is reused from the previous frame.
+    """
+
+    def __init__(self, max_datasets: int = MAX_DATASETS):
+        self.max_datasets = max_datasets
+        self._states: "OrderedDict[Hashable, _SyncState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def upsert(self, key: Hashable, df: pd.DataFrame,
+               normalize: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> DeltaResult:
+        """
+        Merge df (mapped column names, not yet normalized unless normalize
+        is None) into the previous frame stored under key
+        """
+        normalize = normalize or (lambda frame: frame)
+        fingerprints = row_fingerprints(df)
+        ids = pd.Index(df['id']) if 'id' in df.columns else None
+        # Taken before normalize, which adds derived columns in place
+        columns = tuple(df.columns)
+
+        with self._lock:
+            previous = self._states.get(key)
+
+        # Diffing needs a unique key and an unchanged header
+        if ids is None or ids.hasnans or not ids.is_unique:
+            frame = normalize(df)
+            return DeltaResult(frame, frozenset(), frozenset(), _updated_watermark(frame), full_reload=True)
+        if previous is None or previous.columns != columns:
+            frame = normalize(df)
+            watermark = _updated_watermark(frame)
+            self._store(key, frame, ids, fingerprints, columns, watermark)
+            return DeltaResult(frame, frozenset(ids), frozenset(), watermark, full_reload=True)
+
+        positions = previous.ids.get_indexer(ids)
+        known = positions >= 0
+        changed = ~known
+        changed[known] = previous.fingerprints[positions[known]] != fingerprints[known]
+
+        still_present = np.zeros(len(previous.ids), dtype=bool)
+        still_present[positions[known]] = True
+        removed = previous.ids[~still_present]
+        if not changed.any() and removed.empty and (positions == np.arange(len(positions))).all():
+            # Same rows in the same order: the previous frame is still exact
+            frame = previous.frame
+        else:
+            parts = []
+            if (~changed).any():
+                parts.append(previous.frame.iloc[positions[~changed]].reset_index(drop=True))
+            if changed.any():
+                parts.append(normalize(df[changed].reset_index(drop=True)))
+            frame = concat_issue_chunks(parts)
+            # Back to export order: kept rows came first, changed rows after
+            order = np.concatenate([np.flatnonzero(~changed), np.flatnonzero(changed)])
+            frame = frame.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+
+        watermark = _updated_watermark(frame)
+        if previous.watermark is not None and (watermark is None or watermark < previous.watermark):
+            watermark = previous.watermark
+        self._store(key, frame, ids, fingerprints, columns, watermark)
+        return DeltaResult(frame, frozenset(ids[changed]), frozenset(removed), watermark, full_reload=False)
+
+    def _store(self, key, frame, ids, fingerprints, columns, watermark) -> None:
+        with self._lock:
+            self._states[key] = _SyncState(frame, ids, fingerprints, columns, watermark)
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_datasets:
+                # An evicted dataset's next sync is a full reload
+                self._states.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._states)
+
+
+# Shared by every GoogleSheetConnector in this process, like dataset_cache
+delta_sync = DeltaSync()
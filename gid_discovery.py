@@ -0,0 +1,171 @@
+"""
+Sheet Tab Discovery Module
+Finds which gid of a public Google Sheet holds the Linear export by probing
+candidate tabs concurrently and reading only their header bytes
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sheet_http import fetch
+from sheet_snapshot import CACHE_DIR, SheetSnapshot
+
+# Tabs Linear exports commonly land on, tried after the gid from the URL
+COMMON_LINEAR_GIDS = ["0", "1413191165", "2", "1"]
+
+GID_MAP_PATH = CACHE_DIR / "gid_map.json"
+
+# Enough for the header row plus the start of the first issue
+HEADER_PROBE_BYTES = 64 * 1024
+
+
+def csv_export_url(sheet_id: str, gid: str) -> str:
+    return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+
+def parse_sheet_url(sheet_url: str) -> Tuple[str, str]:
+    """
+    Extract (sheet_id, gid) from a Google Sheets URL; gid defaults to "0"
+    """
+    sheet_id = sheet_url.split("/spreadsheets/d/")[1].split("/")[0]
+    gid = "0"
+    if "gid=" in sheet_url:
+        gid = sheet_url.split("gid=")[1].split("&")[0].split("#")[0]
+    return sheet_id, gid
+
+
+class GidMap:
+    """
+    Persisted sheet_id → gid map so reconnects skip discovery
+    """
+
+    def __init__(self, path: Path = GID_MAP_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, sheet_id: str) -> Optional[str]:
+        with self._lock:
+            return self._read().get(sheet_id)
+
+    def set(self, sheet_id: str, gid: str) -> None:
+        self._update(sheet_id, gid)
+
+    def forget(self, sheet_id: str) -> None:
+        self._update(sheet_id, None)
+
+    def _update(self, sheet_id: str, gid: Optional[str]) -> None:
+        with self._lock:
+            mapping = self._read()
+            if gid is None:
+                if mapping.pop(sheet_id, None) is None:
+                    return
+            else:
+                if mapping.get(sheet_id) == gid:
+                    return
+                mapping[sheet_id] = gid
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.json.tmp')
+                with open(tmp_path, 'w') as f:
+                    json.dump(mapping, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+
+
+gid_map = GidMap()
+
+
+def probe_gid(sheet_id: str, gid: str, timeout: float = 10,
+              stop: Optional[threading.Event] = None) -> str:
+    """
+    Check one tab for Linear data without downloading its body.
+
+    Returns "match", "cancelled", or a short reason the tab was rejected.
+    """
+    snapshot = SheetSnapshot(sheet_id, gid)
+    # No retries: a slow tab must not stretch discovery past one timeout
+    with fetch(csv_export_url(sheet_id, gid), headers=snapshot.conditional_headers(),
+               timeout=timeout, stream=True, retries=0) as response:
+        # 304: this tab held Linear data last time and hasn't changed since
+        if response.status_code == 304:
+            return "match"
+        if response.status_code != 200:
+            return f"status {response.status_code}"
+
+        head = b""
+        for chunk in response.iter_content(chunk_size=8192):
+            if stop is not None and stop.is_set():
+                return "cancelled"
+            head += chunk
+            # Header row plus at least one data row is all we need
+            if head.count(b"\n") >= 2 or len(head) >= HEADER_PROBE_BYTES:
+                break
+
+    lines = head.decode("utf-8", errors="ignore").strip().split("\n")
+    if len(lines) > 1 and 'ID' in lines[0]:
+        return "match"
+    return "no Linear data"
+
+
+def discover_linear_gid(sheet_id: str, preferred_gid: str = "0", timeout: float = 10,
+                        use_saved: bool = True) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Find the tab holding the Linear export.
+
+    Uses the persisted map when it knows the sheet; otherwise probes every
+    candidate concurrently and returns as soon as the highest-priority match
+    is known, so the worst case costs about one timeout. Returns
+    (gid or None, outcome per gid).
+    """
+    if use_saved:
+        saved_gid = gid_map.get(sheet_id)
+        if saved_gid is not None:
+            return saved_gid, {saved_gid: "saved"}
+
+    candidates = list(dict.fromkeys([preferred_gid] + COMMON_LINEAR_GIDS))
+    outcomes: Dict[str, str] = {}
+    stop = threading.Event()
+    winner = None
+
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    try:
+        futures = {executor.submit(probe_gid, sheet_id, gid, timeout, stop): gid for gid in candidates}
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                gid = futures[future]
+                try:
+                    outcomes[gid] = future.result()
+                except Exception as e:
+                    outcomes[gid] = f"error: {e}"
+            # Candidates are in priority order: a match wins once every
+            # higher-priority tab has answered, lower-priority probes are dropped
+            for gid in candidates:
+                if gid not in outcomes:
+                    break
+                if outcomes[gid] == "match":
+                    winner = gid
+                    break
+        for future in pending:
+            outcomes[futures[future]] = "cancelled"
+    finally:
+        # Tell in-flight probes to drop their streams; don't wait for them
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if winner is not None:
+        gid_map.set(sheet_id, winner)
+    return winner, outcomes
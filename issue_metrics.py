@@ -0,0 +1,370 @@
+"""
+Issue Metrics Module
+The KPI numbers every dashboard shows (issue counts, story points,
+completion rates, mean cycle time), computed in one vectorized pass over
+the typed issue columns for any filter mask, overall or per group, and an
+aggregate cube of the same numbers that KPI cards and charts slice instead
+of the issues themselves. Filter masks come from per-value bitmaps, so a
+widget selection is a few bitwise ORs and ANDs.
+"""
+
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from linear_schema import to_category
+
+DONE_STATUS = 'Done'
+
+# Dimensions the dashboards filter and group issues by, in cube cell order
+CUBE_DIMENSIONS = ['cycle', 'assignee', 'status', 'type', 'priority']
+
+# Columns the filter widgets select issues by; labels match each label of an issue
+FILTER_DIMENSIONS = ['cycle', 'assignee', 'type', 'status', 'priority', 'team', 'labels']
+
+# Cubes and filter indexes kept for the most recently read dataset versions
+CUBE_CACHE_SIZE = 16
+
+
+class IssueMetrics(NamedTuple):
+    issues: int
+    completed_issues: int
+    total_points: float
+    completed_points: float
+    mean_cycle_time: float  # days; 0 when no issue in the selection has one
+
+    @property
+    def completion_rate(self) -> float:
+        """
+        Share of issues that are done, in percent
+        """
+        return self.completed_issues / self.issues * 100 if self.issues else 0.0
+
+    @property
+    def points_rate(self) -> float:
+        """
+        Share of story points that are done, in percent
+        """
+        return self.completed_points / self.total_points * 100 if self.total_points > 0 else 0.0
+
+
+def _float_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    # Typed frames hold float32 already; anything else (an untyped sheet) is coerced once, not per cell
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    values = df[column]
+    if not pd.api.types.is_numeric_dtype(values.dtype):
+        values = pd.to_numeric(values.astype(object), errors='coerce')
+    return values.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _kpi_columns(df: pd.DataFrame, mask) -> tuple:
+    """
+    (selected, done, points, cycle times) as aligned NumPy arrays
+    """
+    selected = np.ones(len(df), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    if 'status' in df.columns:
+        done = df['status'].eq(DONE_STATUS).to_numpy(dtype=bool, na_value=False)
+    else:
+        done = np.zeros(len(df), dtype=bool)
+    points = np.nan_to_num(_float_column(df, 'estimate'))
+    return selected, done & selected, points, _float_column(df, 'cycle_time_days')
+
+
+def _grouped(codes: np.ndarray, labels: pd.Index, name: str, issues: np.ndarray, done: np.ndarray,
+             points: np.ndarray, cycle_sums: np.ndarray, cycle_counts: np.ndarray) -> pd.DataFrame:
+    # Per-label totals of pre-selected rows or cube cells; code -1 (no value) is left out
+    keep = codes >= 0
+    codes, issues, done, points = codes[keep], issues[keep], done[keep], points[keep]
+    cycle_sums, cycle_counts = cycle_sums[keep], cycle_counts[keep]
+
+    size = len(labels)
+    counts = np.bincount(codes, weights=issues, minlength=size)
+    timed = np.bincount(codes, weights=cycle_counts, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_cycle = np.bincount(codes, weights=cycle_sums, minlength=size) / timed
+    result = pd.DataFrame({
+        'issues': counts.astype('int64'),
+        'completed_issues': np.bincount(codes[done], weights=issues[done], minlength=size).astype('int64'),
+        'total_points': np.bincount(codes, weights=points, minlength=size),
+        'completed_points': np.bincount(codes[done], weights=points[done], minlength=size),
+        'mean_cycle_time': np.where(timed > 0, mean_cycle, np.nan),
+    }, index=pd.Index(labels, name=name))
+    return result[counts > 0]
+
+
+def issue_metrics(df: pd.DataFrame, mask=None) -> IssueMetrics:
+    """
+    KPIs of the rows mask selects (a boolean array or Series aligned with
+    df), or of every row. Blank or non-numeric estimates count as 0 points.
+    """
+    selected, done, points, cycle = _kpi_columns(df, mask)
+    cycle = cycle[selected]
+    timed = ~np.isnan(cycle)
+    return IssueMetrics(
+        issues=int(selected.sum()),
+        completed_issues=int(done.sum()),
+        total_points=float(points[selected].sum()),
+        completed_points=float(points[done].sum()),
+        mean_cycle_time=float(cycle[timed].mean()) if timed.any() else 0.0,
+    )
+
+
+def metrics_by(df: pd.DataFrame, column: str, mask=None) -> pd.DataFrame:
+    """
+    The same KPIs per value of column (e.g. assignee), one row per value
+    that has selected issues. mean_cycle_time is NaN for a group with none.
+    """
+    selected, done, points, cycle = _kpi_columns(df, mask)
+    groups = df[column]
+    if isinstance(groups.dtype, pd.CategoricalDtype):
+        codes, labels = groups.cat.codes.to_numpy(), groups.cat.categories
+    else:
+        codes, labels = pd.factorize(groups)
+    codes = np.where(selected, codes, -1)
+    timed = ~np.isnan(cycle)
+    return _grouped(codes, labels, column, selected.astype('float64'), done, points,
+                    np.where(timed, cycle, 0.0), timed.astype('float64'))
+
+
+def issue_filter_mask(df: pd.DataFrame, **filters) -> np.ndarray:
+    """
+    Rows matching every filter, given like IssueCube's (e.g. cycle=["Sprint 3"],
+    assignee="ana@example.com"); None leaves a dimension unfiltered
+    """
+    return filter_index(df).mask(**filters)
+
+
+def _wanted_values(wanted) -> list:
+    return [wanted] if isinstance(wanted, str) or np.isscalar(wanted) else list(wanted)
+
+
+class IssueCube:
+    """
+    Issue counts, story points and cycle-time sums per populated
+    (cycle, assignee, status, type, priority) cell of a dataset. Every KPI
+    card and grouped chart is a slice of it, so a filter change costs as
+    much as the number of cells rather than the number of issues.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        _, _, points, cycle = _kpi_columns(df, None)
+        self.dimensions = [dim for dim in CUBE_DIMENSIONS if dim in df.columns]
+        self.categories: Dict[str, pd.Index] = {}
+        row_codes = []
+        for dim in self.dimensions:
+            categorical = to_category(df[dim])
+            self.categories[dim] = categorical.cat.categories
+            # Shifted by one so issues without a value get a slot of their own
+            row_codes.append(categorical.cat.codes.to_numpy().astype('int64') + 1)
+
+        shape = tuple(len(self.categories[dim]) + 1 for dim in self.dimensions)
+        cell_ids = np.ravel_multi_index(row_codes, shape) if row_codes else np.zeros(len(df), dtype='int64')
+        cells, row_cell = np.unique(cell_ids, return_inverse=True)
+        cell_codes = np.unravel_index(cells, shape) if row_codes else ()
+        self.codes: Dict[str, np.ndarray] = {dim: codes - 1 for dim, codes in zip(self.dimensions, cell_codes)}
+
+        timed = ~np.isnan(cycle)
+        self.issues = np.bincount(row_cell, minlength=len(cells)).astype('float64')
+        self.points = np.bincount(row_cell, weights=points, minlength=len(cells))
+        self.cycle_sums = np.bincount(row_cell[timed], weights=cycle[timed], minlength=len(cells))
+        self.cycle_counts = np.bincount(row_cell[timed], minlength=len(cells)).astype('float64')
+        if 'status' in self.categories:
+            self.done = self._matches('status', [DONE_STATUS])
+        else:
+            self.done = np.zeros(len(cells), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    def _matches(self, dim: str, values: list) -> np.ndarray:
+        # Code -1 (no value) picks the appended False
+        allowed = np.append(self.categories[dim].isin(values), False)
+        return allowed[self.codes[dim]]
+
+    def select(self, **filters) -> np.ndarray:
+        """
+        Cells matching every filter: a value or list of values per dimension,
+        None for all of them
+        """
+        selected = np.ones(len(self), dtype=bool)
+        for dim, wanted in filters.items():
+            if wanted is not None:
+                selected &= self._matches(dim, _wanted_values(wanted))
+        return selected
+
+    def metrics(self, **filters) -> IssueMetrics:
+        """
+        issue_metrics of the issues matching filters
+        """
+        selected = self.select(**filters)
+        done = selected & self.done
+        timed = self.cycle_counts[selected].sum()
+        return IssueMetrics(
+            issues=int(self.issues[selected].sum()),
+            completed_issues=int(self.issues[done].sum()),
+            total_points=float(self.points[selected].sum()),
+            completed_points=float(self.points[done].sum()),
+            mean_cycle_time=float(self.cycle_sums[selected].sum() / timed) if timed else 0.0,
+        )
+
+    def by(self, dim: str, **filters) -> pd.DataFrame:
+        """
+        metrics_by(dim) of the issues matching filters
+        """
+        selected = self.select(**filters)
+        codes = np.where(selected, self.codes[dim], -1)
+        return _grouped(codes, self.categories[dim], dim, self.issues, self.done, self.points,
+                        self.cycle_sums, self.cycle_counts)
+
+
+# Dataset version of each tagged frame object: id(frame) -> (weak reference to it, version ID)
+_frame_versions: Dict[int, tuple] = {}
+_frame_versions_lock = threading.Lock()
+_untagged_frames = itertools.count()
+
+
+def tag_version(df: pd.DataFrame, version_id: Hashable) -> None:
+    """
+    Record that df holds the dataset version version_id, so cubes and
+    filter indexes built from it are cached under the version. Published
+    frames are never modified; frames derived from df aren't tagged.
+    """
+    key = id(df)
+
+    def forget(ref):
+        with _frame_versions_lock:
+            if _frame_versions.get(key, (None,))[0] is ref:
+                del _frame_versions[key]
+
+    with _frame_versions_lock:
+        _frame_versions[key] = (weakref.ref(df, forget), version_id)
+
+
+def _version_id(df: pd.DataFrame) -> Hashable:
+    with _frame_versions_lock:
+        entry = _frame_versions.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    # Not a published version (sample data, a filtered frame): reused only while this frame lives
+    version_id = ('frame', next(_untagged_frames))
+    tag_version(df, version_id)
+    return version_id
+
+
+class _VersionCache:
+    """
+    Objects built from a dataset version's columns, least recently read evicted first.
+    Published versions reach every session and rerun as shallow copies
+    tagged with the version they hold (tag_version), so the version, not
+    the copy or its arrays, identifies what was built.
+    """
+
+    def __init__(self, columns: List[str], size: int = CUBE_CACHE_SIZE):
+        self.columns = columns
+        self.size = size
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df: pd.DataFrame, build: Callable[[pd.DataFrame], object]):
+        columns = tuple(col for col in self.columns if col in df.columns)
+        key = (_version_id(df), len(df), columns)
+        with self._lock:
+            built = self._entries.get(key)
+            if built is not None:
+                self._entries.move_to_end(key)
+                return built
+        built = build(df)
+        with self._lock:
+            self._entries[key] = built
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return built
+
+
+_cubes = _VersionCache(CUBE_DIMENSIONS + ['estimate', 'cycle_time_days'])
+
+
+def issue_cube(df: pd.DataFrame) -> IssueCube:
+    """
+    The cube of df, built once per dataset version
+    """
+    return _cubes.get(df, IssueCube)
+
+
+class FilterIndex:
+    """
+    A packed bitmap of matching rows per value of each filter dimension,
+    built the first time the dimension is filtered on. A selection ORs the
+    bitmaps of its values and ANDs the dimensions together, without
+    comparing a single cell.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.rows = len(df)
+        # Shallow: the same column arrays as df
+        self._columns = {dim: df[dim] for dim in FILTER_DIMENSIONS if dim in df.columns}
+        self._bitmaps: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _dimension(self, dim: str) -> tuple:
+        """
+        (values, bitmaps): bitmaps[i] is the packed rows having values[i]
+        """
+        with self._lock:
+            if dim not in self._bitmaps:
+                categorical = to_category(self._columns[dim])
+                categories = categorical.cat.categories
+                codes = categorical.cat.codes.to_numpy()
+                if dim == 'labels':
+                    # One bitmap per label, whichever combinations it appears in
+                    per_category = [{label.strip() for label in value.split(',')} - {''} for value in categories]
+                    values = pd.Index(sorted(set().union(*per_category)), dtype=categories.dtype)
+                    members = [[value in labels for labels in per_category] for value in values]
+                else:
+                    values = categories
+                    members = [np.arange(len(categories)) == i for i in range(len(categories))]
+                bitmaps = np.zeros((len(values), (self.rows + 7) // 8), dtype=np.uint8)
+                for i, member in enumerate(members):
+                    # Code -1 (no value) picks the appended False
+                    bitmaps[i] = np.packbits(np.append(member, False)[codes])
+                self._bitmaps[dim] = (values, bitmaps)
+            return self._bitmaps[dim]
+
+    def bits(self, **filters) -> np.ndarray:
+        """
+        Packed rows matching every filter (a value or list of values per
+        dimension, None for all of them)
+        """
+        selected = np.full((self.rows + 7) // 8, 0xFF, dtype=np.uint8)
+        for dim, wanted in filters.items():
+            if wanted is None:
+                continue
+            values, bitmaps = self._dimension(dim)
+            positions = values.get_indexer(pd.Index(_wanted_values(wanted), dtype=object).astype(str))
+            selected &= np.bitwise_or.reduce(bitmaps[positions[positions >= 0]], axis=0,
+                                             initial=0, dtype=np.uint8)
+        return selected
+
+    def mask(self, **filters) -> np.ndarray:
+        """
+        Boolean row mask of bits(**filters), aligned with the frame
+        """
+        if all(wanted is None for wanted in filters.values()):
+            return np.ones(self.rows, dtype=bool)
+        return np.unpackbits(self.bits(**filters), count=self.rows).view(bool)
+
+
+_filter_indexes = _VersionCache(FILTER_DIMENSIONS)
+
+
+def filter_index(df: pd.DataFrame) -> FilterIndex:
+    """
+    The filter index of df, built once per dataset version
+    """
+    return _filter_indexes.get(df, FilterIndex)
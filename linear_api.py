@@ -0,0 +1,319 @@
+"""
+Linear API Module
+Loads issues straight from Linear's GraphQL API instead of the hourly
+Linear → Sheets export: every team's issues are paged through by cursor,
+several teams at once, selecting only the fields behind the columns a page
+reads. The result is the same normalized, typed frame the sheet produces.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from dataset_cache import dataset_cache
+from linear_schema import DATE_COLUMNS, apply_issue_schema, concat_issue_chunks, projection_tag, resolve_projection
+from sample_data import get_sample_okr_data
+from sheet_http import fetch
+from sheet_loader import Diagnostics, LoadResult
+from sheet_snapshot import SheetSnapshot
+from sheets_quota import INTERACTIVE
+from single_flight import single_flight
+
+LINEAR_API_URL = os.environ.get("DASHBOARD_LINEAR_API_URL", "https://api.linear.app/graphql")
+
+# Linear's largest page size
+PAGE_SIZE = 250
+
+# Teams paged through at once
+TEAM_WORKERS = 4
+
+# The API is live, so there's no hourly export to wait for between syncs
+SYNC_INTERVAL_SECONDS = int(os.environ.get("DASHBOARD_LINEAR_SYNC_SECONDS", 300))
+
+# Dashboard column -> the issue fields it's built from (dotted paths into the
+# GraphQL node; 'nodes' walks a connection) and how to combine them
+ISSUE_FIELDS = {
+    'id': ('identifier',),
+    'team': ('team.name',),
+    'title': ('title',),
+    'description': ('description',),
+    'status': ('state.name',),
+    'estimate': ('estimate',),
+    'priority': ('priorityLabel',),
+    'project_id': ('project.id',),
+    'project': ('project.name',),
+    'creator': ('creator.email',),
+    'assignee': ('assignee.email',),
+    'labels': ('labels.nodes.name',),
+    'cycle_number': ('cycle.number',),
+    # Unnamed cycles show up as "Cycle 12", as in the export
+    'cycle': ('cycle.name', 'cycle.number'),
+    'cycle_start': ('cycle.startsAt',),
+    'cycle_end': ('cycle.endsAt',),
+    'createdat': ('createdAt',),
+    'updatedat': ('updatedAt',),
+    'startedat': ('startedAt',),
+    'triaged': ('triagedAt',),
+    'completedat': ('completedAt',),
+    'cancelledat': ('canceledAt',),
+    'archived': ('archivedAt',),
+    'due_date': ('dueDate',),
+    'parent_issue': ('parent.identifier',),
+    'project_milestone_id': ('projectMilestone.id',),
+    'project_milestone': ('projectMilestone.name',),
+}
+
+TEAMS_QUERY = """
+query Teams($first: Int!, $after: String) {
+  organization { id name }
+  teams(first: $first, after: $after) { nodes { id key name } pageInfo { hasNextPage endCursor } }
+}
+"""
+
+ISSUES_QUERY = """
+query TeamIssues($team: String!, $first: Int!, $after: String) {
+  team(id: $team) {
+    issues(first: $first, after: $after) { nodes { %s } pageInfo { hasNextPage endCursor } }
+  }
+}
+"""
+
+
+class LinearApiError(Exception):
+    """
+    The API answered, but with GraphQL errors instead of data
+    """
+
+
+class LinearTeam(NamedTuple):
+    id: str
+    key: str
+    name: str
+
+
+def issue_selection(fields: List[str]) -> str:
+    """
+    GraphQL selection set for the given dashboard columns, e.g.
+    "identifier state { name } labels { nodes { name } }"
+    """
+    tree: Dict[str, dict] = {}
+    for column in fields:
+        for path in ISSUE_FIELDS[column]:
+            node = tree
+            for part in path.split('.'):
+                node = node.setdefault(part, {})
+
+    def render(node: Dict[str, dict]) -> str:
+        return ' '.join(f"{name} {{ {render(child)} }}" if child else name for name, child in node.items())
+
+    return render(tree)
+
+
+def _pluck(node, parts: List[str]):
+    for i, part in enumerate(parts):
+        if node is None:
+            return None
+        if part == 'nodes':
+            # A connection (labels): join its items like the export does
+            values = [_pluck(item, parts[i + 1:]) for item in node.get('nodes') or []]
+            return ', '.join(str(value) for value in values if value is not None) or None
+        node = node.get(part)
+    return node
+
+
+def issue_column_value(column: str, node: dict):
+    """
+    One dashboard column's value from an issue node
+    """
+    values = [_pluck(node, path.split('.')) for path in ISSUE_FIELDS[column]]
+    if column == 'cycle':
+        name, number = values
+        return name or (f"Cycle {number}" if number is not None else None)
+    return values[0]
+
+
+def issues_frame(nodes: List[dict], fields: List[str]) -> pd.DataFrame:
+    """
+    One page of issue nodes as a normalized, typed frame
+    """
+    df = pd.DataFrame({column: [issue_column_value(column, node) for node in nodes] for column in fields})
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            # ISO 8601 in UTC; the export's timestamps are naive
+            df[col] = pd.to_datetime(df[col], utc=True, errors='coerce').dt.tz_convert(None)
+    return apply_issue_schema(df)
+
+
+def dataset_prefix(organization_id: str) -> str:
+    """
+    First element of every cache/dataset key of a workspace's issues
+    """
+    return f"linear:{organization_id}"
+
+
+def issues_snapshot(organization_id: str, team_ids: Tuple[str, ...], projection=None) -> SheetSnapshot:
+    """
+    On-disk copy of a workspace's issues, one per team selection and column projection
+    """
+    teams = hashlib.sha1(','.join(sorted(team_ids)).encode()).hexdigest()[:10]
+    return SheetSnapshot(f"linear-{organization_id}", 'issues', variant=f"{teams}_{projection_tag(projection)}")
+
+
+class LinearApiLoader:
+    """
+    Connection to one Linear workspace through a personal API key. Loads
+    have the same shape as SheetLoader's, so DataService, the sync worker
+    and the pages can use either.
+    """
+
+    def __init__(self, api_url: str = LINEAR_API_URL):
+        self.api_url = api_url
+        self.api_key: Optional[str] = None
+        self.organization_id: Optional[str] = None
+        self.teams: List[LinearTeam] = []
+        self.cache = dataset_cache
+        self.refresh_requested_at = 0.0
+        # Not in the Sheets API quota; set like SheetLoader.priority so background copies look the same
+        self.priority = INTERACTIVE
+        self.sync_interval_seconds = SYNC_INTERVAL_SECONDS
+
+    def connect(self, api_key: str, team_keys: Optional[List[str]] = None) -> Diagnostics:
+        """
+        Check the key and list the workspace's teams, keeping only team_keys
+        (e.g. ["ENG", "MOB"]) when given
+        """
+        diagnostics = Diagnostics()
+        self.api_key = api_key
+        try:
+            teams, organization = [], None
+            cursor = None
+            while True:
+                data = self._query(TEAMS_QUERY, {'first': PAGE_SIZE, 'after': cursor})
+                organization = data['organization']
+                teams += [LinearTeam(t['id'], t['key'], t['name']) for t in data['teams']['nodes']]
+                page = data['teams']['pageInfo']
+                if not page['hasNextPage']:
+                    break
+                cursor = page['endCursor']
+        except Exception as e:
+            diagnostics.add('error', f"Failed to connect to Linear: {str(e)}")
+            return diagnostics
+
+        if team_keys:
+            wanted = {key.strip().upper() for key in team_keys if key.strip()}
+            missing = wanted - {team.key.upper() for team in teams}
+            if missing:
+                diagnostics.add('warning', f"⚠️ No Linear team with key {', '.join(sorted(missing))}")
+            teams = [team for team in teams if team.key.upper() in wanted]
+        if not teams:
+            diagnostics.add('error', "No Linear teams to load")
+            return diagnostics
+
+        self.organization_id = organization['id']
+        self.teams = teams
+        diagnostics.add('success', f"✅ Connected to {organization['name']} ({len(teams)} teams)")
+        return diagnostics
+
+    def _query(self, query: str, variables: dict) -> dict:
+        response = fetch(self.api_url, method='POST', json={'query': query, 'variables': variables},
+                         headers={'Authorization': self.api_key, 'Content-Type': 'application/json'})
+        try:
+            body = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise
+        if body.get('errors'):
+            raise LinearApiError('; '.join(error.get('message', 'unknown error') for error in body['errors']))
+        response.raise_for_status()
+        return body['data']
+
+    def load_issues(self, worksheet_name: str = "Sheet1", columns: Optional[List[str]] = None) -> LoadResult:
+        """
+        Every connected team's issues. worksheet_name is ignored (it's there to
+        match SheetLoader); columns limits the fields requested, as it limits
+        the columns parsed from the sheet.
+        """
+        projection = resolve_projection(columns)
+        cache_key = self._cache_key(projection)
+        if cache_key is None:
+            diagnostics = Diagnostics()
+            diagnostics.add('error', "Not connected to Linear")
+            return LoadResult(None, diagnostics)
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            diagnostics = Diagnostics()
+            diagnostics.unchanged('cache')
+            return LoadResult(cached, diagnostics)
+        # Sessions refreshing the same workspace together share one pull
+        return single_flight.do(('issues', cache_key), lambda: self._load_issues(projection, cache_key))
+
+    def _load_issues(self, projection, cache_key) -> LoadResult:
+        started = time.perf_counter()
+        diagnostics = Diagnostics()
+        fields = [column for column in ISSUE_FIELDS if projection is None or column in projection]
+        selection = issue_selection(fields)
+
+        def load_team(team: LinearTeam) -> Tuple[List[pd.DataFrame], int]:
+            # Cursor pages are sequential within a team; teams run side by side
+            chunks, pages, cursor = [], 0, None
+            while True:
+                data = self._query(ISSUES_QUERY % selection, {'team': team.id, 'first': PAGE_SIZE, 'after': cursor})
+                issues = data['team']['issues']
+                pages += 1
+                if issues['nodes']:
+                    chunks.append(issues_frame(issues['nodes'], fields))
+                if not issues['pageInfo']['hasNextPage']:
+                    return chunks, pages
+                cursor = issues['pageInfo']['endCursor']
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(TEAM_WORKERS, len(self.teams)),
+                                    thread_name_prefix="linear-team") as pool:
+                results = list(pool.map(load_team, self.teams))
+        except Exception as e:
+            diagnostics.add('error', f"Error loading issues from Linear: {str(e)}")
+            return LoadResult(None, diagnostics)
+
+        chunks = [chunk for team_chunks, _ in results for chunk in team_chunks]
+        df = concat_issue_chunks(chunks) if chunks else issues_frame([], fields)
+        self.cache.put(cache_key, df)
+        issues_snapshot(self.organization_id, cache_key[1], projection).save(df)
+        diagnostics.source = 'network'
+        diagnostics.seconds = time.perf_counter() - started
+        diagnostics.add('caption', f"📡 {len(df)} issues from {len(self.teams)} Linear teams "
+                                   f"in {sum(pages for _, pages in results)} pages")
+        return LoadResult(df, diagnostics)
+
+    def load_okrs(self, worksheet_name: str = "OKRs", columns: Optional[List[str]] = None) -> LoadResult:
+        # Linear has no OKRs
+        diagnostics = Diagnostics()
+        diagnostics.source = 'sample'
+        return LoadResult(get_sample_okr_data(), diagnostics)
+
+    def dataset_ref(self, kind: str, worksheet_name: str, columns: Optional[List[str]] = None):
+        """
+        (cache key, local snapshot) as in SheetLoader; OKRs are sample data
+        """
+        projection = resolve_projection(columns)
+        if kind == 'okrs' or self.organization_id is None:
+            return None, None
+        key = self._cache_key(projection)
+        return key, issues_snapshot(self.organization_id, key[1], projection)
+
+    def _cache_key(self, projection=None) -> Optional[tuple]:
+        if self.organization_id is None:
+            return None
+        return (dataset_prefix(self.organization_id), tuple(sorted(team.id for team in self.teams)), projection)
+
+    def invalidate_cache(self) -> None:
+        """
+        Force the next load to pull from the API again
+        """
+        self.refresh_requested_at = time.time()
+        if self.organization_id is not None:
+            self.cache.invalidate_sheet(dataset_prefix(self.organization_id))
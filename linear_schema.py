@@ -0,0 +1,302 @@
+"""
+Linear Issue Schema Module
+Declared dtypes for the normalized Linear issue export: categoricals for
+low-cardinality fields, float32 estimates and explicit-format datetimes
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Callable, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Bump whenever the normalized frame's columns or dtypes change, so stored
+# snapshots of the old shape are ignored
+SCHEMA_VERSION = 2
+
+# Linear writes every timestamp in this layout, e.g. 07/14/2025 09:30:00
+LINEAR_DATE_FORMAT = '%m/%d/%Y %H:%M:%S'
+
+# Linear's EXACT column names from the export and their dashboard names
+LINEAR_COLUMN_MAPPING = {
+    # Issue identification (exactly as in your sheet)
+    'ID': 'id',
+    'id': 'id',
+
+    # Issue details
+    'Title': 'title',
+    'title': 'title',
+    'Description': 'description',
+    'description': 'description',
+
+    # Status (exactly as in your sheet)
+    'Status': 'status',
+    'status': 'status',
+
+    # Assignment (exactly as in your sheet)
+    'Assignee': 'assignee',
+    'assignee': 'assignee',
+    'Creator': 'creator',
+    'creator': 'creator',
+
+    # Estimates (exactly as in your sheet)
+    'Estimate': 'estimate',
+    'estimate': 'estimate',
+
+    # Team/Sprint (exactly as in your sheet)
+    'Team': 'team',
+    'team': 'team',
+    'Cycle Name': 'cycle',
+    'cycle name': 'cycle',
+    'Cycle Number': 'cycle_number',
+    'cycle number': 'cycle_number',
+
+    # Dates (exactly as in your sheet)
+    'Created': 'createdat',
+    'created': 'createdat',
+    'Updated': 'updatedat',
+    'updated': 'updatedat',
+    'Completed': 'completedat',
+    'completed': 'completedat',
+    'Started': 'startedat',
+    'started': 'startedat',
+    'Canceled': 'cancelledat',
+    'canceled': 'cancelledat',
+
+    # Priority (exactly as in your sheet)
+    'Priority': 'priority',
+    'priority': 'priority',
+
+    # Project info
+    'Project': 'project',
+    'project': 'project',
+    'Project ID': 'project_id',
+    'project id': 'project_id',
+
+    # Additional fields
+    'Labels': 'labels',
+    'labels': 'labels',
+    'Cycle Start': 'cycle_start',
+    'cycle start': 'cycle_start',
+    'Cycle End': 'cycle_end',
+    'cycle end': 'cycle_end',
+}
+
+# A handful of distinct values each, repeated on every issue row
+CATEGORICAL_COLUMNS = [
+    'status', 'assignee', 'creator', 'cycle', 'priority', 'team', 'labels', 'project', 'type',
+]
+
+# Story points: small and sometimes fractional or blank
+ESTIMATE_COLUMNS = ['estimate', 'story_points', 'points']
+
+SMALL_INT_COLUMNS = ['cycle_number']
+
+# Whatever this pandas version uses for string labels (str in 3.x, object before)
+STRING_CATEGORIES = pd.Index(['']).astype(str)
+
+DATE_COLUMNS = [
+    'createdat', 'updatedat', 'completedat', 'startedat', 'cancelledat', 'cycle_start', 'cycle_end',
+]
+
+
+# Free text that dominates the export's size; loaded only when a detail view asks
+HEAVY_TEXT_COLUMNS = ['description']
+
+# Derived columns and the parsed columns they are computed from
+DERIVED_COLUMN_SOURCES = {
+    'cycle_time_days': ['completedat', 'startedat', 'createdat'],
+}
+
+
+class ColumnPlan(NamedTuple):
+    """
+    How to turn one header signature into dashboard columns
+    """
+    positions: Tuple[int, ...]  # source columns to keep, in order
+    names: Tuple[str, ...]  # dashboard name for each kept column
+    mapped: Tuple[Tuple[str, str], ...]  # (Linear header, dashboard name) pairs
+    keeps_all: bool
+
+
+def clean_column_name(col: str) -> str:
+    # Clean column names (remove dots, lowercase, etc.)
+    return col.lower().replace('.', '_').replace(' ', '_').replace('-', '_')
+
+
+def dashboard_column_name(header: str) -> str:
+    """
+    The name a Linear header ends up with in the normalized frame
+    """
+    return LINEAR_COLUMN_MAPPING.get(header) or clean_column_name(header)
+
+
+def resolve_projection(columns: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+    """
+    Dashboard columns to parse for a request: the ones asked for, the sources
+    of any derived ones, and 'id' so lazily loaded details can be joined back.
+    None means every column.
+    """
+    if columns is None:
+        return None
+    projection = {'id'} | set(columns)
+    for col in columns:
+        projection.update(DERIVED_COLUMN_SOURCES.get(col, []))
+    return frozenset(projection)
+
+
+def projection_filter(projection: Optional[FrozenSet[str]]) -> Optional[Callable[[str], bool]]:
+    """
+    usecols callable for pandas readers: keep a raw header if its dashboard
+    name is in the projection
+    """
+    if projection is None:
+        return None
+    return lambda header: dashboard_column_name(header) in projection
+
+
+def projection_tag(projection: Optional[FrozenSet[str]]) -> str:
+    """
+    Short, stable name for a projection, for cache keys and snapshot files
+    """
+    if projection is None:
+        return 'all'
+    return hashlib.sha1(','.join(sorted(projection)).encode()).hexdigest()[:10]
+
+
+@lru_cache(maxsize=32)
+def compile_column_plan(columns: Tuple[str, ...]) -> ColumnPlan:
+    """
+    Resolve a header row into a rename/projection plan. Known Linear headers
+    take their mapped name first; every other header keeps its cleaned name
+    unless that name is already taken, in which case it is dropped.
+    """
+    targets = {}
+    mapped = []
+    for pos, col in enumerate(columns):
+        new_col = LINEAR_COLUMN_MAPPING.get(col)
+        if new_col is not None and new_col not in targets.values():
+            targets[pos] = new_col
+            mapped.append((col, new_col))
+
+    taken = set(targets.values())
+    for pos, col in enumerate(columns):
+        if pos in targets or col in LINEAR_COLUMN_MAPPING:
+            continue
+        clean_col = clean_column_name(col)
+        if clean_col not in taken:
+            targets[pos] = clean_col
+            taken.add(clean_col)
+
+    positions = tuple(sorted(targets))
+    return ColumnPlan(
+        positions=positions,
+        names=tuple(targets[pos] for pos in positions),
+        mapped=tuple(mapped),
+        keeps_all=len(positions) == len(columns),
+    )
+
+
+def apply_column_plan(df: pd.DataFrame, plan: ColumnPlan) -> pd.DataFrame:
+    """
+    Relabel df per plan. When every column is kept the labels are swapped in
+    place and no data is touched; otherwise duplicates are projected away.
+    """
+    if not plan.keeps_all:
+        df = df.iloc[:, list(plan.positions)]
+    df.columns = list(plan.names)
+    return df
+
+
+def parse_linear_dates(series: pd.Series) -> pd.Series:
+    """
+    Parse with Linear's known layout; fall back to inference only if that
+    layout matches nothing (e.g. a sheet re-saved with a different locale)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    parsed = pd.to_datetime(series, format=LINEAR_DATE_FORMAT, errors='coerce')
+    if parsed.isna().all() and series.notna().any():
+        parsed = pd.to_datetime(series, errors='coerce')
+    return parsed
+
+
+def to_category(series: pd.Series) -> pd.Series:
+    """
+    Categorical with string categories, so widget selections compare directly
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categorical = series
+    else:
+        # Blank cells are missing values, not a category of their own
+        categorical = series.replace('', np.nan).astype('category')
+    categories = categorical.cat.categories
+    if categories.dtype != STRING_CATEGORIES.dtype:
+        # Numeric cycle names, or an all-blank chunk whose empty categories defaulted to object
+        categorical = categorical.cat.set_categories(categories.astype(str), rename=True)
+    return categorical
+
+
+def apply_issue_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the mapped issue columns to their declared dtypes and derive
+    cycle_time_days. Chunks typed separately must be joined with
+    concat_issue_chunks so their categories line up.
+    """
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = parse_linear_dates(df[col])
+
+    for col in ESTIMATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+
+    for col in SMALL_INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int16')
+
+    # Calculate cycle time if dates are available
+    if 'completedat' in df.columns and 'startedat' in df.columns:
+        df['cycle_time_days'] = (df['completedat'] - df['startedat']).dt.days.astype('float32')
+    elif 'completedat' in df.columns and 'createdat' in df.columns:
+        df['cycle_time_days'] = (df['completedat'] - df['createdat']).dt.days.astype('float32')
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = to_category(df[col])
+
+    return df
+
+
+def concat_issue_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate schema-typed chunks, unifying each categorical column's
+    categories first so the result stays categorical instead of object
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if not all(col in chunk.columns for chunk in chunks):
+            continue
+        categoricals = [to_category(chunk[col]) for chunk in chunks]
+        categories = union_categoricals(categoricals, ignore_order=True).categories
+        for chunk, categorical in zip(chunks, categoricals):
+            chunk[col] = categorical.cat.set_categories(categories)
+
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-column deep memory (MB) of an untyped vs typed frame, largest savings first
+    """
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'mb_before': before.memory_usage(deep=True, index=False) / 1024 / 1024,
+        'dtype_after': after.dtypes.astype(str),
+        'mb_after': after.memory_usage(deep=True, index=False) / 1024 / 1024,
+    })
+    report['saved_mb'] = report['mb_before'] - report['mb_after'].fillna(0)
+    return report.sort_values('saved_mb', ascending=False).round(2)
@@ -0,0 +1,372 @@
+"""
+Linear Webhooks Module
+A small local HTTP endpoint for Linear's issue webhooks. Each create,
+update or remove is upserted into the workspace's published datasets (and,
+a few seconds later, their on-disk snapshots), so open pages pick up a
+status change on their next rerun without anything being fetched. Only
+the Linear API source's datasets are updated; sheet and local-file
+datasets mirror an export and change when it's synced again.
+"""
+
+import hashlib
+import hmac
+import http.server
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from dataset_cache import dataset_cache
+from linear_api import ISSUE_FIELDS, dataset_prefix, issue_column_value, issues_snapshot
+from linear_schema import DATE_COLUMNS, apply_issue_schema, concat_issue_chunks
+
+# Port the endpoint listens on; 0 leaves it off. Behind a tunnel or proxy, set the host to 0.0.0.0
+WEBHOOK_PORT = int(os.environ.get("DASHBOARD_WEBHOOK_PORT", 0))
+WEBHOOK_HOST = os.environ.get("DASHBOARD_WEBHOOK_HOST", "127.0.0.1")
+
+# Signing secret from Linear's webhook settings; unsigned payloads are accepted when unset
+WEBHOOK_SECRET = os.environ.get("DASHBOARD_WEBHOOK_SECRET", "")
+
+# Signed payloads older than this are replays and rejected
+MAX_PAYLOAD_AGE_SECONDS = 60
+
+# Upserted datasets are written to disk at most this often
+SNAPSHOT_FLUSH_SECONDS = 5
+
+# Issues whose newest applied updatedAt is remembered, to skip older redeliveries
+TRACKED_ISSUES = 100000
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Check Linear's Linear-Signature header: hex HMAC-SHA256 of the raw body
+    """
+    if not signature:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def _timestamp_ms(value) -> Optional[float]:
+    # webhookTimestamp is milliseconds since the epoch; a numeric string is accepted too
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def payload_error(payload) -> Optional[str]:
+    """
+    Why a decoded webhook body can't be queued, or None if it's well-formed
+    """
+    if not isinstance(payload, dict):
+        return 'payload is not an object'
+    if not isinstance(payload.get('data', {}), dict):
+        return 'data is not an object'
+    data = payload.get('data') or {}
+    for name, value in [('organizationId', payload.get('organizationId')),
+                        ('identifier', data.get('identifier')), ('updatedAt', data.get('updatedAt'))]:
+        if value is not None and not isinstance(value, str):
+            return f'{name} is not a string'
+    if 'webhookTimestamp' in payload and _timestamp_ms(payload['webhookTimestamp']) is None:
+        return 'webhookTimestamp is not a number'
+    return None
+
+
+def _carries(data: dict, path: str) -> bool:
+    # The payload has the field, or a null parent (e.g. assignee: null when unassigned)
+    node = data
+    for part in path.split('.'):
+        if node is None or part == 'nodes':
+            return True
+        if not isinstance(node, dict) or part not in node:
+            return False
+        node = node[part]
+    return True
+
+
+def _payload_fields(data: dict, columns: List[str]) -> Dict[str, object]:
+    """
+    Dashboard column values an issue payload carries. Webhooks send only
+    some fields (an assignee without an email, say); columns whose fields
+    aren't there are left out so the upsert keeps their current values.
+    """
+    if isinstance(data.get('labels'), list):
+        # Webhooks send labels as a plain list, the API as a connection
+        data = {**data, 'labels': {'nodes': data['labels']}}
+    fields = {}
+    for column in columns:
+        if not _carries(data, ISSUE_FIELDS[column][0]):
+            continue
+        fields[column] = issue_column_value(column, data)
+    return fields
+
+
+def apply_issue_events(frame: pd.DataFrame, events: List[dict],
+                       team_ids: Optional[Tuple[str, ...]] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Upsert a batch of issue webhook payloads into a normalized issues
+    frame, in arrival order. Returns the new frame and how many events
+    touched it; the frame is rebuilt once per batch however many there are.
+    """
+    if 'id' not in frame.columns:
+        return frame, 0
+    columns = [col for col in frame.columns if col in ISSUE_FIELDS and col != 'id']
+    changes: Dict[str, Optional[dict]] = {}  # issue ID -> fields to set, or None to remove
+    applied = 0
+    for event in events:
+        data = event.get('data') or {}
+        issue_id = data.get('identifier')
+        if event.get('type') != 'Issue' or not issue_id:
+            continue
+        if team_ids is not None and data.get('teamId') not in (None, *team_ids):
+            continue
+        applied += 1
+        if event.get('action') == 'remove':
+            changes[issue_id] = None
+        elif changes.get(issue_id) is None:
+            changes[issue_id] = _payload_fields(data, columns)
+        else:
+            changes[issue_id].update(_payload_fields(data, columns))
+    if not changes:
+        return frame, 0
+
+    touched = frame['id'].isin(list(changes))
+    upserts = {issue_id: fields for issue_id, fields in changes.items() if fields is not None}
+    # Current rows of updated issues, blank rows for new ones, then the payloads' fields on top
+    patch = frame[touched].drop_duplicates('id', keep='last').set_index('id').reindex(list(upserts))
+    for col in columns:
+        provided = {issue_id: fields[col] for issue_id, fields in upserts.items() if col in fields}
+        if not provided:
+            continue
+        given = list(provided.values())
+        if col in DATE_COLUMNS:
+            # ISO 8601 in UTC, stored naive like the export's timestamps
+            given = pd.to_datetime(pd.Series(given, dtype=object), utc=True, format='ISO8601',
+                                   errors='coerce').dt.tz_convert(None).astype(object).tolist()
+        values = patch[col].astype(object).to_numpy(copy=True)
+        values[patch.index.get_indexer(list(provided))] = given
+        patch[col] = values
+    patch = apply_issue_schema(patch.reset_index())
+    for col in frame.columns:
+        # Back to the frame's own dtypes where the schema doesn't set one (IDs, text)
+        if not isinstance(frame[col].dtype, pd.CategoricalDtype) and patch[col].dtype != frame[col].dtype:
+            patch[col] = patch[col].astype(frame[col].dtype)
+    return concat_issue_chunks([frame[~touched].copy(deep=False), patch[list(frame.columns)]]).reset_index(drop=True), applied
+
+
+class WebhookIngest:
+    """
+    Applies queued webhook payloads to DataService on one thread. Payloads
+    are drained in batches, so a burst of events costs one frame rebuild
+    per dataset rather than one per event.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self._queue: "queue.Queue[dict]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # Datasets upserted since the last write to disk: (workspace, latest version)
+        self._unsaved: Dict[Hashable, tuple] = {}
+        self._flushed_at = time.monotonic()
+        # Newest updatedAt applied per (workspace, issue ID), least recently changed first
+        self._newest: "OrderedDict[tuple, str]" = OrderedDict()
+        self._applied = threading.Condition()
+        # Metrics
+        self.received = 0
+        self.applied = 0
+        self.ignored = 0
+        self.rejected = 0
+        self.batches = 0
+        self.last_applied_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def submit(self, payload: dict) -> None:
+        self._ensure_running()
+        self._queue.put(payload)
+
+    def _ensure_running(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="webhook-ingest", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=SNAPSHOT_FLUSH_SECONDS)]
+            except queue.Empty:
+                batch = []
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._apply(batch)
+                except Exception as e:
+                    # A malformed payload drops its batch, not the thread
+                    with self._applied:
+                        self.received += len(batch)
+                        self.ignored += len(batch)
+                        self.last_error = str(e)
+                        self._applied.notify_all()
+            if self._unsaved and time.monotonic() - self._flushed_at >= SNAPSHOT_FLUSH_SECONDS:
+                self._flush()
+
+    def _apply(self, batch: List[dict]) -> None:
+        by_workspace: Dict[str, List[dict]] = {}
+        # Stamps of the events kept, remembered only once their workspace's update has gone through
+        stamps: Dict[str, Dict[tuple, str]] = {}
+        for payload in batch:
+            data = payload.get('data') or {}
+            stamp = data.get('updatedAt') or ''
+            organization_id = payload.get('organizationId')
+            seen_key = (organization_id, data.get('identifier'))
+            pending = stamps.setdefault(organization_id, {})
+            # Deliveries can arrive out of order or be retried; an older change never overwrites a newer one
+            if stamp < pending.get(seen_key, self._newest.get(seen_key, '')):
+                continue
+            pending[seen_key] = stamp
+            by_workspace.setdefault(organization_id, []).append(payload)
+
+        applied = 0
+        for organization_id, events in by_workspace.items():
+            counts = {}
+
+            def update(key, frame):
+                # key is (prefix, team IDs, projection), as LinearApiLoader builds it
+                updated, counts[key] = apply_issue_events(frame, events, key[1])
+                return updated if counts[key] else None
+
+            published = self.service.update_versions(dataset_prefix(organization_id), update)
+            for key, version in published.items():
+                # Later loads within the cache TTL must not bring back the pre-webhook frame
+                dataset_cache.put(key, version.frame)
+                self._unsaved[key] = (organization_id, version)
+            applied += max(counts.values(), default=0)
+            self._remember(stamps[organization_id])
+
+        with self._applied:
+            self.received += len(batch)
+            self.applied += applied
+            self.ignored += len(batch) - applied
+            self.batches += 1
+            self.last_applied_at = time.time()
+            self._applied.notify_all()
+
+    def _remember(self, stamps: Dict[tuple, str]) -> None:
+        for seen_key, stamp in stamps.items():
+            self._newest[seen_key] = stamp
+            self._newest.move_to_end(seen_key)
+        # Issues changed least recently are forgotten first; a redelivery that late is rare
+        while len(self._newest) > TRACKED_ISSUES:
+            self._newest.popitem(last=False)
+
+    def _flush(self) -> None:
+        # Only the latest version of each dataset is written, however many batches it took
+        for key, (organization_id, version) in list(self._unsaved.items()):
+            issues_snapshot(organization_id, key[1], key[2]).save(version.frame)
+            del self._unsaved[key]
+        self._flushed_at = time.monotonic()
+
+    def reject(self) -> None:
+        with self._applied:
+            self.rejected += 1
+
+    def wait_for(self, received: int, timeout: float = 30.0) -> bool:
+        """
+        Block until received payloads have been processed (for benchmarks)
+        """
+        with self._applied:
+            return self._applied.wait_for(lambda: self.received >= received, timeout)
+
+    def metrics(self) -> dict:
+        with self._applied:
+            return {
+                'received': self.received,
+                'applied': self.applied,
+                'ignored': self.ignored,
+                'rejected': self.rejected,
+                'batches': self.batches,
+                'queued': self._queue.qsize(),
+                'last_applied_at': self.last_applied_at,
+                'last_error': self.last_error,
+            }
+
+
+def webhook_caption(metrics: dict) -> str:
+    """
+    Sidebar line on pushed updates
+    """
+    last = metrics['last_applied_at']
+    last = datetime.fromtimestamp(last).strftime('%H:%M:%S') if last else "never"
+    caption = f"🪝 Webhooks: {metrics['applied']} issue events applied · last {last}"
+    if metrics['rejected']:
+        caption += f" · ⚠️ {metrics['rejected']} rejected"
+    if metrics['last_error']:
+        caption += f" · ⚠️ {metrics['last_error']}"
+    return caption
+
+
+def serve_webhooks(ingest: WebhookIngest, port: int = WEBHOOK_PORT, host: str = WEBHOOK_HOST,
+                   secret: str = WEBHOOK_SECRET) -> http.server.ThreadingHTTPServer:
+    """
+    Start the endpoint on a daemon thread: POST a Linear webhook payload to
+    any path. Replies as soon as the payload is queued.
+    """
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out as separate writes; don't let delayed ACKs hold the body back
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+            except ValueError:
+                ingest.reject()
+                return self._reply(400, b'bad Content-Length')
+            body = self.rfile.read(length)
+            if secret and not verify_signature(body, self.headers.get('Linear-Signature'), secret):
+                ingest.reject()
+                return self._reply(401, b'bad signature')
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                ingest.reject()
+                return self._reply(400, b'not JSON')
+            error = payload_error(payload)
+            if error:
+                ingest.reject()
+                return self._reply(400, error.encode())
+            sent_at = _timestamp_ms(payload.get('webhookTimestamp'))
+            if secret and (not sent_at or abs(time.time() - sent_at / 1000) > MAX_PAYLOAD_AGE_SECONDS):
+                ingest.reject()
+                return self._reply(401, b'stale payload')
+            ingest.submit(payload)
+            self._reply(200, b'ok')
+
+        def _reply(self, status: int, message: bytes):
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(message)))
+            self.end_headers()
+            self.wfile.write(message)
+
+    server = http.server.ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="webhook-server", daemon=True).start()
+    return server
@@ -0,0 +1,281 @@
+"""
+Local Source Module
+Linear CSV or Excel exports on disk as a data source: a single file, or a
+drop folder whose newest export is used. CSVs are parsed with Arrow's
+multithreaded CSV reader and Excel files are streamed row by row; both go
+through the same column mapping and typed schema as the sheet, and are
+re-ingested only once a changed file has settled and its content hash
+actually differs.
+"""
+
+import csv
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, List, NamedTuple, Optional, Union
+
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+from issue_metrics import tag_version
+from linear_schema import (apply_column_plan, apply_issue_schema, compile_column_plan, concat_issue_chunks,
+                           projection_filter, resolve_projection)
+from sample_data import get_sample_okr_data
+from sheet_loader import Diagnostics, LoadResult
+from single_flight import single_flight
+
+# A file modified more recently than this may still be being written or copied
+DEBOUNCE_SECONDS = 2.0
+
+# Arrow reads the file in blocks of this size, one per thread
+READ_BLOCK_BYTES = 4 << 20
+
+# Excel rows buffered per column before they're typed into a compact chunk
+XLSX_CHUNK_ROWS = 5000
+
+EXPORT_SUFFIXES = ('.csv', '.xlsx')
+
+# Files are hashed in blocks of this size rather than read whole
+HASH_BLOCK_BYTES = 1 << 20
+
+# Ingested frames kept (one per file or folder and column projection); the least recently used is dropped first
+MAX_INGESTED = int(os.environ.get("DASHBOARD_LOCAL_DATASETS", 16))
+
+# An export's bytes, or the path of the file holding them
+ExportSource = Union[bytes, str, Path]
+
+
+def read_linear_csv(source: ExportSource, usecols=None) -> pd.DataFrame:
+    """
+    Parse a Linear CSV export with Arrow's multithreaded reader, keeping
+    only the columns usecols accepts, then map and type it like the sheet
+    """
+    if isinstance(source, bytes):
+        first_line = source.split(b'\n', 1)[0]
+    else:
+        with open(source, 'rb') as f:
+            first_line = f.readline()
+    header = next(csv.reader([first_line.rstrip(b'\r\n').decode('utf-8-sig')]), [])
+    include = [name for name in header if usecols is None or usecols(name)]
+    table = pa_csv.read_csv(
+        pa.BufferReader(source) if isinstance(source, bytes) else str(source),
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=READ_BLOCK_BYTES),
+        # Arrow would take Linear's dates for text anyway; the schema parses them with the export's format
+        convert_options=pa_csv.ConvertOptions(include_columns=include, strings_can_be_null=True),
+    )
+    df = table.to_pandas()
+    df = apply_column_plan(df, compile_column_plan(tuple(df.columns)))
+    return apply_issue_schema(df)
+
+
+def read_linear_xlsx(source: ExportSource, usecols=None) -> pd.DataFrame:
+    """
+    Stream the first sheet of an Excel export in read-only, values-only mode
+    (no cell objects or workbook model) into per-column buffers, typing every
+    XLSX_CHUNK_ROWS rows into a chunk so only compact chunks accumulate
+    """
+    workbook = openpyxl.load_workbook(io.BytesIO(source) if isinstance(source, bytes) else source,
+                                      read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        names = ['' if name is None else str(name) for name in header]
+        keep = [i for i, name in enumerate(names) if usecols is None or usecols(name)]
+        plan = compile_column_plan(tuple(names[i] for i in keep))
+
+        chunks = []
+        buffers = [[] for _ in keep]
+        buffered = 0
+        for row in rows:
+            if all(value is None for value in row):
+                # Formatted but empty rows below the data
+                continue
+            for buffer, i in zip(buffers, keep):
+                buffer.append(row[i] if i < len(row) else None)
+            buffered += 1
+            if buffered == XLSX_CHUNK_ROWS:
+                chunks.append(_typed_chunk(buffers, plan))
+                buffers = [[] for _ in keep]
+                buffered = 0
+        if buffered or not chunks:
+            chunks.append(_typed_chunk(buffers, plan))
+    finally:
+        workbook.close()
+    return concat_issue_chunks(chunks)
+
+
+def _typed_chunk(buffers: List[list], plan) -> pd.DataFrame:
+    # Positional labels first: export headers can repeat
+    df = pd.DataFrame(dict(enumerate(buffers)))
+    return apply_issue_schema(apply_column_plan(df, plan))
+
+
+# Parser per export format
+READERS = {'.csv': read_linear_csv, '.xlsx': read_linear_xlsx}
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """
+    SHA-256 of a file, read a block at a time
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _Ingested(NamedTuple):
+    fingerprint: tuple  # (file, size, mtime_ns) when it was last checked
+    content_hash: str
+    frame: pd.DataFrame
+    ingested_at: float
+
+
+# Ingested frames per (path, column projection), shared by every session in the process
+_ingested: "OrderedDict[Hashable, _Ingested]" = OrderedDict()
+_ingested_lock = threading.Lock()
+
+
+def _lookup(key: Hashable) -> Optional[_Ingested]:
+    with _ingested_lock:
+        ingested = _ingested.get(key)
+        if ingested is not None:
+            _ingested.move_to_end(key)
+        return ingested
+
+
+def _store(key: Hashable, entry: _Ingested) -> None:
+    with _ingested_lock:
+        _ingested[key] = entry
+        _ingested.move_to_end(key)
+        while len(_ingested) > MAX_INGESTED:
+            # An evicted path's next load reads the file again
+            _ingested.popitem(last=False)
+
+
+class LocalFileSource:
+    """
+    A file or drop folder of Linear CSV or Excel exports
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+
+    def current_file(self) -> Optional[Path]:
+        """
+        The file itself, or the newest export in the folder
+        """
+        if self.path.is_file():
+            return self.path
+        if self.path.is_dir():
+            # Skips Excel's ~$ lock files too, which are not workbooks
+            files = [p for p in self.path.iterdir()
+                     if p.suffix.lower() in EXPORT_SUFFIXES and not p.name.startswith('~$') and p.is_file()]
+            return max(files, key=lambda p: p.stat().st_mtime_ns) if files else None
+        return None
+
+    def _key(self, columns: Optional[List[str]]) -> tuple:
+        return (str(self.path.resolve()), resolve_projection(columns))
+
+    def has_update(self, columns: Optional[List[str]] = None) -> bool:
+        """
+        True once a file other than (or changed since) the ingested one has
+        been left alone for DEBOUNCE_SECONDS; cheap enough to poll
+        """
+        ingested = _lookup(self._key(columns))
+        fingerprint = self._fingerprint()
+        if ingested is None or fingerprint is None or fingerprint == ingested.fingerprint:
+            return False
+        return time.time() - fingerprint[2] / 1e9 >= DEBOUNCE_SECONDS
+
+    def _fingerprint(self) -> Optional[tuple]:
+        file = self.current_file()
+        if file is None:
+            return None
+        try:
+            stat = file.stat()
+        except OSError:
+            return None
+        return (str(file), stat.st_size, stat.st_mtime_ns)
+
+    def load_issues(self, columns: Optional[List[str]] = None) -> LoadResult:
+        """
+        The ingested frame for the current file, re-ingesting it if it changed
+        """
+        started = time.perf_counter()
+        diagnostics = Diagnostics()
+        key = self._key(columns)
+        ingested = _lookup(key)
+
+        fingerprint = self._fingerprint()
+        if fingerprint is None:
+            diagnostics.add('error', f"No CSV or Excel export found at {self.path}")
+            return LoadResult(_shared(ingested), diagnostics)
+
+        if ingested is not None:
+            settling = time.time() - fingerprint[2] / 1e9 < DEBOUNCE_SECONDS
+            if fingerprint == ingested.fingerprint or settling:
+                if settling and fingerprint != ingested.fingerprint:
+                    diagnostics.add('caption', f"⏳ {Path(fingerprint[0]).name} is changing; showing the previous version")
+                diagnostics.unchanged('cache')
+                return LoadResult(_shared(ingested), diagnostics)
+
+        # Every session's watcher sees a change at once; they share one read
+        return single_flight.do(('local',) + key, lambda: self._ingest(key, fingerprint, ingested, started))
+
+    def _ingest(self, key: tuple, fingerprint: tuple, ingested: Optional[_Ingested], started: float) -> LoadResult:
+        diagnostics = Diagnostics()
+        try:
+            path = Path(fingerprint[0])
+            # Neither the hash nor the readers hold the whole file in memory
+            content_hash = file_hash(path)
+            if ingested is not None and content_hash == ingested.content_hash:
+                # Touched or re-saved without changes: keep the frame, remember the new stat
+                frame = ingested.frame
+                diagnostics.unchanged('revalidated')
+            else:
+                reader = READERS.get(path.suffix.lower(), read_linear_csv)
+                frame = reader(path, projection_filter(key[1]))
+                diagnostics.source = 'file'
+                diagnostics.add('caption', f"📂 Read {len(frame)} issues from {path.name}")
+        except Exception as e:
+            diagnostics.add('error', f"Failed to read {fingerprint[0]}: {str(e)}")
+            return LoadResult(_shared(ingested), diagnostics)
+
+        ingested_at = ingested.ingested_at if diagnostics.source == 'revalidated' else time.time()
+        entry = _Ingested(fingerprint, content_hash, frame, ingested_at)
+        _store(key, entry)
+        diagnostics.seconds = time.perf_counter() - started
+        return LoadResult(_shared(entry), diagnostics)
+
+    def ingested_at(self, columns: Optional[List[str]] = None) -> Optional[float]:
+        """
+        When the frame currently served was read from disk
+        """
+        ingested = _lookup(self._key(columns))
+        return ingested.ingested_at if ingested else None
+
+    def load_okrs(self) -> LoadResult:
+        # Linear exports have no OKRs
+        diagnostics = Diagnostics()
+        diagnostics.source = 'sample'
+        return LoadResult(get_sample_okr_data(), diagnostics)
+
+
+def _shared(ingested: Optional[_Ingested]) -> Optional[pd.DataFrame]:
+    # Shallow copy: pages can add columns without touching the shared frame
+    if ingested is None:
+        return None
+    frame = ingested.frame.copy(deep=False)
+    # The same bytes always parse to the same frame, so the hash identifies its version
+    tag_version(frame, ('local', ingested.content_hash))
+    return frame
@@ -10,6 +10,12 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 from connect_google_sheet import GoogleSheetConnector, get_sample_data, get_sample_okr_data
+from data_service import DatasetRequest, data_service, show_freshness
+from issue_metrics import DONE_STATUS, issue_cube, issue_filter_mask
+
+# Issue columns this page reads; the loader parses only these
+ISSUE_COLUMNS = ['cycle', 'status', 'assignee', 'estimate', 'type', 'cycle_time_days']
+OKR_COLUMNS = ['objective', 'key_result', 'owner', 'target', 'current', 'progress', 'status']
 
 # Configure page
 st.set_page_config(
@@ -146,6 +152,8 @@ def main():
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🔄 Refresh", type="secondary"):
+                if 'connector' in st.session_state:
+                    st.session_state.connector.invalidate_cache()
                 st.rerun()
         with col2:
             if st.button("📊 Export", type="secondary"):
@@ -181,9 +189,18 @@ def load_dashboard_data(data_source):
             return get_sample_data(), get_sample_okr_data()
         else:
             if 'connector' in st.session_state:
-                issues = st.session_state.connector.load_issues_data()
-                okrs = st.session_state.connector.load_okr_data()
-                return issues, okrs
+                connector = st.session_state.connector
+                # Last good dataset right away; a stale one is refreshed in the background
+                # Issues and OKRs load side by side; the page waits for the slower one
+                loaded = data_service.load_all(connector, {
+                    'issues': DatasetRequest('issues', "Sheet1", ISSUE_COLUMNS),
+                    'OKRs': DatasetRequest('okrs', "OKRs", OKR_COLUMNS),
+                })
+                issues, okrs = loaded['issues'], loaded['OKRs']
+                if issues is None:
+                    return None, None
+                show_freshness(connector, issues, columns=ISSUE_COLUMNS)
+                return issues.frame, okrs.frame if okrs is not None else None
             else:
                 st.warning("⚠️ Please connect to Google Sheet first")
                 return None, None
@@ -201,10 +218,12 @@ def render_scrum_tab(df):
         sprints = ['All'] + sorted(df['cycle'].unique()) if 'cycle' in df.columns else ['All']
         selected_sprint = st.selectbox("🏃‍♂️ Select Sprint:", sprints)
     
-    # Filter data
-    filtered_df = df[df['cycle'] == selected_sprint].copy() if selected_sprint != 'All' else df.copy()
+    # Filter data - cards and charts are slices of the dataset's cube
+    cube = issue_cube(df)
+    sprint_filter = {'cycle': selected_sprint} if selected_sprint != 'All' else {}
+    metrics = cube.metrics(**sprint_filter)
     
-    if filtered_df.empty:
+    if metrics.issues == 0:
         st.warning("⚠️ No data for selected sprint")
         return
     
@@ -212,20 +231,16 @@ def render_scrum_tab(df):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        completed = len(filtered_df[filtered_df['status'] == 'Done'])
-        st.metric("✅ Completed", completed, help="Issues marked as Done")
+        st.metric("✅ Completed", metrics.completed_issues, help="Issues marked as Done")
     
     with col2:
-        points = int(filtered_df['estimate'].sum()) if 'estimate' in filtered_df.columns else 0
-        st.metric("📊 Story Points", points, help="Total story points")
+        st.metric("📊 Story Points", int(metrics.total_points), help="Total story points")
     
     with col3:
-        cycle_time = filtered_df['cycle_time_days'].mean() if 'cycle_time_days' in filtered_df.columns else 0
-        st.metric("⏱️ Cycle Time", f"{cycle_time:.1f}d", help="Average completion time")
+        st.metric("⏱️ Cycle Time", f"{metrics.mean_cycle_time:.1f}d", help="Average completion time")
     
     with col4:
-        rate = (completed / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-        st.metric("🎯 Completion", f"{rate:.1f}%", help="Completion percentage")
+        st.metric("🎯 Completion", f"{metrics.completion_rate:.1f}%", help="Completion percentage")
     
     st.markdown("---")
     
@@ -235,7 +250,7 @@ def render_scrum_tab(df):
     with col1:
         # Velocity chart
         if 'cycle' in df.columns and 'estimate' in df.columns:
-            velocity = df[df['status'] == 'Done'].groupby('cycle')['estimate'].sum().reset_index()
+            velocity = cube.by('cycle', status=DONE_STATUS)['total_points'].rename('estimate').reset_index()
             if not velocity.empty:
                 fig = px.bar(velocity, x='cycle', y='estimate', 
                            title="📈 Sprint Velocity", color='estimate',
@@ -244,7 +259,7 @@ def render_scrum_tab(df):
                 st.plotly_chart(fig, use_container_width=True)
         
         # Status breakdown
-        status_counts = filtered_df['status'].value_counts()
+        status_counts = cube.by('status', **sprint_filter)['issues']
         fig = px.pie(values=status_counts.values, names=status_counts.index,
                     title="📊 Status Distribution", 
                     color_discrete_sequence=px.colors.qualitative.Set3)
@@ -254,8 +269,8 @@ def render_scrum_tab(df):
     
     with col2:
         # Burndown simulation
-        total_points = filtered_df['estimate'].sum() if 'estimate' in filtered_df.columns else 100
-        completed_points = filtered_df[filtered_df['status'] == 'Done']['estimate'].sum() if 'estimate' in filtered_df.columns else 50
+        total_points = metrics.total_points if 'estimate' in df.columns else 100
+        completed_points = metrics.completed_points if 'estimate' in df.columns else 50
         
         days = list(range(15))
         ideal = [total_points - (total_points/14) * day for day in days]
@@ -269,9 +284,9 @@ def render_scrum_tab(df):
         fig.update_layout(title="🔥 Sprint Burndown", height=350)
         st.plotly_chart(fig, use_container_width=True)
         
-        # Cycle time distribution
-        if 'cycle_time_days' in filtered_df.columns:
-            cycle_data = filtered_df.dropna(subset=['cycle_time_days'])
+        # Cycle time distribution - the one chart that needs the issues themselves
+        if 'cycle_time_days' in df.columns:
+            cycle_data = df[issue_filter_mask(df, **sprint_filter)].dropna(subset=['cycle_time_days'])
             if not cycle_data.empty:
                 fig = px.histogram(cycle_data, x='cycle_time_days', 
                                  title="⏳ Cycle Time Distribution",
@@ -328,36 +343,35 @@ def render_performance_tab(df):
         types = ['All'] + sorted(df['type'].unique()) if 'type' in df.columns else ['All']
         work_type = st.selectbox("🏷️ Type:", types, key="perf_type")
     
-    # Apply filters
-    filtered_df = df.copy()
+    # Apply filters - as slices of the dataset's cube rather than of the issues
+    cube = issue_cube(df)
+    perf_filter = {}
     if sprint != 'All':
-        filtered_df = filtered_df[filtered_df['cycle'] == sprint]
+        perf_filter['cycle'] = sprint
     if person != 'All':
-        filtered_df = filtered_df[filtered_df['assignee'] == person]
+        perf_filter['assignee'] = person
     if work_type != 'All':
-        filtered_df = filtered_df[filtered_df['type'] == work_type]
+        perf_filter['type'] = work_type
+    metrics = cube.metrics(**perf_filter)
     
-    if filtered_df.empty:
+    if metrics.issues == 0:
         st.warning("⚠️ No data for selected filters")
         return
+    by_person = cube.by('assignee', **perf_filter) if 'assignee' in df.columns else None
     
     # Performance metrics
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        st.metric("📋 Assigned", len(filtered_df))
+        st.metric("📋 Assigned", metrics.issues)
     with col2:
-        completed = len(filtered_df[filtered_df['status'] == 'Done'])
-        st.metric("✅ Completed", completed)
+        st.metric("✅ Completed", metrics.completed_issues)
     with col3:
-        rate = (completed / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-        st.metric("🎯 Rate", f"{rate:.1f}%")
+        st.metric("🎯 Rate", f"{metrics.completion_rate:.1f}%")
     with col4:
-        cycle_avg = filtered_df['cycle_time_days'].mean() if 'cycle_time_days' in filtered_df.columns else 0
-        st.metric("⏱️ Cycle Time", f"{cycle_avg:.1f}d")
+        st.metric("⏱️ Cycle Time", f"{metrics.mean_cycle_time:.1f}d")
     with col5:
-        points = int(filtered_df['estimate'].sum()) if 'estimate' in filtered_df.columns else 0
-        st.metric("📈 Points", points)
+        st.metric("📈 Points", int(metrics.total_points))
     
     st.markdown("---")
     
@@ -366,11 +380,9 @@ def render_performance_tab(df):
     
     with col1:
         # Completion by person
-        if 'assignee' in filtered_df.columns:
-            completion_data = filtered_df.groupby('assignee').agg({
-                'status': lambda x: (x == 'Done').sum(),
-                'assignee': 'count'
-            }).rename(columns={'status': 'completed', 'assignee': 'total'}).reset_index()
+        if 'assignee' in df.columns:
+            completion_data = by_person[['completed_issues', 'issues']].rename(
+                columns={'completed_issues': 'completed', 'issues': 'total'}).reset_index()
             
             fig = px.bar(completion_data, x='assignee', y=['completed', 'total'],
                         title="👥 Completed vs Assigned", barmode='group',
@@ -379,10 +391,9 @@ def render_performance_tab(df):
             st.plotly_chart(fig, use_container_width=True)
         
         # Cycle time by person
-        if 'assignee' in filtered_df.columns and 'cycle_time_days' in filtered_df.columns:
-            cycle_data = filtered_df.dropna(subset=['cycle_time_days'])
-            if not cycle_data.empty:
-                avg_cycle = cycle_data.groupby('assignee')['cycle_time_days'].mean().reset_index()
+        if 'assignee' in df.columns and 'cycle_time_days' in df.columns:
+            avg_cycle = by_person['mean_cycle_time'].dropna().rename('cycle_time_days').reset_index()
+            if not avg_cycle.empty:
                 fig = px.bar(avg_cycle, x='assignee', y='cycle_time_days',
                            title="⏳ Cycle Time by Person", color='cycle_time_days',
                            color_continuous_scale='RdYlGn_r')
@@ -391,10 +402,8 @@ def render_performance_tab(df):
     
     with col2:
         # Points comparison
-        if 'assignee' in filtered_df.columns and 'estimate' in filtered_df.columns:
-            points_data = filtered_df.groupby('assignee').agg({
-                'estimate': ['sum', lambda x: x[filtered_df.loc[x.index, 'status'] == 'Done'].sum()]
-            }).round(1)
+        if 'assignee' in df.columns and 'estimate' in df.columns:
+            points_data = by_person[['total_points', 'completed_points']].round(1)
             points_data.columns = ['estimated', 'completed']
             points_data = points_data.reset_index()
             
@@ -405,9 +414,8 @@ def render_performance_tab(df):
             st.plotly_chart(fig, use_container_width=True)
         
         # Workload distribution
-        if 'assignee' in filtered_df.columns:
-            workload = filtered_df['assignee'].value_counts().reset_index()
-            workload.columns = ['assignee', 'issues']
+        if 'assignee' in df.columns:
+            workload = by_person['issues'].reset_index()
             
             fig = px.pie(workload, values='issues', names='assignee',
                         title="📈 Workload Distribution",
@@ -8,6 +8,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from connect_google_sheet import GoogleSheetConnector, get_sample_okr_data
+from data_service import data_service
+
+OKR_COLUMNS = ['objective', 'key_result', 'owner', 'target', 'current', 'progress', 'status']
 
 def main():
     st.set_page_config(
@@ -43,10 +46,11 @@ def main():
         st.info("Using sample OKR data for demonstration")
     else:
         if 'connector' in st.session_state:
-            df = st.session_state.connector.load_okr_data()
-            if df is None or df.empty:
+            okrs = data_service.load_okrs(st.session_state.connector, columns=OKR_COLUMNS)
+            if okrs is None or okrs.frame.empty:
                 st.error("Failed to load OKR data from Google Sheet")
                 return
+            df = okrs.frame
         else:
             st.warning("Please connect to a Google Sheet first")
             return
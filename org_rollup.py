@@ -0,0 +1,97 @@
+"""
+Org Rollup Module
+Fan-in of every team's Linear → Sheets export: connects to all the team
+sheets at once and merges their issue frames into one org-wide frame,
+tagged by source team and deduplicated by issue ID
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from linear_schema import concat_issue_chunks
+from sheet_loader import Diagnostics, SheetLoader
+
+# Most team sheets connected (gid discovery) at once
+CONNECT_WORKERS = 8
+
+
+class TeamSheet(NamedTuple):
+    team: str
+    sheet_url: str
+
+
+class SourceFreshness(NamedTuple):
+    """
+    How current one team's part of the rollup is
+    """
+    team: str
+    rows: int
+    as_of: Optional[float]  # None when the team's sheet has never loaded
+    source: Optional[str]  # 'network' or 'snapshot', as in DatasetVersion
+    error: Optional[str]
+
+
+class OrgRollup(NamedTuple):
+    frame: pd.DataFrame
+    sources: List[SourceFreshness]
+
+
+def parse_team_sheets(text: str) -> List[TeamSheet]:
+    """
+    Read "Team name, sheet URL" lines; blank lines and lines without a URL are skipped
+    """
+    sources = []
+    for line in text.splitlines():
+        team, _, url = line.partition(',')
+        if url.strip():
+            sources.append(TeamSheet(team.strip(), url.strip()))
+    return sources
+
+
+def connect_team_sheets(sources: List[TeamSheet]) -> Tuple[Dict[str, SheetLoader], Dict[str, Diagnostics]]:
+    """
+    Connect to every team's sheet concurrently. Returns the loaders that
+    connected, by team, and every team's connect diagnostics.
+    """
+    if not sources:
+        return {}, {}
+
+    def connect(source: TeamSheet) -> Tuple[SheetLoader, Diagnostics]:
+        loader = SheetLoader()
+        return loader, loader.connect_url(source.sheet_url)
+
+    with ThreadPoolExecutor(max_workers=min(CONNECT_WORKERS, len(sources)), thread_name_prefix="team-connect") as pool:
+        connected = dict(zip((source.team for source in sources), pool.map(connect, sources)))
+
+    loaders = {team: loader for team, (loader, diagnostics) in connected.items() if diagnostics.error is None}
+    return loaders, {team: diagnostics for team, (_, diagnostics) in connected.items()}
+
+
+def combine_team_frames(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    One frame from every team's issues, with a categorical source_team
+    column. An issue exported by several teams' sheets is kept once: the
+    most recently updated copy when 'updatedat' was loaded, else the first
+    team's.
+    """
+    teams = [team for team, frame in frames.items() if frame is not None and not frame.empty]
+    if not teams:
+        return pd.DataFrame()
+
+    # Shallow copies: unifying categories assigns columns, and the inputs are shared versions
+    combined = concat_issue_chunks([frames[team].copy(deep=False) for team in teams])
+    lengths = [len(frames[team]) for team in teams]
+    combined['source_team'] = pd.Categorical.from_codes(np.repeat(np.arange(len(teams)), lengths), categories=teams)
+
+    if 'id' in combined.columns:
+        if 'updatedat' in combined.columns:
+            # Newest copy first, then first team wins ties; restore export order afterwards
+            order = combined['updatedat'].sort_values(ascending=False, kind='stable', na_position='last').index
+            combined = combined.loc[order].drop_duplicates('id').sort_index()
+        else:
+            combined = combined.drop_duplicates('id')
+        combined = combined.reset_index(drop=True)
+    return combined
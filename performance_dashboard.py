@@ -9,6 +9,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 from connect_google_sheet import GoogleSheetConnector, get_sample_data
+from data_service import data_service, show_freshness
+from issue_metrics import DONE_STATUS, issue_cube, issue_filter_mask
+
+# Issue columns this page reads; the loader parses only these
+ISSUE_COLUMNS = ['cycle', 'status', 'assignee', 'estimate', 'type', 'title', 'completedat', 'cycle_time_days']
 
 def main():
     st.set_page_config(
@@ -44,10 +49,13 @@ def main():
         st.info("Using sample data for demonstration")
     else:
         if 'connector' in st.session_state:
-            df = st.session_state.connector.load_issues_data()
-            if df is None or df.empty:
+            # Last good dataset right away; a stale one is refreshed in the background
+            issues = data_service.load_issues(st.session_state.connector, columns=ISSUE_COLUMNS)
+            if issues is None or issues.frame.empty:
                 st.error("Failed to load data from Google Sheet")
                 return
+            df = issues.frame
+            show_freshness(st.session_state.connector, issues, columns=ISSUE_COLUMNS)
         else:
             st.warning("Please connect to a Google Sheet first")
             return
@@ -71,19 +79,20 @@ def main():
         available_roles = ['All'] + list(df['type'].unique()) if 'type' in df.columns else ['All']
         selected_role = st.selectbox("Select Role/Type:", available_roles)
     
-    # Apply filters
-    filtered_df = df.copy()
+    # Apply filters - as slices of the dataset's cube rather than of the issues
+    filters = {}
     
     if selected_sprint != 'All':
-        filtered_df = filtered_df[filtered_df['cycle'] == selected_sprint]
+        filters['cycle'] = selected_sprint
     
     if selected_person != 'All':
-        filtered_df = filtered_df[filtered_df['assignee'] == selected_person]
+        filters['assignee'] = selected_person
     
     if selected_role != 'All':
-        filtered_df = filtered_df[filtered_df['type'] == selected_role]
+        filters['type'] = selected_role
     
-    if filtered_df.empty:
+    metrics = issue_cube(df).metrics(**filters)
+    if metrics.issues == 0:
         st.warning("No data available for selected filters")
         return
     
@@ -93,24 +102,19 @@ def main():
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        total_assigned = len(filtered_df)
-        st.metric("📋 Total Assigned", total_assigned)
+        st.metric("📋 Total Assigned", metrics.issues)
     
     with col2:
-        completed_count = len(filtered_df[filtered_df['status'] == 'Done'])
-        st.metric("✅ Completed", completed_count)
+        st.metric("✅ Completed", metrics.completed_issues)
     
     with col3:
-        completion_rate = (completed_count / total_assigned * 100) if total_assigned > 0 else 0
-        st.metric("🎯 Completion Rate", f"{completion_rate:.1f}%")
+        st.metric("🎯 Completion Rate", f"{metrics.completion_rate:.1f}%")
     
     with col4:
-        avg_cycle_time = filtered_df['cycle_time_days'].mean() if 'cycle_time_days' in filtered_df.columns else 0
-        st.metric("⏱️ Avg Cycle Time", f"{avg_cycle_time:.1f} days")
+        st.metric("⏱️ Avg Cycle Time", f"{metrics.mean_cycle_time:.1f} days")
     
     with col5:
-        total_points = filtered_df['estimate'].sum() if 'estimate' in filtered_df.columns else 0
-        st.metric("📈 Total Points", int(total_points))
+        st.metric("📈 Total Points", int(metrics.total_points))
     
     st.markdown("---")
     
@@ -119,39 +123,37 @@ def main():
     
     with col1:
         st.subheader("👥 Work Completed by Person")
-        create_completion_by_person_chart(filtered_df)
+        create_completion_by_person_chart(df, filters)
         
         st.subheader("📊 Estimated vs Completed Points")
-        create_points_comparison_chart(filtered_df)
+        create_points_comparison_chart(df, filters)
     
     with col2:
         st.subheader("⏳ Average Cycle Time by Person")
-        create_cycle_time_by_person_chart(filtered_df)
+        create_cycle_time_by_person_chart(df, filters)
         
         st.subheader("📈 Workload Distribution")
-        create_workload_distribution_chart(filtered_df)
+        create_workload_distribution_chart(df, filters)
     
     # Detailed performance table
     st.markdown("---")
     st.subheader("📋 Detailed Performance Table")
-    create_performance_table(filtered_df)
+    create_performance_table(df, filters)
     
     # Individual deep dive
     if selected_person != 'All':
         st.markdown("---")
         st.subheader(f"🔍 Deep Dive: {selected_person}")
-        create_individual_deep_dive(filtered_df, selected_person)
+        create_individual_deep_dive(df, filters)
 
-def create_completion_by_person_chart(df):
+def create_completion_by_person_chart(df, filters):
     """Create bar chart of completed work by person"""
     if 'assignee' not in df.columns:
         st.warning("No assignee data available")
         return
     
-    completion_data = df.groupby('assignee').agg({
-        'status': lambda x: (x == 'Done').sum(),
-        'assignee': 'count'
-    }).rename(columns={'status': 'completed', 'assignee': 'total'})
+    completion_data = issue_cube(df).by('assignee', **filters)[['completed_issues', 'issues']].rename(
+        columns={'completed_issues': 'completed', 'issues': 'total'})
     
     completion_data = completion_data.reset_index()
     
@@ -167,15 +169,13 @@ def create_completion_by_person_chart(df):
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
 
-def create_points_comparison_chart(df):
+def create_points_comparison_chart(df, filters):
     """Create comparison of estimated vs completed points"""
     if 'assignee' not in df.columns or 'estimate' not in df.columns:
         st.warning("Missing data for points comparison")
         return
     
-    points_data = df.groupby('assignee').agg({
-        'estimate': ['sum', lambda x: x[df.loc[x.index, 'status'] == 'Done'].sum()]
-    }).round(1)
+    points_data = issue_cube(df).by('assignee', **filters)[['total_points', 'completed_points']].round(1)
     
     points_data.columns = ['estimated_points', 'completed_points']
     points_data = points_data.reset_index()
@@ -192,20 +192,20 @@ def create_points_comparison_chart(df):
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
 
-def create_cycle_time_by_person_chart(df):
+def create_cycle_time_by_person_chart(df, filters):
     """Create cycle time analysis by person"""
     if 'assignee' not in df.columns or 'cycle_time_days' not in df.columns:
         st.warning("Missing data for cycle time analysis")
         return
     
-    # Filter out null cycle times
-    cycle_data = df.dropna(subset=['cycle_time_days'])
+    # People without any cycle times have no mean
+    avg_cycle_time = issue_cube(df).by('assignee', **filters)['mean_cycle_time'].dropna()
     
-    if cycle_data.empty:
+    if avg_cycle_time.empty:
         st.warning("No cycle time data available")
         return
     
-    avg_cycle_time = cycle_data.groupby('assignee')['cycle_time_days'].mean().reset_index()
+    avg_cycle_time = avg_cycle_time.rename('cycle_time_days').reset_index()
     
     fig = px.bar(
         avg_cycle_time,
@@ -218,14 +218,13 @@ def create_cycle_time_by_person_chart(df):
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
 
-def create_workload_distribution_chart(df):
+def create_workload_distribution_chart(df, filters):
     """Create workload distribution chart"""
     if 'assignee' not in df.columns:
         st.warning("No assignee data for workload analysis")
         return
     
-    workload_data = df['assignee'].value_counts().reset_index()
-    workload_data.columns = ['assignee', 'assigned_issues']
+    workload_data = issue_cube(df).by('assignee', **filters)['issues'].rename('assigned_issues').reset_index()
     
     fig = px.pie(
         workload_data,
@@ -237,35 +236,31 @@ def create_workload_distribution_chart(df):
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
 
-def create_performance_table(df):
+def create_performance_table(df, filters):
     """Create detailed performance table"""
     if 'assignee' not in df.columns:
         st.warning("No assignee data for performance table")
         return
     
     # Calculate performance metrics per person
-    performance_metrics = []
-    
-    for person in df['assignee'].unique():
-        person_data = df[df['assignee'] == person]
-        
-        metrics = {
-            'Team Member': person,
-            'Total Assigned': len(person_data),
-            'Completed': len(person_data[person_data['status'] == 'Done']),
-            'In Progress': len(person_data[person_data['status'] == 'In Progress']),
-            'Completion Rate': f"{(len(person_data[person_data['status'] == 'Done']) / len(person_data) * 100):.1f}%"
-        }
-        
-        if 'estimate' in df.columns:
-            metrics['Total Points'] = person_data['estimate'].sum()
-            metrics['Completed Points'] = person_data[person_data['status'] == 'Done']['estimate'].sum()
-        
-        if 'cycle_time_days' in df.columns:
-            avg_cycle = person_data['cycle_time_days'].mean()
-            metrics['Avg Cycle Time'] = f"{avg_cycle:.1f} days" if not pd.isna(avg_cycle) else "N/A"
-        
-        performance_metrics.append(metrics)
+    cube = issue_cube(df)
+    by_person = cube.by('assignee', **filters)
+    in_progress = cube.by('assignee', status='In Progress', **filters)['issues']
+    performance_metrics = {
+        'Team Member': by_person.index,
+        'Total Assigned': by_person['issues'],
+        'Completed': by_person['completed_issues'],
+        'In Progress': in_progress.reindex(by_person.index, fill_value=0),
+        'Completion Rate': (by_person['completed_issues'] / by_person['issues'] * 100).map('{:.1f}%'.format),
+    }
+    
+    if 'estimate' in df.columns:
+        performance_metrics['Total Points'] = by_person['total_points']
+        performance_metrics['Completed Points'] = by_person['completed_points']
+    
+    if 'cycle_time_days' in df.columns:
+        performance_metrics['Avg Cycle Time'] = by_person['mean_cycle_time'].map(
+            lambda avg_cycle: f"{avg_cycle:.1f} days" if not pd.isna(avg_cycle) else "N/A")
     
     performance_df = pd.DataFrame(performance_metrics)
     
@@ -276,33 +271,34 @@ def create_performance_table(df):
         hide_index=True
     )
 
-def create_individual_deep_dive(df, person_name):
+def create_individual_deep_dive(df, filters):
     """Create individual performance deep dive"""
-    person_data = df[df['assignee'] == person_name]
+    person_name = filters['assignee']
+    cube = issue_cube(df)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.write("**📈 Work Distribution by Status**")
-        status_dist = person_data['status'].value_counts()
+        status_dist = cube.by('status', **filters)['issues']
         fig = px.pie(values=status_dist.values, names=status_dist.index)
         fig.update_layout(height=300)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         st.write("**📊 Work Distribution by Type**")
-        if 'type' in person_data.columns:
-            type_dist = person_data['type'].value_counts()
+        if 'type' in df.columns:
+            type_dist = cube.by('type', **filters)['issues']
             fig = px.pie(values=type_dist.values, names=type_dist.index)
             fig.update_layout(height=300)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No type information available")
     
-    # Recent work timeline
+    # Recent work timeline - these are the person's issues themselves
     st.write("**📅 Recent Work Timeline**")
-    if 'completedat' in person_data.columns:
-        completed_items = person_data[person_data['status'] == 'Done'].copy()
+    if 'completedat' in df.columns:
+        completed_items = df[issue_filter_mask(df, status=DONE_STATUS, **filters)]
         if not completed_items.empty:
             completed_items = completed_items.sort_values('completedat', ascending=False).head(10)
             
@@ -319,6 +315,23 @@ def create_individual_deep_dive(df, person_name):
                 use_container_width=True,
                 hide_index=True
             )
+
+            # Descriptions aren't part of the dashboard load; fetch them only when asked
+            if st.checkbox("📝 Show descriptions", key=f"descriptions_{person_name}"):
+                if 'description' in completed_items.columns:
+                    details = completed_items[['title', 'description']]
+                elif 'connector' in st.session_state and 'id' in completed_items.columns:
+                    details = st.session_state.connector.load_issue_details(completed_items['id'])
+                    details = completed_items[['id', 'title']].merge(details, on='id', how='left')[['title', 'description']]
+                else:
+                    details = None
+
+                if details is not None and 'description' in details.columns:
+                    for _, item in details.iterrows():
+                        with st.expander(f"📌 {item['title']}"):
+                            st.write(item['description'] if pd.notna(item['description']) else "_No description_")
+                else:
+                    st.info("No description information available")
         else:
             st.info("No completed items found")
     else:
@@ -10,6 +10,11 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 from connect_google_sheet import GoogleSheetConnector, get_sample_data
+from data_service import data_service, show_freshness
+from issue_metrics import DONE_STATUS, issue_cube, issue_filter_mask
+
+# Issue columns this page reads; the loader parses only these
+ISSUE_COLUMNS = ['cycle', 'status', 'estimate', 'createdat', 'cycle_time_days']
 
 def main():
     st.set_page_config(
@@ -45,10 +50,13 @@ def main():
         st.info("Using sample data for demonstration")
     else:
         if 'connector' in st.session_state:
-            df = st.session_state.connector.load_issues_data()
-            if df is None or df.empty:
+            # Last good dataset right away; a stale one is refreshed in the background
+            issues = data_service.load_issues(st.session_state.connector, columns=ISSUE_COLUMNS)
+            if issues is None or issues.frame.empty:
                 st.error("Failed to load data from Google Sheet")
                 return
+            df = issues.frame
+            show_freshness(st.session_state.connector, issues, columns=ISSUE_COLUMNS)
         else:
             st.warning("Please connect to a Google Sheet first")
             return
@@ -61,13 +69,11 @@ def main():
     available_sprints = df['cycle'].unique() if 'cycle' in df.columns else ['All']
     selected_sprint = st.selectbox("Select Sprint:", ['All'] + list(available_sprints))
     
-    # Filter data by sprint
-    if selected_sprint != 'All':
-        filtered_df = df[df['cycle'] == selected_sprint].copy()
-    else:
-        filtered_df = df.copy()
+    # Filter by sprint - cards and charts are slices of the dataset's cube
+    sprint_filter = {'cycle': selected_sprint} if selected_sprint != 'All' else {}
+    metrics = issue_cube(df).metrics(**sprint_filter)
     
-    if filtered_df.empty:
+    if metrics.issues == 0:
         st.warning("No data available for selected sprint")
         return
     
@@ -76,20 +82,16 @@ def main():
     
     # Key metrics
     with col1:
-        completed_issues = len(filtered_df[filtered_df['status'] == 'Done'])
-        st.metric("✅ Completed Issues", completed_issues)
+        st.metric("✅ Completed Issues", metrics.completed_issues)
     
     with col2:
-        total_points = filtered_df['estimate'].sum() if 'estimate' in filtered_df.columns else 0
-        st.metric("📊 Total Story Points", int(total_points))
+        st.metric("📊 Total Story Points", int(metrics.total_points))
     
     with col3:
-        avg_cycle_time = filtered_df['cycle_time_days'].mean() if 'cycle_time_days' in filtered_df.columns else 0
-        st.metric("⏱️ Avg Cycle Time", f"{avg_cycle_time:.1f} days")
+        st.metric("⏱️ Avg Cycle Time", f"{metrics.mean_cycle_time:.1f} days")
     
     with col4:
-        completion_rate = (completed_issues / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-        st.metric("🎯 Completion Rate", f"{completion_rate:.1f}%")
+        st.metric("🎯 Completion Rate", f"{metrics.completion_rate:.1f}%")
     
     st.markdown("---")
     
@@ -101,19 +103,20 @@ def main():
         create_velocity_chart(df)
         
         st.subheader("🔥 Burndown Chart")
-        create_burndown_chart(filtered_df)
+        create_burndown_chart(df, sprint_filter)
     
     with col2:
         st.subheader("📊 Status Breakdown")
-        create_status_breakdown(filtered_df)
+        create_status_breakdown(df, sprint_filter)
         
         st.subheader("⏳ Cycle Time Analysis")
-        create_cycle_time_chart(filtered_df)
+        # The one chart that needs the issues themselves
+        create_cycle_time_chart(df[issue_filter_mask(df, **sprint_filter)])
     
     # Scope completion section
     st.markdown("---")
     st.subheader("🎯 Scope Completion Analysis")
-    create_scope_completion(filtered_df)
+    create_scope_completion(df, sprint_filter)
     
     # Retrospective section
     st.markdown("---")
@@ -161,7 +164,7 @@ def create_velocity_chart(df):
         return
     
     # Calculate velocity per sprint
-    velocity_data = df[df['status'] == 'Done'].groupby('cycle')['estimate'].sum().reset_index()
+    velocity_data = issue_cube(df).by('cycle', status=DONE_STATUS)['total_points'].rename('estimate').reset_index()
     
     if velocity_data.empty:
         st.warning("No completed tasks found for velocity calculation")
@@ -178,15 +181,15 @@ def create_velocity_chart(df):
     fig.update_layout(height=300)
     st.plotly_chart(fig, use_container_width=True)
 
-def create_burndown_chart(df):
+def create_burndown_chart(df, filters):
     """Create burndown chart for current sprint"""
     if 'createdat' not in df.columns or 'estimate' not in df.columns:
         st.warning("Missing data for burndown chart")
         return
     
     # Simulate daily burndown (in real implementation, you'd have daily snapshots)
-    total_points = df['estimate'].sum()
-    completed_points = df[df['status'] == 'Done']['estimate'].sum()
+    metrics = issue_cube(df).metrics(**filters)
+    total_points, completed_points = metrics.total_points, metrics.completed_points
     
     # Create sample burndown data
     days = list(range(14))  # 2-week sprint
@@ -229,9 +232,9 @@ def create_burndown_chart(df):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def create_status_breakdown(df):
+def create_status_breakdown(df, filters):
     """Create status breakdown pie chart"""
-    status_counts = df['status'].value_counts()
+    status_counts = issue_cube(df).by('status', **filters)['issues']
     
     fig = px.pie(
         values=status_counts.values,
@@ -266,18 +269,17 @@ def create_cycle_time_chart(df):
     fig.update_layout(height=300)
     st.plotly_chart(fig, use_container_width=True)
 
-def create_scope_completion(df):
+def create_scope_completion(df, filters):
     """Create scope completion analysis"""
     col1, col2 = st.columns(2)
     
+    metrics = issue_cube(df).metrics(**filters)
+    
     with col1:
         # Planned vs Done
-        total_issues = len(df)
-        completed_issues = len(df[df['status'] == 'Done'])
-        
         fig = go.Figure(go.Bar(
             x=['Planned', 'Completed'],
-            y=[total_issues, completed_issues],
+            y=[metrics.issues, metrics.completed_issues],
             marker_color=['lightblue', 'green']
         ))
         
@@ -290,12 +292,9 @@ def create_scope_completion(df):
     
     with col2:
         # Points planned vs completed
-        total_points = df['estimate'].sum() if 'estimate' in df.columns else 0
-        completed_points = df[df['status'] == 'Done']['estimate'].sum() if 'estimate' in df.columns else 0
-        
         fig = go.Figure(go.Bar(
             x=['Planned Points', 'Completed Points'],
-            y=[total_points, completed_points],
+            y=[metrics.total_points, metrics.completed_points],
             marker_color=['lightcoral', 'darkgreen']
         ))
         
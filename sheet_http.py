@@ -0,0 +1,177 @@
+"""
+Sheet HTTP Transport Module
+One pooled, keep-alive requests session shared by every sheet fetch, with
+per-call timeouts, jittered retry and connect/TTFB/transfer timings
+"""
+
+import hashlib
+import io
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+
+# (connect, read) seconds; the read timeout applies between bytes, not to the whole body
+DEFAULT_TIMEOUT = (5, 30)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF_SECONDS = 30
+
+_timing = threading.local()
+
+
+class FetchTimings:
+    """
+    Where the time of one fetch went. transfer is None for streamed responses,
+    whose body is read by the caller after fetch() returns.
+    """
+
+    def __init__(self, connect: float, ttfb: float, transfer: Optional[float],
+                 attempts: int, reused: bool):
+        self.connect = connect
+        self.ttfb = ttfb
+        self.transfer = transfer
+        self.attempts = attempts
+        self.reused = reused
+
+    @property
+    def total(self) -> float:
+        return self.connect + self.ttfb + (self.transfer or 0.0)
+
+    def summary(self) -> str:
+        transfer = f"{self.transfer * 1000:.0f}ms" if self.transfer is not None else "streamed"
+        connect = "reused" if self.reused else f"{self.connect * 1000:.0f}ms"
+        return f"connect {connect} · TTFB {self.ttfb * 1000:.0f}ms · transfer {transfer}"
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _timing.connect = time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        # TCP + TLS handshake; skipped entirely when the pool reuses a socket
+        start = time.perf_counter()
+        super().connect()
+        _timing.connect = time.perf_counter() - start
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+def _mark_headers(response, *args, **kwargs):
+    # Response hooks run as soon as the headers are parsed, before the body is read
+    response._headers_at = time.perf_counter()
+    return response
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # Enough sockets for concurrent gid probes plus a few dashboard sessions
+    adapter = _PooledAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # gzip/deflate always, br/zstd when the decoders are installed
+    session.headers.update(make_headers(accept_encoding=True))
+    session.hooks['response'].append(_mark_headers)
+    return session
+
+
+_session = _build_session()
+
+
+def get_session() -> requests.Session:
+    return _session
+
+
+def _retry_delay(attempt: int, backoff: float, response: Optional[requests.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF_SECONDS)
+    # Full jitter keeps simultaneous sessions from retrying in lockstep
+    return random.uniform(0, min(backoff * 2 ** attempt, MAX_BACKOFF_SECONDS))
+
+
+def fetch(url: str, headers: Optional[dict] = None, timeout=DEFAULT_TIMEOUT,
+          stream: bool = False, retries: int = 2, backoff: float = 0.5,
+          method: str = 'GET', json=None) -> requests.Response:
+    """
+    GET url through the shared session (or method, with a JSON body, for
+    read-only API queries that are as safe to retry).
+
+    Connection errors, timeouts and 429/5xx responses are retried with
+    jittered exponential backoff (honouring Retry-After). The returned
+    response carries a FetchTimings as response.timings.
+    """
+    attempt = 0
+    while True:
+        _timing.connect = 0.0
+        response = None
+        try:
+            response = _session.request(method, url, headers=headers, json=json, timeout=timeout, stream=stream)
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                break
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+        if response is not None:
+            response.close()
+        time.sleep(_retry_delay(attempt, backoff, response))
+        attempt += 1
+
+    connect = _timing.connect
+    # elapsed runs from sending the request to parsing the headers
+    ttfb = max(response.elapsed.total_seconds() - connect, 0.0)
+    transfer = None
+    if not stream:
+        # Non-streamed bodies are already read; time since the headers is the transfer
+        transfer = max(time.perf_counter() - response._headers_at, 0.0)
+    response.timings = FetchTimings(connect, ttfb, transfer, attempt + 1, reused=connect == 0.0)
+    return response
+
+
+class HashingStream(io.RawIOBase):
+    """
+    Readable view of a streamed response body that decodes gzip/deflate on
+    the fly and hashes the bytes as they pass, for incremental parsers
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.raw.read(len(buffer), decode_content=True)
+        n = len(data)
+        buffer[:n] = data
+        self._digest.update(data)
+        return n
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
@@ -0,0 +1,498 @@
+"""
+Sheet Loader Module
+The data layer behind GoogleSheetConnector, with no Streamlit in it: connects
+to a Linear export, loads issues and OKRs through the cache, local snapshot
+and network, and returns every frame with a Diagnostics record of what
+happened, so loads run the same in a page, a thread or process pool, a CLI
+or a benchmark
+"""
+
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from io import StringIO
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from dataset_cache import dataset_cache
+from delta_sync import delta_sync
+from gid_discovery import csv_export_url, discover_linear_gid, gid_map, parse_sheet_url
+from linear_schema import (HEAVY_TEXT_COLUMNS, apply_column_plan, apply_issue_schema, compile_column_plan,
+                           concat_issue_chunks, projection_filter, projection_tag, resolve_projection)
+from sample_data import get_sample_okr_data
+from sheet_http import FetchTimings, HashingStream, fetch
+from sheet_snapshot import SheetSnapshot
+from sheet_values import authorized_client, frame_from_values, values_batcher
+from sheets_quota import INTERACTIVE, sheets_quota
+from single_flight import single_flight
+
+# Rows per chunk when streaming the CSV export
+STREAM_CHUNK_ROWS = 5000
+STREAMING_INGEST = os.environ.get("DASHBOARD_STREAMING_INGEST", "0") == "1"
+DELTA_SYNC = os.environ.get("DASHBOARD_DELTA_SYNC", "0") == "1"
+
+# Worksheets whose last service-account read keeps its heavy text columns for detail views
+DETAIL_WORKSHEETS = 8
+
+# Heavy text columns (with 'id') from the last read of each worksheet, least recently read first
+_fetched_details: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_fetched_details_lock = threading.Lock()
+
+
+def _okr_projection(columns: Optional[List[str]]):
+    """
+    OKR columns to keep; target/current stay so progress can still be derived
+    """
+    if columns is None:
+        return None
+    return frozenset(columns) | {'target', 'current'}
+
+
+class Diagnostics:
+    """
+    What one connect or load did. messages are (kind, text) pairs in the
+    order they happened, kind being 'info', 'success', 'caption', 'warning'
+    or 'error'; the other fields are the structured facts behind them.
+    """
+
+    def __init__(self):
+        self.messages: List[Tuple[str, str]] = []
+        self.source: Optional[str] = None  # 'cache', 'snapshot', 'revalidated', 'network', 'file' or 'sample'
+        self.timings: Optional[FetchTimings] = None
+        self.mapped_columns: Optional[int] = None
+        self.total_columns: Optional[int] = None
+        # Issue IDs new/modified and dropped since the previous load; None when unknown
+        self.changed_ids = None
+        self.removed_ids = None
+        self.error: Optional[str] = None
+        self.seconds = 0.0
+
+    def add(self, kind: str, message: str) -> None:
+        self.messages.append((kind, message))
+        if kind == 'error':
+            self.error = message
+
+    @property
+    def warnings(self) -> List[str]:
+        return [message for kind, message in self.messages if kind == 'warning']
+
+    def unchanged(self, source: str) -> None:
+        # Served without re-reading the sheet, so nothing changed since the previous load
+        self.source = source
+        self.changed_ids = frozenset()
+        self.removed_ids = frozenset()
+
+
+class LoadResult(NamedTuple):
+    frame: Optional[pd.DataFrame]  # None when the load failed or there is no connection
+    diagnostics: Diagnostics
+
+
+class SheetLoader:
+    """
+    Connection to one Linear export (public CSV or service account) and the
+    loads it serves. Safe to call from any thread; the cache, snapshots and
+    in-flight loads it goes through are shared by the whole process.
+    """
+
+    def __init__(self, streaming: bool = STREAMING_INGEST, delta: bool = DELTA_SYNC):
+        self.gc = None
+        self.sheet = None
+        self.cache = dataset_cache
+        # Parse the public CSV incrementally off the socket instead of buffering it
+        self.streaming = streaming
+        # Upsert changed rows into the previous frame instead of re-typing every row
+        self.delta = delta
+        # Local snapshots confirmed before this moment don't count as fresh
+        self.refresh_requested_at = 0.0
+        # Place in the Sheets API quota queue; background syncs use BACKGROUND
+        self.priority = INTERACTIVE
+        # Seconds between background syncs; None syncs right after Linear's hourly export
+        self.sync_interval_seconds = None
+
+    def connect_url(self, sheet_url: str) -> Diagnostics:
+        """
+        Connect to Google Sheet using public URL (read-only)
+        For Linear exports that are made public
+        """
+        diagnostics = Diagnostics()
+        if "/spreadsheets/d/" not in sheet_url:
+            diagnostics.add('error', "Invalid Google Sheets URL format")
+            return diagnostics
+
+        try:
+            sheet_id, gid = parse_sheet_url(sheet_url)
+        except Exception as e:
+            diagnostics.add('error', f"Failed to connect to Google Sheet: {str(e)}")
+            return diagnostics
+
+        try:
+            # Remembered tab for this sheet, or concurrent header-only probes
+            # of the URL's gid and the tabs Linear usually exports to
+            found_gid, outcomes = discover_linear_gid(sheet_id, gid)
+        except Exception as e:
+            diagnostics.add('error', f"Cannot access sheet publicly. Error: {str(e)}")
+            return diagnostics
+
+        if found_gid is None:
+            diagnostics.add('error', "Could not find Linear data on any sheet tab. Make sure your Linear export is public.")
+            return diagnostics
+
+        self.sheet_id = sheet_id
+        self.gid = found_gid
+        self.csv_url = csv_export_url(sheet_id, found_gid)
+        diagnostics.add('success', f"✅ Found Linear data on sheet tab gid={found_gid}")
+        return diagnostics
+
+    def connect_service_account(self, credentials_json: dict, sheet_url: str) -> Diagnostics:
+        """
+        Connect using service account credentials
+        """
+        diagnostics = Diagnostics()
+        try:
+            # One authorized client per service account, shared across sessions
+            self.gc = authorized_client(credentials_json)
+
+            # Extract sheet ID from URL
+            sheet_id = sheet_url.split("/spreadsheets/d/")[1].split("/")[0]
+            self.sheet = sheets_quota.call(lambda: self.gc.open_by_key(sheet_id))
+        except Exception as e:
+            diagnostics.add('error', f"Failed to connect with credentials: {str(e)}")
+        return diagnostics
+
+    def load_issues(self, worksheet_name: str = "Sheet1", columns: Optional[List[str]] = None) -> LoadResult:
+        """
+        Load Linear issues data from the specified worksheet.
+        columns lists the dashboard columns the caller reads; only those (plus
+        'id' and the sources of derived columns) are parsed. None loads everything.
+        """
+        projection = resolve_projection(columns)
+        cache_key = self._cache_key(worksheet_name, projection)
+        return self._coalesced(('issues', cache_key),
+                               lambda diagnostics: self._load_issues(worksheet_name, projection, cache_key, diagnostics))
+
+    def _load_issues(self, worksheet_name: str, projection, cache_key, diagnostics: Diagnostics) -> Optional[pd.DataFrame]:
+        usecols = projection_filter(projection)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                diagnostics.unchanged('cache')
+                return cached
+
+        # After a restart, a recently confirmed local snapshot renders without any network call
+        snapshot = self._snapshot(worksheet_name, projection)
+        df = self._load_fresh_snapshot(snapshot)
+        if df is not None:
+            self.cache.put(cache_key, df)
+            diagnostics.unchanged('snapshot')
+            return df
+
+        response = None
+        values = None
+        normalized = False
+        try:
+            # If using CSV URL (public access)
+            if hasattr(self, 'csv_url'):
+                # Revalidate against the on-disk snapshot: a 304 or identical body skips the parse
+                response = fetch(self.csv_url, headers=snapshot.conditional_headers(), stream=self.streaming)
+                diagnostics.timings = response.timings
+                if self.streaming and response.status_code == 200:
+                    # Body not read yet; its hash is taken while streaming
+                    df = None
+                else:
+                    df = snapshot.revalidate(response)
+                if df is not None:
+                    self.cache.put(cache_key, df)
+                    diagnostics.unchanged('revalidated')
+                    return df
+
+                if response.status_code == 304:
+                    # Snapshot frame vanished between the check and the read
+                    response = fetch(self.csv_url, stream=self.streaming)
+                    diagnostics.timings = response.timings
+
+                diagnostics.add('info', f"🔗 **Fetching data from:** {self.csv_url}")
+                diagnostics.add('caption', f"⏱️ {response.timings.summary()}")
+                if response.status_code == 200 and self.streaming:
+                    df = self._read_csv_streaming(response, snapshot, diagnostics, usecols)
+                    normalized = True
+                    # Only now is the body's hash known; the same bytes as the snapshot keep its frame and version
+                    unchanged = snapshot.revalidate(response, content_hash=snapshot.content_hash)
+                    if unchanged is not None:
+                        self.cache.put(cache_key, unchanged)
+                        diagnostics.unchanged('revalidated')
+                        return unchanged
+                elif response.status_code == 200:
+                    df = pd.read_csv(StringIO(response.text), usecols=usecols)
+                else:
+                    # The remembered tab may be gone; rediscover on the next connect
+                    gid_map.forget(self.sheet_id)
+                    diagnostics.add('error', "Failed to fetch data from public sheet")
+                    return None
+
+            # If using gspread (service account)
+            elif hasattr(self, 'sheet') and self.sheet:
+                # Fetched in one batch with the other worksheets this sheet is read from
+                values = values_batcher.get_values(self.sheet, worksheet_name, priority=self.priority)
+                df = frame_from_values(values, usecols)
+
+                if df.empty:
+                    diagnostics.add('warning', "No data found in the worksheet")
+                    return pd.DataFrame()
+
+            else:
+                # No connection established
+                return None
+
+            if df.empty:
+                diagnostics.add('warning', "No data found in the sheet")
+                return pd.DataFrame()
+
+            diagnostics.source = 'network'
+            if self.delta and cache_key is not None:
+                if not normalized:
+                    df = self._map_linear_columns(df, diagnostics)
+                # Only rows that changed since the last load are re-typed
+                result = delta_sync.upsert(cache_key, df, normalize=None if normalized else apply_issue_schema)
+                df = result.frame
+                if not result.full_reload:
+                    diagnostics.changed_ids = result.changed_ids
+                    diagnostics.removed_ids = result.removed_ids
+                    diagnostics.add('caption', f"🔁 {len(result.changed_ids)} issues changed, "
+                                               f"{len(result.removed_ids)} removed since the last sync")
+            elif not normalized:
+                df = self._normalize_issues(df, diagnostics)
+
+        except Exception as e:
+            diagnostics.add('error', f"Failed to load data: {str(e)}")
+            return None
+
+        # Outside the load's error path: a frame that parsed is served whether or not it reaches disk
+        if snapshot is not None:
+            snapshot.save(df, response)
+        if cache_key is not None:
+            self.cache.put(cache_key, df)
+        if values is not None:
+            self._keep_details(worksheet_name, values)
+        return df
+
+    def _keep_details(self, worksheet_name: str, values: List[list]) -> None:
+        """
+        Hold on to the heavy text columns of a worksheet read, which carries
+        every column whatever the projection, so detail views are served
+        from it instead of reading the worksheet again
+        """
+        projection = resolve_projection(['id'] + HEAVY_TEXT_COLUMNS)
+        details = self._normalize_issues(frame_from_values(values, projection_filter(projection)))
+        if 'id' not in details.columns:
+            return
+        key = self._cache_key(worksheet_name, projection)
+        with _fetched_details_lock:
+            _fetched_details[key] = details
+            _fetched_details.move_to_end(key)
+            while len(_fetched_details) > DETAIL_WORKSHEETS:
+                _fetched_details.popitem(last=False)
+
+    def _read_csv_streaming(self, response, snapshot: SheetSnapshot, diagnostics: Diagnostics,
+                            usecols=None) -> pd.DataFrame:
+        """
+        Parse the export straight off the socket in row chunks, normalizing each
+        chunk as it arrives so only the compact per-chunk frames are ever held
+        """
+        stream = HashingStream(response.raw)
+        chunks = []
+        with response, pd.read_csv(io.BufferedReader(stream), usecols=usecols,
+                                   chunksize=STREAM_CHUNK_ROWS) as reader:
+            for i, chunk in enumerate(reader):
+                chunks.append(self._normalize_issues(chunk, diagnostics if i == 0 else None))
+        snapshot.content_hash = stream.hexdigest()
+
+        if not chunks:
+            return pd.DataFrame()
+        return concat_issue_chunks(chunks)
+
+    def _coalesced(self, key: tuple, load: Callable[[Diagnostics], Optional[pd.DataFrame]]) -> LoadResult:
+        """
+        Run load, unless another session is already loading the same dataset:
+        then wait for that load and share its result instead of fetching again
+        """
+        def run() -> LoadResult:
+            started = time.perf_counter()
+            diagnostics = Diagnostics()
+            frame = load(diagnostics)
+            diagnostics.seconds = time.perf_counter() - started
+            return LoadResult(frame, diagnostics)
+
+        if key[1] is None:
+            # No connection: nothing to share
+            return run()
+        return single_flight.do(key, run)
+
+    def _normalize_issues(self, df: pd.DataFrame, diagnostics: Optional[Diagnostics] = None) -> pd.DataFrame:
+        """
+        Map Linear's headers and apply the typed issue schema
+        """
+        # Auto-detect and map Linear's column names to standard names
+        df = self._map_linear_columns(df, diagnostics)
+
+        # Declared dtypes: categoricals, float32 estimates, explicit-format dates
+        return apply_issue_schema(df)
+
+    def _map_linear_columns(self, df: pd.DataFrame, diagnostics: Optional[Diagnostics] = None) -> pd.DataFrame:
+        """
+        Map Linear's column names to standard dashboard column names.
+        Each column ends up stored once, under its mapped or cleaned name.
+        Pass diagnostics to record how many columns were mapped.
+        """
+        # Compiled once per distinct header row, then reused for every load and chunk
+        plan = compile_column_plan(tuple(df.columns))
+
+        if diagnostics is not None:
+            diagnostics.mapped_columns = len(plan.mapped)
+            diagnostics.total_columns = len(df.columns)
+            diagnostics.add('caption', f"📊 Mapped {len(plan.mapped)} of {len(df.columns)} Linear columns")
+
+        return apply_column_plan(df, plan)
+
+    def _snapshot(self, worksheet_name: str, projection=None) -> Optional[SheetSnapshot]:
+        """
+        Local columnar snapshot for the dataset this loader points at
+        """
+        if hasattr(self, 'csv_url'):
+            return SheetSnapshot(self.sheet_id, self.gid, variant=projection_tag(projection))
+        if self.sheet:
+            return SheetSnapshot(self.sheet.id, worksheet_name, variant=projection_tag(projection))
+        return None
+
+    def _load_fresh_snapshot(self, snapshot: Optional[SheetSnapshot]) -> Optional[pd.DataFrame]:
+        """
+        The local snapshot's frame if it was confirmed within the cache TTL and
+        after the last "🔄 Refresh Data", else None
+        """
+        if snapshot is None or not snapshot.is_fresh(self.cache.ttl_seconds, since=self.refresh_requested_at):
+            return None
+        return snapshot.load_frame()
+
+    def dataset_ref(self, kind: str, worksheet_name: str,
+                    columns: Optional[List[str]] = None) -> Tuple[Optional[tuple], Optional[SheetSnapshot]]:
+        """
+        (cache key, local snapshot) of the 'issues' or 'okrs' dataset a load
+        with these arguments would produce; (None, None) when it isn't backed
+        by a sheet (no connection, or sample OKRs)
+        """
+        if kind == 'okrs':
+            if not self.sheet:
+                return None, None
+            projection = _okr_projection(columns)
+        else:
+            projection = resolve_projection(columns)
+        return self._cache_key(worksheet_name, projection), self._snapshot(worksheet_name, projection)
+
+    def _cache_key(self, worksheet_name: str, projection=None) -> Optional[tuple]:
+        """
+        Identify the dataset this loader points at: (sheet_id, gid) for public
+        CSV access, (sheet_id, worksheet_name) for the service account path,
+        plus the column projection that was loaded
+        """
+        if hasattr(self, 'csv_url'):
+            return (self.sheet_id, self.gid, projection)
+        if self.sheet:
+            return (self.sheet.id, worksheet_name, projection)
+        return None
+
+    def issue_details(self, issue_ids, columns: Optional[List[str]] = None,
+                      worksheet_name: str = "Sheet1") -> LoadResult:
+        """
+        Heavy text columns (descriptions by default) for a few issues, for
+        detail views; the dashboards' own loads skip them
+        """
+        columns = columns or HEAVY_TEXT_COLUMNS
+        with _fetched_details_lock:
+            details = _fetched_details.get(self._cache_key(worksheet_name, resolve_projection(['id'] + list(columns))))
+        if details is not None:
+            # Kept from the worksheet's last read
+            diagnostics = Diagnostics()
+            diagnostics.unchanged('cache')
+        else:
+            details, diagnostics = self.load_issues(worksheet_name, columns=['id'] + list(columns))
+        if details is None or details.empty:
+            return LoadResult(pd.DataFrame(columns=['id'] + list(columns)), diagnostics)
+        selected = details.loc[details['id'].isin(list(issue_ids)),
+                               ['id'] + [c for c in columns if c in details.columns]]
+        return LoadResult(selected, diagnostics)
+
+    def invalidate_cache(self) -> None:
+        """
+        Force the next load to re-fetch this loader's sheet
+        """
+        self.refresh_requested_at = time.time()
+        if hasattr(self, 'csv_url'):
+            self.cache.invalidate_sheet(self.sheet_id)
+        elif self.sheet:
+            self.cache.invalidate_sheet(self.sheet.id)
+            with _fetched_details_lock:
+                for key in [k for k in _fetched_details if k[0] == self.sheet.id]:
+                    del _fetched_details[key]
+
+    def load_okrs(self, worksheet_name: str = "OKRs", columns: Optional[List[str]] = None) -> LoadResult:
+        """
+        Load OKR data from the specified worksheet, keeping only columns if given
+        """
+        # For OKR data, we'll use sample data since Linear doesn't typically export OKRs
+        # This method is mainly for service account connections
+        if not self.sheet:
+            diagnostics = Diagnostics()
+            diagnostics.source = 'sample'
+            return LoadResult(get_sample_okr_data(), diagnostics)
+
+        projection = _okr_projection(columns)
+        cache_key = self._cache_key(worksheet_name, projection)
+        return self._coalesced(('okrs', cache_key),
+                               lambda diagnostics: self._load_okrs(worksheet_name, projection, cache_key, diagnostics))
+
+    def _load_okrs(self, worksheet_name: str, projection, cache_key, diagnostics: Diagnostics) -> Optional[pd.DataFrame]:
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            diagnostics.unchanged('cache')
+            return cached
+        snapshot = self._snapshot(worksheet_name, projection)
+        df = self._load_fresh_snapshot(snapshot)
+        if df is not None:
+            self.cache.put(cache_key, df)
+            diagnostics.unchanged('snapshot')
+            return df
+
+        try:
+            df = values_batcher.get_frame(self.sheet, worksheet_name, priority=self.priority)
+
+            if df.empty:
+                diagnostics.add('warning', "No OKR data found in the worksheet")
+                return pd.DataFrame()
+
+            # Clean column names
+            df.columns = df.columns.str.lower().str.replace(' ', '_').str.replace('-', '_')
+            if projection is not None:
+                df = df[[col for col in df.columns if col in projection]]
+
+            # Convert numeric columns
+            numeric_columns = ['target', 'current', 'progress']
+            for col in numeric_columns:
+                if col in df.columns:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+
+            # Calculate progress percentage if not present
+            if 'target' in df.columns and 'current' in df.columns and 'progress' not in df.columns:
+                df['progress'] = (df['current'] / df['target'] * 100).round(1)
+
+            diagnostics.source = 'network'
+
+        except Exception as e:
+            diagnostics.add('error', f"Failed to load OKR data: {str(e)}")
+            return None
+
+        snapshot.save(df)
+        self.cache.put(cache_key, df)
+        return df
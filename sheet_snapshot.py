@@ -0,0 +1,186 @@
+"""
+Sheet Snapshot Module
+Keeps the last export's HTTP validators and normalized DataFrame on disk so
+unchanged sheets can be revalidated without re-downloading or re-parsing,
+and a restarted server can render straight from the local copy
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from linear_schema import SCHEMA_VERSION
+
+CACHE_DIR = Path(os.environ.get("DASHBOARD_CACHE_DIR", ".dashboard_cache"))
+
+# Frames are Arrow IPC (Feather v2) files: columnar, zstd-compressed, with
+# categoricals stored as dictionaries, and read back with dtypes intact
+FRAME_COMPRESSION = "zstd"
+
+# Older versions kept per snapshot, newest first, for rollback and debugging
+KEEP_VERSIONS = 3
+
+
+class SheetSnapshot:
+    """
+    On-disk snapshot of one sheet tab: validators, content hash and the
+    current version number in a JSON sidecar, each saved frame next to it as
+    {stem}.v{version}.arrow
+    """
+
+    def __init__(self, sheet_id: str, gid: str, variant: str = 'all', cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        # One snapshot per column projection; each keeps its own validators
+        stem = f"{sheet_id}_{gid}" if variant == 'all' else f"{sheet_id}_{gid}_{variant}"
+        # Worksheet names may contain spaces or slashes
+        self.stem = re.sub(r'[^A-Za-z0-9_.-]', '_', stem)
+        self.meta_path = self.cache_dir / f"{self.stem}.json"
+        self.meta = self._read_meta()
+        self.content_hash: Optional[str] = None
+
+    def _read_meta(self) -> dict:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _frame_path(self, version: int) -> Path:
+        return self.cache_dir / f"{self.stem}.v{version}.arrow"
+
+    @property
+    def version(self) -> int:
+        return self.meta.get('version', 0)
+
+    def versions(self) -> List[int]:
+        """
+        Saved versions still on disk, newest first
+        """
+        found = []
+        for path in self.cache_dir.glob(f"{self.stem}.v*.arrow"):
+            suffix = path.name[len(self.stem) + 2:-len('.arrow')]
+            if suffix.isdigit():
+                found.append(int(suffix))
+        return sorted(found, reverse=True)
+
+    def exists(self) -> bool:
+        return (self.meta.get('schema_version') == SCHEMA_VERSION
+                and self.version > 0 and self._frame_path(self.version).exists())
+
+    def age(self) -> Optional[float]:
+        """
+        Seconds since the snapshot was last saved or revalidated
+        """
+        if not self.exists():
+            return None
+        return time.time() - self.meta.get('saved_at', 0)
+
+    def is_fresh(self, max_age: float, since: float = 0.0) -> bool:
+        """
+        True if the snapshot was confirmed after `since` and less than
+        max_age seconds ago, so it can be served without asking the network
+        """
+        age = self.age()
+        return age is not None and age < max_age and self.meta.get('saved_at', 0) > since
+
+    def conditional_headers(self) -> dict:
+        """
+        Build If-None-Match / If-Modified-Since headers from the stored validators
+        """
+        if not self.exists():
+            return {}
+        headers = {}
+        if self.meta.get('etag'):
+            headers['If-None-Match'] = self.meta['etag']
+        if self.meta.get('last_modified'):
+            headers['If-Modified-Since'] = self.meta['last_modified']
+        return headers
+
+    def revalidate(self, response, content_hash: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Return the stored frame if the response says the sheet is unchanged
+        (304, or a 200 whose body hashes to the stored content hash), else None.
+        Pass content_hash when the body was streamed and hashed on the way.
+        """
+        if response.status_code == 200:
+            self.content_hash = content_hash or hashlib.sha256(response.content).hexdigest()
+            if self.content_hash != self.meta.get('content_hash'):
+                return None
+        elif response.status_code != 304:
+            return None
+
+        df = self.load_frame()
+        if df is not None:
+            # Keep the freshest validators so the next request can get a 304
+            self._write_meta(response)
+        return df
+
+    def load_frame(self, version: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        Read the current frame, or an older saved version
+        """
+        if not self.exists():
+            return None
+        try:
+            return pd.read_feather(self._frame_path(version or self.version))
+        except Exception:
+            return None
+
+    def save(self, df: pd.DataFrame, response=None) -> None:
+        """
+        Persist the normalized frame as a new version, with the validators of
+        the response it came from (if it came over HTTP)
+        """
+        if self.content_hash is None and response is not None:
+            self.content_hash = hashlib.sha256(response.content).hexdigest()
+        version = max([self.version] + self.versions()) + 1
+        frame_path = self._frame_path(version)
+        tmp_path = frame_path.with_suffix('.arrow.tmp')
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            df.reset_index(drop=True).to_feather(tmp_path, compression=FRAME_COMPRESSION)
+            os.replace(tmp_path, frame_path)
+            self.meta = {'version': version}
+            self._write_meta(response)
+            self._prune()
+        except (OSError, pa.ArrowException):
+            # Best effort: a read-only filesystem, or a column Arrow can't store
+            # (mixed types), only costs us the next revalidation
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def _prune(self) -> None:
+        for version in self.versions()[KEEP_VERSIONS:]:
+            try:
+                self._frame_path(version).unlink()
+            except OSError:
+                pass
+
+    def _write_meta(self, response=None) -> None:
+        # A 304 may omit validators, so fall back to the ones already stored
+        headers = response.headers if response is not None else {}
+        self.meta = {
+            'etag': headers.get('ETag') or self.meta.get('etag'),
+            'last_modified': headers.get('Last-Modified') or self.meta.get('last_modified'),
+            'content_hash': self.content_hash or self.meta.get('content_hash'),
+            'version': self.version,
+            'schema_version': SCHEMA_VERSION,
+            'saved_at': time.time(),
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.meta_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.meta, f)
+            os.replace(tmp_path, self.meta_path)
+        except OSError:
+            pass
@@ -0,0 +1,182 @@
+"""
+Sheet Values Module
+Service-account reads for the gspread path: one authorized client per
+service account for the whole process, every worksheet a spreadsheet is
+read from fetched in a single batched values request, and frames built
+column by column straight from the value matrix
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import gspread
+import pandas as pd
+from gspread.utils import absolute_range_name
+from oauth2client.service_account import ServiceAccountCredentials
+
+from sheets_quota import INTERACTIVE, sheets_quota
+from single_flight import SingleFlight
+
+SCOPE = ['https://spreadsheets.google.com/feeds',
+         'https://www.googleapis.com/auth/drive']
+
+# Every cell comes back as the text the sheet shows, which is what the CSV
+# export path sees too: apply_issue_schema types the columns, and a title
+# that happens to read "2024" stays text instead of mixing an int into it
+BATCH_PARAMS = {
+    'valueRenderOption': 'FORMATTED_VALUE',
+    'dateTimeRenderOption': 'FORMATTED_STRING',
+}
+
+# A worksheet fetched in a batch is handed to one load arriving within this window
+BATCH_REUSE_SECONDS = 5
+
+# A batch waits this long for the other loads of the same round to register their worksheets
+BATCH_GATHER_SECONDS = 0.05
+
+_clients: Dict[tuple, gspread.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def authorized_client(credentials_json: dict) -> gspread.Client:
+    """
+    The gspread client for this service account, authorized on first use and
+    shared by every session after that (tokens refresh themselves)
+    """
+    key = (credentials_json.get('client_email'), credentials_json.get('private_key_id'))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            creds = ServiceAccountCredentials.from_json_keyfile_dict(credentials_json, SCOPE)
+            client = _clients[key] = gspread.authorize(creds)
+        return client
+
+
+def frame_from_values(values: List[list], usecols: Optional[Callable[[str], bool]] = None) -> pd.DataFrame:
+    """
+    DataFrame from a values matrix whose first row is the header. Columns
+    are built one at a time from the rows (skipping those usecols rejects),
+    with blank cells as missing values, never as a list of row dicts.
+    """
+    if not values:
+        return pd.DataFrame()
+    header, rows = [str(name) for name in values[0]], values[1:]
+    width = len(header)
+    # The API drops trailing blank cells, so short rows are padded out
+    padded = [row + [''] * (width - len(row)) if len(row) < width else row for row in rows]
+
+    columns = {}
+    for j, name in enumerate(header):
+        if not name or (usecols is not None and not usecols(name)):
+            continue
+        columns[name] = pd.Series([row[j] if row[j] != '' else None for row in padded], name=name)
+    return pd.DataFrame(columns)
+
+
+def _is_bad_range(error: gspread.exceptions.APIError) -> bool:
+    # What a deleted or renamed tab gets; quota and server errors are worth retrying instead
+    return error.code == 400 and 'Unable to parse range' in str(error.error.get('message', ''))
+
+
+class _Batch:
+    def __init__(self, values: Dict[str, List[list]]):
+        self.values = values
+        self.fetched_at = time.time()
+
+
+class ValuesBatcher:
+    """
+    Remembers which worksheets each spreadsheet has been read from. A read
+    that has to go to the API fetches all of them in one values_batch_get;
+    the other worksheets' values wait briefly for the loads reading them
+    (issues and OKRs load side by side), each handed out once.
+    """
+
+    def __init__(self, reuse_seconds: float = BATCH_REUSE_SECONDS, gather_seconds: float = BATCH_GATHER_SECONDS):
+        self.reuse_seconds = reuse_seconds
+        self.gather_seconds = gather_seconds
+        self._ranges: Dict[str, List[str]] = {}
+        self._batches: Dict[str, _Batch] = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.requests = 0
+
+    def get_values(self, sheet, worksheet_name: str, priority: int = INTERACTIVE) -> List[list]:
+        with self._lock:
+            ranges = self._ranges.setdefault(sheet.id, [])
+            if worksheet_name not in ranges:
+                ranges.append(worksheet_name)
+            values = self._take(sheet.id, worksheet_name)
+        if values is not None:
+            return values
+
+        # Loads that miss together share one batched request
+        self._flights.do(sheet.id, lambda: self._fetch(sheet, priority, gather=True))
+        values = self._take_fetched(sheet.id, worksheet_name)
+        if values is None:
+            # The batch in flight when we arrived didn't include this worksheet yet
+            self._fetch(sheet, priority)
+            values = self._take_fetched(sheet.id, worksheet_name)
+        return values or []
+
+    def get_frame(self, sheet, worksheet_name: str, usecols: Optional[Callable[[str], bool]] = None,
+                  priority: int = INTERACTIVE) -> pd.DataFrame:
+        return frame_from_values(self.get_values(sheet, worksheet_name, priority), usecols)
+
+    def _take(self, sheet_id: str, worksheet_name: str) -> Optional[List[list]]:
+        batch = self._batches.get(sheet_id)
+        if batch is None or time.time() - batch.fetched_at > self.reuse_seconds:
+            return None
+        return batch.values.pop(worksheet_name, None)
+
+    def _take_fetched(self, sheet_id: str, worksheet_name: str) -> Optional[List[list]]:
+        with self._lock:
+            if worksheet_name not in self._ranges.get(sheet_id, []):
+                # Dropped by _fetch: the API rejected it
+                raise gspread.exceptions.WorksheetNotFound(worksheet_name)
+            return self._take(sheet_id, worksheet_name)
+
+    def _fetch(self, sheet, priority: int = INTERACTIVE, gather: bool = False) -> None:
+        if gather:
+            time.sleep(self.gather_seconds)
+        with self._lock:
+            names = list(self._ranges.get(sheet.id, []))
+        try:
+            response = self._batch_get(sheet, names, priority)
+        except gspread.exceptions.APIError as e:
+            if len(names) == 1 or not _is_bad_range(e):
+                raise
+            # One bad range (a deleted tab) fails the whole batch; find it and stop asking for it
+            response = {'valueRanges': []}
+            good = []
+            for name in names:
+                try:
+                    response['valueRanges'] += self._batch_get(sheet, [name], priority)['valueRanges']
+                    good.append(name)
+                except gspread.exceptions.APIError as e:
+                    if not _is_bad_range(e):
+                        raise
+                    with self._lock:
+                        self._ranges[sheet.id].remove(name)
+            names = good
+
+        values = {name: value_range.get('values', [])
+                  for name, value_range in zip(names, response.get('valueRanges', []))}
+        with self._lock:
+            previous = self._batches.get(sheet.id)
+            if previous is not None and time.time() - previous.fetched_at <= self.reuse_seconds:
+                # Keep what the last batch fetched for loads that haven't picked it up yet
+                values = {**previous.values, **values}
+            self._batches[sheet.id] = _Batch(values)
+
+    def _batch_get(self, sheet, names: List[str], priority: int) -> dict:
+        with self._lock:
+            self.requests += 1
+        ranges = [absolute_range_name(name) for name in names]
+        # Within the shared read quota; 429s wait out Retry-After and retry
+        return sheets_quota.call(lambda: sheet.values_batch_get(ranges, params=BATCH_PARAMS), priority)
+
+
+# Shared by every GoogleSheetConnector in this process
+values_batcher = ValuesBatcher()
@@ -0,0 +1,163 @@
+"""
+Sheets Quota Module
+Process-wide token bucket for Google Sheets API calls on the service-account
+path, so many teams' loads stay under the per-minute read quota instead of
+running into 429s. Interactive loads go ahead of background syncs, and a 429
+pauses every caller for its Retry-After before the call is retried.
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import gspread
+
+# Google's default is 60 read requests per minute per user per project
+READS_PER_MINUTE = float(os.environ.get("DASHBOARD_SHEETS_READS_PER_MINUTE", 60))
+
+# Calls allowed back to back after a quiet spell
+BURST = 10
+
+# Priorities; lower goes first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# A call that keeps getting 429s gives up after this many retries
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_MAX_SECONDS = 60
+
+
+def retry_after_seconds(error: gspread.exceptions.APIError) -> Optional[float]:
+    """
+    Seconds from a 429's Retry-After header (delay form), if it has one
+    """
+    response = getattr(error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        return None
+
+
+class QuotaLimiter:
+    """
+    Token bucket refilled at rate_per_minute with room for burst calls.
+    Waiting callers queue by (priority, arrival), and only the head of the
+    queue may take a token, so background syncs never get ahead of a user
+    waiting for a page.
+    """
+
+    def __init__(self, rate_per_minute: float = READS_PER_MINUTE, burst: int = BURST):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._queue = []
+        self._arrivals = itertools.count()
+        self._cond = threading.Condition()
+        # Metrics
+        self.calls = 0
+        self.throttled_calls = 0
+        self.throttle_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.max_queue_depth = 0
+        self.rate_limited = 0
+
+    def acquire(self, priority: int = INTERACTIVE) -> float:
+        """
+        Block until this caller may make one API call; returns seconds waited
+        """
+        start = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._arrivals))
+            heapq.heappush(self._queue, ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._queue[0] == ticket and now >= self._paused_until and self._tokens >= 1:
+                    break
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    # A token is there but someone with a better ticket goes first
+                    wait = None
+                self._cond.wait(wait)
+            heapq.heappop(self._queue)
+            self._tokens -= 1
+            self.calls += 1
+            waited = time.monotonic() - start
+            if waited > 0.001:
+                self.throttled_calls += 1
+                self.throttle_seconds[priority] = self.throttle_seconds.get(priority, 0.0) + waited
+            # The next ticket in line may be able to go now
+            self._cond.notify_all()
+        return waited
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold every caller for seconds (the server told us we're over quota)
+        """
+        with self._cond:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            # The bucket was evidently fuller than the server's; start it empty
+            self._tokens = 0.0
+            self._cond.notify_all()
+
+    def call(self, fn: Callable[[], Any], priority: int = INTERACTIVE) -> Any:
+        """
+        Run one API call within the quota, retrying 429s after the server's
+        Retry-After, or an exponential backoff with jitter when it gives none
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self.acquire(priority)
+            try:
+                return fn()
+            except gspread.exceptions.APIError as e:
+                if e.code != 429 or attempt == MAX_RETRIES:
+                    raise
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    backoff = min(BACKOFF_BASE_SECONDS * 2 ** attempt, BACKOFF_MAX_SECONDS)
+                    delay = random.uniform(backoff / 2, backoff)
+                self.pause(delay)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                'calls': self.calls,
+                'queue_depth': len(self._queue),
+                'max_queue_depth': self.max_queue_depth,
+                'throttled_calls': self.throttled_calls,
+                'throttle_seconds_interactive': self.throttle_seconds[INTERACTIVE],
+                'throttle_seconds_background': self.throttle_seconds[BACKGROUND],
+                'rate_limited': self.rate_limited,
+            }
+
+
+def quota_caption(metrics: dict) -> str:
+    """
+    Sidebar line on Sheets API usage, for sizing the quota
+    """
+    waited = metrics['throttle_seconds_interactive'] + metrics['throttle_seconds_background']
+    caption = (f"🚦 Sheets API: {metrics['calls']} calls · queue {metrics['queue_depth']} "
+               f"(max {metrics['max_queue_depth']}) · waited {waited:.1f}s")
+    if metrics['rate_limited']:
+        caption += f" · ⚠️ {metrics['rate_limited']} × 429"
+    return caption
+
+
+# Shared by every gspread call in this process
+sheets_quota = QuotaLimiter()
@@ -0,0 +1,69 @@
+"""
+Single Flight Module
+Coalesces concurrent calls for the same key into one execution whose result
+every caller receives, so simultaneous refreshes of one sheet fetch it once
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Per-key in-flight call registry. The first caller for a key runs fn;
+    callers arriving while it runs wait and get the same result (or
+    exception). Once it finishes the key is free again, so later calls run
+    fresh rather than reuse a finished result — that's the cache's job.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
+
+
+# Shared by every GoogleSheetConnector in this process, like dataset_cache
+single_flight = SingleFlight()
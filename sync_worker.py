@@ -0,0 +1,216 @@
+"""
+Sync Worker Module
+One background thread per server process that owns the sheet connectors,
+re-syncs every tracked dataset on a schedule aligned to Linear's hourly
+export (or the connector's own interval), and publishes the results as
+dataset versions for sessions to read
+"""
+
+import copy
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Optional
+
+from sheets_quota import BACKGROUND
+
+# Linear pushes to the sheet once an hour; sync this many minutes past the hour
+SYNC_MINUTE = int(os.environ.get("DASHBOARD_SYNC_MINUTE", 5))
+
+# Failed syncs retry after 30s, 60s, 120s, ... capped here, until the next hourly slot
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 15 * 60
+
+# How long a session with no local data waits for the worker's first sync
+FIRST_SYNC_WAIT_SECONDS = 60
+
+# Datasets due at the same time (issues, OKRs, other tabs) sync side by side
+SYNC_CONCURRENCY = 4
+
+
+def next_sync_slot(now: float, minute: int = SYNC_MINUTE) -> float:
+    """
+    Epoch seconds of the next hh:{minute}:00 after now
+    """
+    current = datetime.fromtimestamp(now)
+    slot = current.replace(minute=minute, second=0, microsecond=0)
+    if slot.timestamp() <= now:
+        slot += timedelta(hours=1)
+    return slot.timestamp()
+
+
+class _TrackedDataset:
+    """
+    A dataset the worker keeps in sync, with its own background-priority connector
+    """
+
+    def __init__(self, connector, kind: str, worksheet_name: str, columns):
+        self.connector = connector
+        self.kind = kind
+        self.worksheet_name = worksheet_name
+        self.columns = columns
+        self.next_run_at = 0.0
+        self.requested = False
+        self.running = False
+        self.attempted = threading.Event()
+        # Metrics
+        self.last_attempt_at: Optional[float] = None
+        self.last_success_at: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.syncs = 0
+        self.failures = 0
+
+
+class SyncWorker:
+    """
+    Background sync for DataService. Sessions register the datasets they
+    read; from then on only this thread talks to the sheet for them.
+    """
+
+    def __init__(self, service, sync_minute: int = SYNC_MINUTE):
+        self.service = service
+        self.sync_minute = sync_minute
+        self._datasets: Dict[Hashable, _TrackedDataset] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool = ThreadPoolExecutor(max_workers=SYNC_CONCURRENCY, thread_name_prefix="sheet-sync")
+
+    def track(self, connector, kind: str, worksheet_name: str, columns, key: Hashable,
+              current=None) -> None:
+        """
+        Start syncing a dataset. Its first sync runs now if there is no
+        version yet or the one there predates its last scheduled sync.
+        """
+        with self._lock:
+            if key in self._datasets:
+                return
+            # The worker's own copy: sessions come and go, and users waiting on a
+            # page go ahead of scheduled syncs in the Sheets API quota
+            owned = copy.copy(connector)
+            owned.priority = BACKGROUND
+            dataset = _TrackedDataset(owned, kind, worksheet_name, columns)
+            now = time.time()
+            if current is not None and current.as_of >= self._last_run(owned, now):
+                dataset.next_run_at = self._next_run(owned, current.as_of)
+            self._datasets[key] = dataset
+            self._ensure_running()
+        self._wake.set()
+
+    def request_sync(self, key: Hashable, requested_at: float) -> None:
+        """
+        Sync a dataset as soon as possible ("🔄 Refresh Data"); repeated
+        requests for a press that was already handled are ignored
+        """
+        with self._lock:
+            dataset = self._datasets.get(key)
+            if dataset is None or (dataset.last_attempt_at or 0.0) >= requested_at or dataset.requested:
+                return
+            if dataset.running:
+                # The sync in flight answers the press; another one would refetch what it's loading
+                return
+            dataset.requested = True
+        self._wake.set()
+
+    def is_pending(self, key: Hashable) -> bool:
+        """
+        True while a sync of the dataset is due or requested but hasn't started
+        """
+        with self._lock:
+            dataset = self._datasets.get(key)
+            return dataset is not None and (dataset.requested or dataset.next_run_at <= time.time())
+
+    def wait_for_first_sync(self, key: Hashable, timeout: float = FIRST_SYNC_WAIT_SECONDS) -> None:
+        with self._lock:
+            dataset = self._datasets.get(key)
+        if dataset is not None:
+            dataset.attempted.wait(timeout)
+
+    def _ensure_running(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sheet-sync", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                due = [key for key, dataset in self._datasets.items()
+                       if dataset.requested or dataset.next_run_at <= now]
+            # A round takes as long as its slowest sheet, not the sum of them
+            list(self._pool.map(self._sync, due))
+
+            with self._lock:
+                next_run = min((d.next_run_at for d in self._datasets.values()), default=now + 3600)
+            self._wake.wait(max(next_run - time.time(), 0.0))
+
+    def _sync(self, key: Hashable) -> None:
+        with self._lock:
+            dataset = self._datasets[key]
+            dataset.requested = False
+            dataset.running = True
+        connector = dataset.connector
+        # Scheduled or requested, a sync always asks the sheet (a 304 is cheap)
+        connector.invalidate_cache()
+        started = time.time()
+        error = None
+        try:
+            ok = self.service._refresh(connector, dataset.kind, dataset.worksheet_name, dataset.columns, key)
+        except Exception as e:
+            ok = False
+            error = str(e)
+        finished = time.time()
+
+        with self._lock:
+            dataset.running = False
+            dataset.last_attempt_at = started
+            dataset.last_duration = finished - started
+            dataset.syncs += 1
+            if ok:
+                dataset.last_success_at = finished
+                dataset.last_error = None
+                dataset.consecutive_failures = 0
+                dataset.next_run_at = self._next_run(connector, finished)
+            else:
+                dataset.failures += 1
+                dataset.consecutive_failures += 1
+                dataset.last_error = error or self.service.last_error(connector, dataset.kind,
+                                                                      dataset.worksheet_name, dataset.columns)
+                backoff = min(BACKOFF_BASE_SECONDS * 2 ** (dataset.consecutive_failures - 1), BACKOFF_MAX_SECONDS)
+                # Jitter so several sheets failing together don't retry in lockstep
+                retry_at = finished + random.uniform(backoff / 2, backoff)
+                dataset.next_run_at = min(retry_at, self._next_run(connector, finished))
+        dataset.attempted.set()
+
+    def _next_run(self, connector, now: float) -> float:
+        # The next hourly slot, unless the connector's source can be synced more often
+        interval = connector.sync_interval_seconds
+        return now + interval if interval else next_sync_slot(now, self.sync_minute)
+
+    def _last_run(self, connector, now: float) -> float:
+        # When the scheduled sync before now was due
+        interval = connector.sync_interval_seconds
+        return now - interval if interval else next_sync_slot(now, self.sync_minute) - 3600
+
+    def metrics(self) -> dict:
+        """
+        Sync health across every tracked dataset, for the sidebar
+        """
+        with self._lock:
+            datasets = list(self._datasets.values())
+        successes = [d.last_success_at for d in datasets if d.last_success_at]
+        return {
+            'datasets': len(datasets),
+            'last_success_at': max(successes) if successes else None,
+            'next_run_at': min((d.next_run_at for d in datasets), default=None),
+            'failing': sum(1 for d in datasets if d.consecutive_failures),
+            'syncs': sum(d.syncs for d in datasets),
+            'failures': sum(d.failures for d in datasets),
+            'last_error': next((d.last_error for d in datasets if d.last_error), None),
+        }
@@ -3,8 +3,8 @@
 Tests if your sheet can be accessed as CSV
 """
 
-import requests
 import sys
+from sheet_http import fetch
 
 def test_sheet_access(sheet_url):
     """Test if a Google Sheet can be accessed publicly"""
@@ -24,9 +24,10 @@ def test_sheet_access(sheet_url):
             
             # Test access
             print(f"⏳ Testing access...")
-            response = requests.get(csv_url, timeout=10)
+            response = fetch(csv_url, timeout=(5, 10))
             
             print(f"📡 Status Code: {response.status_code}")
+            print(f"⏱️ Timings: {response.timings.summary()} ({response.timings.attempts} attempt(s))")
             
             if response.status_code == 200:
                 print("✅ SUCCESS: Sheet is publicly accessible!")
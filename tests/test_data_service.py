@@ -0,0 +1,65 @@
+"""
+DataService publishing loads from a local stand-in for the CSV export
+"""
+
+import time
+
+from benchmark_data_layer import make_linear_csv, serve_bytes
+import data_service
+from data_service import DataService
+from org_rollup import combine_team_frames
+from sheet_loader import SheetLoader
+from sheet_snapshot import SheetSnapshot
+
+COLUMNS = ['status']
+
+
+def test_refresh_is_published_when_the_snapshot_cannot_be_saved(monkeypatch):
+    old, old_url = serve_bytes(make_linear_csv(50))
+    new, new_url = serve_bytes(make_linear_csv(80))
+    loader = SheetLoader()
+    loader.sheet_id, loader.gid, loader.csv_url = 'unsaved-refresh', '0', f'{old_url}/export'
+    service = DataService()
+    try:
+        first = service.load_issues(loader, columns=COLUMNS)
+        assert len(first.frame) == 50
+
+        # A full disk or read-only cache directory: save() swallows the OSError
+        monkeypatch.setattr(SheetSnapshot, 'save', lambda self, df, response=None: None)
+        time.sleep(0.01)
+        loader.csv_url = f'{new_url}/export'
+        loader.invalidate_cache()
+        assert service._refresh(loader, 'issues', 'Sheet1', COLUMNS, loader.dataset_ref('issues', 'Sheet1', COLUMNS)[0])
+    finally:
+        old.shutdown()
+        new.shutdown()
+
+    latest = service.load_issues(loader, columns=COLUMNS)
+    assert latest.number == first.number + 1
+    assert len(latest.frame) == 80
+
+
+def test_org_rollups_of_other_columns_are_kept_separately(monkeypatch):
+    servers, loaders = [], {}
+    for team, rows in [('Mobile', 30), ('Web', 40)]:
+        server, url = serve_bytes(make_linear_csv(rows))
+        servers.append(server)
+        loader = loaders[team] = SheetLoader()
+        loader.sheet_id, loader.gid, loader.csv_url = f'rollup-{team}', '0', f'{url}/export'
+    builds = []
+    monkeypatch.setattr(data_service, 'combine_team_frames',
+                        lambda frames: builds.append(frames) or combine_team_frames(frames))
+    service = DataService()
+    try:
+        statuses = service.load_org(loaders, columns=['status'])
+        titles = service.load_org(loaders, columns=['title'])
+        again = service.load_org(loaders, columns=['status'])
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    assert 'title' not in statuses.frame.columns
+    assert 'title' in titles.frame.columns
+    assert len(again.frame) == len(statuses.frame)
+    # Neither page's rollup evicted the other's
+    assert len(builds) == 2
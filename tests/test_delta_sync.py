@@ -0,0 +1,30 @@
+"""
+DeltaSync upserts of small issue frames
+"""
+
+import pandas as pd
+
+from delta_sync import DeltaSync
+
+
+def export(statuses):
+    return pd.DataFrame({'id': [f'SWE-{i}' for i in range(len(statuses))], 'status': statuses})
+
+
+def test_only_changed_rows_are_reported():
+    sync = DeltaSync()
+    assert sync.upsert('sheet', export(['Todo', 'Todo', 'Done'])).full_reload
+    result = sync.upsert('sheet', export(['Todo', 'Done']))
+    assert not result.full_reload
+    assert result.changed_ids == {'SWE-1'}
+    assert result.removed_ids == {'SWE-2'}
+
+
+def test_least_recently_synced_dataset_is_evicted():
+    sync = DeltaSync(max_datasets=2)
+    for key in ['a', 'b', 'c']:
+        sync.upsert(key, export(['Todo']))
+    assert len(sync) == 2
+    # 'a' was dropped, so it starts over; 'c' still diffs against its previous frame
+    assert sync.upsert('a', export(['Done'])).full_reload
+    assert not sync.upsert('c', export(['Done'])).full_reload
@@ -0,0 +1,114 @@
+"""
+Issue cubes and filter indexes of small typed issue frames
+"""
+
+import io
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark_data_layer import make_linear_csv, serve_bytes
+from data_service import DataService
+from issue_metrics import FILTER_DIMENSIONS, FilterIndex, filter_index, issue_cube, issue_filter_mask, tag_version
+from sheet_loader import SheetLoader
+
+COLUMNS = ['cycle', 'assignee', 'status', 'type', 'priority', 'estimate', 'cycle_time_days']
+
+
+def issues():
+    return pd.DataFrame({
+        'cycle': pd.array([1, 2, None, 2], dtype='Int16'),
+        'assignee': pd.array(['Ana', 'Bo', 'Ana', None], dtype='string'),
+        'status': pd.Categorical(['Done', 'Todo', 'Done', 'Done']),
+        'estimate': pd.array([1, 2, 3, 5], dtype='float32'),
+    })
+
+
+def test_copies_of_a_version_share_its_cube():
+    published = issues()
+    first, second = published.copy(deep=False), published.copy(deep=False)
+    tag_version(first, ('sheet', 1))
+    tag_version(second, ('sheet', 1))
+    assert issue_cube(first) is issue_cube(second)
+    assert filter_index(first) is filter_index(second)
+
+
+def test_other_versions_and_derived_frames_get_their_own_cube():
+    published = issues()
+    tag_version(published, ('sheet', 1))
+    newer = issues()
+    tag_version(newer, ('sheet', 2))
+    done = published[published['status'] == 'Done']
+
+    assert issue_cube(newer) is not issue_cube(published)
+    assert issue_cube(done) is not issue_cube(published)
+    assert issue_cube(done).metrics().issues == 3
+    assert issue_cube(published).metrics().issues == 4
+
+
+def test_service_reads_of_one_version_build_one_cube():
+    server, url = serve_bytes(make_linear_csv(60))
+    loader = SheetLoader()
+    loader.sheet_id, loader.gid, loader.csv_url = 'metrics-version', '0', f'{url}/export'
+    service = DataService()
+    try:
+        first = service.load_issues(loader, columns=COLUMNS)
+        second = service.load_issues(loader, columns=COLUMNS)
+    finally:
+        server.shutdown()
+
+    assert first.number == second.number
+    assert first.frame is not second.frame
+    assert issue_cube(first.frame) is issue_cube(second.frame)
+
+
+def export_frame(rows):
+    return SheetLoader()._normalize_issues(pd.read_csv(io.BytesIO(make_linear_csv(rows))))
+
+
+def plain_mask(df, **filters):
+    # What the filter widgets mean, one cell at a time
+    mask = np.ones(len(df), dtype=bool)
+    for dim, wanted in filters.items():
+        if wanted is None:
+            continue
+        wanted = {str(value) for value in ([wanted] if isinstance(wanted, str) else wanted)}
+        if dim == 'labels':
+            matches = [pd.notna(value) and bool({label.strip() for label in value.split(',')} & wanted)
+                       for value in df[dim].astype(object)]
+        else:
+            matches = [pd.notna(value) and str(value) in wanted for value in df[dim].astype(object)]
+        mask &= np.array(matches, dtype=bool)
+    return mask
+
+
+def dimension_values(df, dim):
+    values = df[dim].dropna().astype(str)
+    if dim == 'labels':
+        values = values.str.split(',').explode().str.strip()
+    return sorted(set(values) - {''})
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_filter_index_matches_plain_masks(seed):
+    # Not a multiple of 8 rows, so the last packed byte is partly padding
+    df = export_frame(203)
+    rng = random.Random(seed)
+    index = FilterIndex(df)
+    for _ in range(20):
+        filters = {}
+        for dim in rng.sample([dim for dim in FILTER_DIMENSIONS if dim in df.columns], rng.randint(1, 3)):
+            values = dimension_values(df, dim)
+            filters[dim] = rng.sample(values, rng.randint(1, min(3, len(values)))) if values else None
+            if rng.random() < 0.2:
+                filters[dim] = filters[dim] and filters[dim][0]
+        assert np.array_equal(index.mask(**filters), plain_mask(df, **filters)), filters
+
+
+def test_unknown_values_and_no_filters():
+    df = export_frame(29)
+    assert not issue_filter_mask(df, status='No such status').any()
+    assert issue_filter_mask(df, status=None, assignee=None).all()
+    assert np.array_equal(issue_filter_mask(df, status=['Done', 'No such status']), plain_mask(df, status='Done'))
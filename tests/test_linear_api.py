@@ -0,0 +1,132 @@
+"""
+LinearApiLoader against a local stand-in for Linear's GraphQL API
+"""
+
+import io
+
+import pandas as pd
+
+import linear_api
+from benchmark_data_layer import make_linear_csv, serve_linear_api
+from linear_api import LinearApiLoader
+from sheet_loader import SheetLoader
+
+
+def connected(url, team_keys=None):
+    loader = LinearApiLoader(api_url=url)
+    assert loader.connect('test-key', team_keys).error is None
+    loader.invalidate_cache()
+    return loader
+
+
+def test_team_selections_keep_separate_snapshots():
+    server, url = serve_linear_api(make_linear_csv(90), teams=3)
+    try:
+        first = connected(url, ['T0'])
+        first_df, _ = first.load_issues(columns=['status'])
+        second = connected(url, ['T1', 'T2'])
+        second_df, _ = second.load_issues(columns=['status'])
+    finally:
+        server.shutdown()
+
+    first_key, first_snapshot = first.dataset_ref('issues', 'Sheet1', ['status'])
+    second_key, second_snapshot = second.dataset_ref('issues', 'Sheet1', ['status'])
+    assert first_key != second_key
+    assert first_snapshot.meta_path != second_snapshot.meta_path
+    # Each selection's snapshot still holds its own teams' issues after the other one saved
+    assert sorted(first_snapshot.load_frame()['id']) == sorted(first_df['id'])
+    assert sorted(second_snapshot.load_frame()['id']) == sorted(second_df['id'])
+    assert len(first_df) == 30 and len(second_df) == 60
+
+
+def test_every_page_of_every_team_is_loaded(monkeypatch):
+    monkeypatch.setattr(linear_api, 'PAGE_SIZE', 7)
+    server, url = serve_linear_api(make_linear_csv(40), teams=2)
+    try:
+        loader = connected(url)
+        server.requests = 0
+        df, diagnostics = loader.load_issues(columns=['status'])
+    finally:
+        server.shutdown()
+
+    assert diagnostics.error is None
+    assert sorted(df['id']) == sorted(f'SWE-{i}' for i in range(1, 41))
+    # 20 issues per team in pages of 7: three queries each
+    assert server.requests == 6
+
+
+def test_team_keys_limit_the_teams_loaded():
+    server, url = serve_linear_api(make_linear_csv(30), teams=3)
+    try:
+        loader = LinearApiLoader(api_url=url)
+        diagnostics = loader.connect('test-key', ['t1', 'NOPE'])
+        loader.invalidate_cache()
+        df, _ = loader.load_issues(columns=['status'])
+        none = LinearApiLoader(api_url=url).connect('test-key', ['NOPE'])
+    finally:
+        server.shutdown()
+
+    assert [team.key for team in loader.teams] == ['T1']
+    assert any('NOPE' in warning for warning in diagnostics.warnings)
+    # The stand-in deals issues out to teams in turn: team 1 has SWE-2, SWE-5, ...
+    assert sorted(df['id']) == sorted(f'SWE-{i}' for i in range(2, 31, 3))
+    assert none.error == "No Linear teams to load"
+
+
+def test_rate_limited_query_is_retried():
+    server, url = serve_linear_api(make_linear_csv(20), teams=1)
+    try:
+        loader = connected(url)
+        server.failures.append((429, b'{"errors": [{"message": "Rate limit exceeded"}]}', {'Retry-After': '0'}))
+        server.requests = 0
+        df, diagnostics = loader.load_issues(columns=['status'])
+    finally:
+        server.shutdown()
+
+    assert diagnostics.error is None
+    assert len(df) == 20
+    assert server.requests == 2
+
+
+def test_graphql_errors_fail_the_load():
+    server, url = serve_linear_api(make_linear_csv(20), teams=1)
+    try:
+        loader = connected(url)
+        server.failures.append((200, b'{"errors": [{"message": "Entity not found: Team"}], "data": null}', {}))
+        df, diagnostics = loader.load_issues(columns=['status'])
+    finally:
+        server.shutdown()
+
+    assert df is None
+    assert 'Entity not found: Team' in diagnostics.error
+
+
+def test_server_error_fails_the_load():
+    server, url = serve_linear_api(make_linear_csv(20), teams=1)
+    try:
+        loader = connected(url)
+        # More failures than fetch() retries
+        server.failures += [(503, b'unavailable', {'Retry-After': '0'})] * 3
+        df, diagnostics = loader.load_issues(columns=['status'])
+    finally:
+        server.shutdown()
+
+    assert df is None
+    assert diagnostics.error.startswith("Error loading issues from Linear")
+
+
+def test_same_frame_as_the_csv_export():
+    export = make_linear_csv(120)
+    server, url = serve_linear_api(export, teams=3)
+    columns = ['cycle', 'status', 'assignee', 'estimate', 'type', 'labels', 'createdat', 'completedat',
+               'cycle_time_days']
+    try:
+        api, _ = connected(url).load_issues(columns=columns)
+    finally:
+        server.shutdown()
+
+    api = api.sort_values('id', key=lambda ids: ids.str[4:].astype(int)).reset_index(drop=True)
+    sheet = SheetLoader()._normalize_issues(pd.read_csv(io.BytesIO(export)))[list(api.columns)]
+    for col in api.columns:
+        assert str(api[col].dtype) == str(sheet[col].dtype), col
+        assert api[col].astype(object).equals(sheet[col].astype(object)), col
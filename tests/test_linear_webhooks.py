@@ -0,0 +1,130 @@
+"""
+Issue webhooks applied to a dataset loaded from the Linear stand-in
+"""
+
+import hashlib
+import hmac
+import http.client
+import json
+import time
+
+import pytest
+
+from benchmark_data_layer import make_linear_csv, serve_linear_api
+from data_service import DataService
+from linear_api import LinearApiLoader
+from linear_webhooks import WebhookIngest, serve_webhooks
+
+SECRET = 'test-secret'
+COLUMNS = ['status', 'assignee', 'estimate']
+
+
+@pytest.fixture
+def pipeline():
+    api, url = serve_linear_api(make_linear_csv(40), teams=2)
+    loader = LinearApiLoader(api_url=url)
+    loader.connect('test-key')
+    loader.invalidate_cache()
+    service = DataService()
+    service.load_issues(loader, columns=COLUMNS)
+    ingest = WebhookIngest(service)
+    server = serve_webhooks(ingest, port=0, secret=SECRET)
+    yield service, loader, ingest, server
+    server.shutdown()
+    api.shutdown()
+
+
+def event(issue_id, status, updated_at, action='update'):
+    return {'action': action, 'type': 'Issue', 'organizationId': 'org-bench',
+            'data': {'identifier': issue_id, 'state': {'name': status}, 'teamId': 'team-0',
+                     'updatedAt': f'2030-01-01T00:00:{updated_at:02d}.000Z'}}
+
+
+def post(server, body, signature=None):
+    if not isinstance(body, bytes):
+        body = json.dumps(dict(body, webhookTimestamp=int(time.time() * 1000))).encode()
+    if signature is None:
+        signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+    connection.request('POST', '/linear', body=body, headers={'Linear-Signature': signature})
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    return response.status
+
+
+def deliver(server, ingest, events):
+    received = ingest.metrics()['received']
+    assert all(post(server, payload) == 200 for payload in events)
+    assert ingest.wait_for(received + len(events), timeout=10)
+
+
+def issues(service, loader):
+    return service.load_issues(loader, columns=COLUMNS).frame.set_index('id')
+
+
+def test_out_of_order_delivery_keeps_the_newest_change(pipeline):
+    service, loader, ingest, server = pipeline
+    deliver(server, ingest, [event('SWE-1', 'In Review', 20)])
+    deliver(server, ingest, [event('SWE-1', 'Todo', 10)])
+    assert issues(service, loader).loc['SWE-1', 'status'] == 'In Review'
+    assert ingest.metrics()['ignored'] == 1
+
+
+def test_duplicate_delivery_applies_once(pipeline):
+    service, loader, ingest, server = pipeline
+    before = len(issues(service, loader))
+    created = event('SWE-999', 'Todo', 5, action='create')
+    deliver(server, ingest, [created, created])
+    frame = issues(service, loader)
+    assert len(frame) == before + 1
+    assert frame.loc['SWE-999', 'status'] == 'Todo'
+
+
+def test_remove_event_drops_the_issue(pipeline):
+    service, loader, ingest, server = pipeline
+    assert 'SWE-2' in issues(service, loader).index
+    deliver(server, ingest, [event('SWE-2', 'Done', 30, action='remove')])
+    assert 'SWE-2' not in issues(service, loader).index
+
+
+def test_bad_signature_is_rejected(pipeline):
+    service, loader, ingest, server = pipeline
+    body = json.dumps(dict(event('SWE-1', 'Done', 40), webhookTimestamp=int(time.time() * 1000))).encode()
+    assert post(server, body, signature='0' * 64) == 401
+    assert ingest.metrics()['rejected'] == 1
+    assert ingest.metrics()['received'] == 0
+
+
+@pytest.mark.parametrize('body', [
+    b'not json',
+    b'[1, 2, 3]',
+    json.dumps({'type': 'Issue', 'data': [], 'webhookTimestamp': 1}).encode(),
+    json.dumps({'type': 'Issue', 'data': {'identifier': ['SWE-1']}, 'webhookTimestamp': 1}).encode(),
+    json.dumps({'type': 'Issue', 'data': {'identifier': 'SWE-1'}, 'webhookTimestamp': 'soon'}).encode(),
+])
+def test_malformed_body_is_a_400(pipeline, body):
+    _, _, ingest, server = pipeline
+    assert post(server, body) == 400
+    assert ingest.metrics()['rejected'] == 1
+    assert ingest.metrics()['received'] == 0
+
+
+def test_failed_apply_is_not_remembered(pipeline, monkeypatch):
+    service, loader, ingest, _ = pipeline
+    update_versions = service.update_versions
+
+    def fail_once(prefix, update):
+        monkeypatch.setattr(service, 'update_versions', update_versions)
+        raise OSError('disk full')
+
+    monkeypatch.setattr(service, 'update_versions', fail_once)
+    ingest.submit(event('SWE-3', 'In Review', 50))
+    assert ingest.wait_for(1, timeout=10)
+    # The change at :50 never landed, so an earlier one still counts as the newest
+    ingest.submit(event('SWE-3', 'Todo', 45))
+    assert ingest.wait_for(2, timeout=10)
+    assert issues(service, loader).loc['SWE-3', 'status'] == 'Todo'
+    ingest.submit(event('SWE-3', 'In Review', 50))
+    assert ingest.wait_for(3, timeout=10)
+    assert issues(service, loader).loc['SWE-3', 'status'] == 'In Review'
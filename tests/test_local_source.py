@@ -0,0 +1,80 @@
+"""
+LocalFileSource ingesting small exports from a temporary folder
+"""
+
+import os
+import time
+from collections import OrderedDict
+
+import pytest
+
+import local_source
+from benchmark_data_layer import make_linear_csv
+from local_source import LocalFileSource
+
+
+@pytest.fixture(autouse=True)
+def ingested(monkeypatch):
+    # Each test starts with nothing ingested
+    monkeypatch.setattr(local_source, '_ingested', OrderedDict())
+    return local_source._ingested
+
+
+def write_export(path, rows, age=10.0):
+    path.write_bytes(make_linear_csv(rows))
+    settle(path, age)
+    return path
+
+
+def settle(path, age=10.0):
+    # Last modified age seconds ago; 0 is a file still being written
+    modified = time.time() - age
+    os.utime(path, (modified, modified))
+
+
+def test_least_recently_used_export_is_evicted(tmp_path, monkeypatch, ingested):
+    monkeypatch.setattr(local_source, 'MAX_INGESTED', 2)
+    sources = [LocalFileSource(str(write_export(tmp_path / f'{name}.csv', 10))) for name in 'abc']
+    for source in sources:
+        assert source.load_issues(['status']).diagnostics.source == 'file'
+
+    assert len(ingested) == 2
+    assert sources[0].ingested_at(['status']) is None
+    assert sources[2].load_issues(['status']).diagnostics.source == 'cache'
+
+
+def test_changed_file_is_reread_only_once_it_settles(tmp_path):
+    path = write_export(tmp_path / 'export.csv', 10)
+    source = LocalFileSource(str(tmp_path))
+    assert len(source.load_issues(['status']).frame) == 10
+
+    write_export(path, 20, age=0)
+    assert not source.has_update(['status'])
+    frame, diagnostics = source.load_issues(['status'])
+    assert len(frame) == 10
+    assert diagnostics.source == 'cache'
+    assert any('is changing' in message for _, message in diagnostics.messages)
+
+    settle(path)
+    assert source.has_update(['status'])
+    frame, diagnostics = source.load_issues(['status'])
+    assert len(frame) == 20
+    assert diagnostics.source == 'file'
+    assert not source.has_update(['status'])
+
+
+def test_touched_file_with_the_same_bytes_is_not_reparsed(tmp_path):
+    path = write_export(tmp_path / 'export.csv', 10, age=60)
+    source = LocalFileSource(str(path))
+    source.load_issues(['status'])
+    ingested_at = source.ingested_at(['status'])
+
+    settle(path, age=5)
+    assert source.has_update(['status'])
+    frame, diagnostics = source.load_issues(['status'])
+    assert diagnostics.source == 'revalidated'
+    assert len(frame) == 10
+    assert source.ingested_at(['status']) == ingested_at
+    # The new modification time is remembered, so the file isn't hashed again
+    assert not source.has_update(['status'])
+    assert source.load_issues(['status']).diagnostics.source == 'cache'
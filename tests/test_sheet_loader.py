@@ -0,0 +1,95 @@
+"""
+SheetLoader's public-CSV path against a local stand-in for the export
+"""
+
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from benchmark_data_layer import make_linear_csv, serve_bytes
+from sheet_loader import SheetLoader
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_unchanged_export_is_revalidated_not_saved_again(streaming):
+    server, base_url = serve_bytes(make_linear_csv(200))
+    loader = SheetLoader(streaming=streaming)
+    loader.sheet_id, loader.gid, loader.csv_url = f'revalidate-{streaming}', '0', f'{base_url}/export'
+    try:
+        first, diagnostics = loader.load_issues(columns=['status'])
+        assert diagnostics.source == 'network'
+        saved = loader.dataset_ref('issues', 'Sheet1', ['status'])[1].version
+
+        time.sleep(0.01)
+        loader.invalidate_cache()
+        second, diagnostics = loader.load_issues(columns=['status'])
+    finally:
+        server.shutdown()
+
+    assert diagnostics.source == 'revalidated'
+    assert loader.dataset_ref('issues', 'Sheet1', ['status'])[1].version == saved
+    assert second['id'].tolist() == first['id'].tolist()
+
+
+class FakeSheet:
+    """
+    A service-account spreadsheet holding one worksheet of values
+    """
+
+    def __init__(self, sheet_id, values):
+        self.id = sheet_id
+        self.values = values
+        self.reads = 0
+
+    def values_batch_get(self, ranges, params=None):
+        self.reads += 1
+        values = self.values
+        if params and params.get('valueRenderOption') == 'UNFORMATTED_VALUE':
+            # What the API does with cells that hold numbers
+            values = [values[0]] + [[float(cell) if cell.replace('.', '', 1).isdigit() else cell
+                                     for cell in row] for row in values[1:]]
+        return {'valueRanges': [{'values': values} for _ in ranges]}
+
+
+def test_frame_the_snapshot_cannot_store_is_still_served(monkeypatch):
+    loader = SheetLoader()
+    loader.sheet = FakeSheet('unstorable', [['ID', 'Title', 'Status'], ['SWE-1', '2024', 'Done'],
+                                            ['SWE-2', 'Fix login', 'Todo']])
+
+    def unstorable(self, *args, **kwargs):
+        raise pa.ArrowInvalid("Conversion failed for column title")
+
+    monkeypatch.setattr(pd.DataFrame, 'to_feather', unstorable)
+    df, diagnostics = loader.load_issues(columns=['title', 'status'])
+
+    assert diagnostics.error is None
+    assert df['id'].tolist() == ['SWE-1', 'SWE-2']
+    assert not loader.dataset_ref('issues', 'Sheet1', ['title', 'status'])[1].exists()
+
+
+def test_numeric_looking_text_is_typed_like_the_csv_export():
+    loader = SheetLoader()
+    loader.sheet = FakeSheet('numeric-text', [['ID', 'Title', 'Estimate'], ['SWE-1', '2024', '3'],
+                                              ['SWE-2', 'Fix login', '']])
+    df, diagnostics = loader.load_issues(columns=['title', 'estimate'])
+
+    assert diagnostics.error is None
+    assert df['title'].tolist() == ['2024', 'Fix login']
+    assert df['estimate'].dtype == 'float32'
+    assert df['estimate'].iloc[0] == 3
+
+
+def test_descriptions_come_from_the_dashboard_read():
+    loader = SheetLoader()
+    loader.sheet = FakeSheet('details', [['ID', 'Title', 'Description'], ['SWE-1', 'Fix login', 'Tokens expire'],
+                                         ['SWE-2', 'Add export', '']])
+    df, _ = loader.load_issues(columns=['title'])
+    assert 'description' not in df.columns
+
+    details, diagnostics = loader.issue_details(['SWE-1'])
+
+    assert diagnostics.error is None
+    assert details.to_dict('records') == [{'id': 'SWE-1', 'description': 'Tokens expire'}]
+    assert loader.sheet.reads == 1
@@ -0,0 +1,82 @@
+"""
+SheetSnapshot save/load round trips, revalidation and failed writes
+"""
+
+import hashlib
+
+import pandas as pd
+import pyarrow as pa
+
+from linear_schema import apply_issue_schema
+from sheet_snapshot import KEEP_VERSIONS, SheetSnapshot
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+def issues(count=3):
+    return apply_issue_schema(pd.DataFrame({
+        'id': [f'SWE-{i}' for i in range(count)],
+        'status': ['Todo', 'Done', 'In Progress'][:count],
+        'estimate': ['1', '', '3'][:count],
+    }))
+
+
+def test_round_trip_keeps_dtypes(tmp_path):
+    frame = issues()
+    SheetSnapshot('sheet', '0', cache_dir=tmp_path).save(frame)
+
+    # A fresh object, as after a restart
+    reopened = SheetSnapshot('sheet', '0', cache_dir=tmp_path)
+    assert reopened.exists() and reopened.version == 1
+    pd.testing.assert_frame_equal(reopened.load_frame(), frame)
+
+
+def test_only_the_newest_versions_are_kept(tmp_path):
+    snapshot = SheetSnapshot('sheet', '0', cache_dir=tmp_path)
+    for _ in range(KEEP_VERSIONS + 2):
+        snapshot.save(issues())
+    assert snapshot.version == KEEP_VERSIONS + 2
+    assert snapshot.versions() == list(range(KEEP_VERSIONS + 2, 2, -1))
+
+
+def test_projections_are_separate_snapshots(tmp_path):
+    SheetSnapshot('sheet', '0', variant='abc', cache_dir=tmp_path).save(issues())
+    assert not SheetSnapshot('sheet', '0', cache_dir=tmp_path).exists()
+
+
+def test_unchanged_response_revalidates(tmp_path):
+    body = b'id,status\nSWE-1,Todo\n'
+    snapshot = SheetSnapshot('sheet', '0', cache_dir=tmp_path)
+    snapshot.save(issues(), FakeResponse(200, body, {'ETag': '"v1"'}))
+
+    reopened = SheetSnapshot('sheet', '0', cache_dir=tmp_path)
+    assert reopened.conditional_headers() == {'If-None-Match': '"v1"'}
+    assert reopened.revalidate(FakeResponse(304)) is not None
+    assert reopened.revalidate(FakeResponse(200, body)) is not None
+    assert reopened.revalidate(FakeResponse(200, body + b'SWE-2,Done\n')) is None
+    assert reopened.revalidate(FakeResponse(200, b'x'), content_hash=hashlib.sha256(body).hexdigest()) is not None
+
+
+def test_frame_arrow_cannot_store_is_skipped(tmp_path):
+    snapshot = SheetSnapshot('sheet', '0', cache_dir=tmp_path)
+    snapshot.save(issues())
+    mixed = issues().assign(title=pd.Series([2024, 'Fix login', None], dtype=object))
+
+    # Best effort: no exception, no half-written file, the previous version still current
+    snapshot.save(mixed)
+    assert snapshot.version == 1
+    assert not list(tmp_path.glob('*.tmp'))
+    assert SheetSnapshot('sheet', '0', cache_dir=tmp_path).load_frame() is not None
+
+
+def test_unwritable_directory_is_skipped(tmp_path):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    snapshot = SheetSnapshot('sheet', '0', cache_dir=blocker)
+    snapshot.save(issues())
+    assert not snapshot.exists()
@@ -0,0 +1,75 @@
+"""
+ValuesBatcher against a fake spreadsheet whose batched reads can fail
+"""
+
+import time
+
+import gspread
+import pytest
+
+from sheet_values import ValuesBatcher
+
+
+class FakeResponse:
+    def __init__(self, code, message):
+        self.text = message
+        self._error = {'code': code, 'message': message, 'status': 'ERROR'}
+
+    def json(self):
+        return {'error': self._error}
+
+
+class FakeSheet:
+    id = 'sheet-1'
+
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.failures = []  # (code, message) raised by the next calls, in order
+
+    def values_batch_get(self, ranges, params=None):
+        if self.failures:
+            raise gspread.exceptions.APIError(FakeResponse(*self.failures.pop(0)))
+        names = [name.strip("'") for name in ranges]
+        missing = [name for name in names if name not in self.tabs]
+        if missing:
+            raise gspread.exceptions.APIError(FakeResponse(400, f"Unable to parse range: {missing[0]}"))
+        return {'valueRanges': [{'values': self.tabs[name]} for name in names]}
+
+
+def batcher_reading(sheet, *names):
+    batcher = ValuesBatcher(reuse_seconds=0.1, gather_seconds=0)
+    for name in names:
+        batcher.get_values(sheet, name)
+    # Let the leftovers of those batches expire, so the next read goes to the sheet
+    time.sleep(0.2)
+    return batcher
+
+
+def test_deleted_tab_is_dropped_from_the_batch():
+    sheet = FakeSheet({'Issues': [['id'], ['SWE-1']], 'OKRs': [['objective'], ['Grow']]})
+    batcher = batcher_reading(sheet, 'Issues', 'OKRs')
+    del sheet.tabs['OKRs']
+    assert batcher.get_values(sheet, 'Issues') == [['id'], ['SWE-1']]
+    with pytest.raises(gspread.exceptions.WorksheetNotFound):
+        batcher.get_values(sheet, 'OKRs')
+
+
+@pytest.mark.parametrize('code', [500, 503])
+def test_transient_error_keeps_every_tab(code):
+    sheet = FakeSheet({'Issues': [['id'], ['SWE-1']], 'OKRs': [['objective'], ['Grow']]})
+    batcher = batcher_reading(sheet, 'Issues', 'OKRs')
+    sheet.failures = [(code, 'Backend Error')]
+    with pytest.raises(gspread.exceptions.APIError):
+        batcher.get_values(sheet, 'Issues')
+    # Once the outage is over both tabs are still read
+    assert batcher.get_values(sheet, 'Issues') == [['id'], ['SWE-1']]
+    assert batcher.get_values(sheet, 'OKRs') == [['objective'], ['Grow']]
+
+
+def test_transient_error_while_isolating_a_bad_range_is_raised():
+    sheet = FakeSheet({'Issues': [['id'], ['SWE-1']], 'OKRs': [['objective'], ['Grow']]})
+    batcher = batcher_reading(sheet, 'Issues', 'OKRs')
+    sheet.failures = [(400, 'Unable to parse range: Gone'), (500, 'Backend Error')]
+    with pytest.raises(gspread.exceptions.APIError):
+        batcher.get_values(sheet, 'Issues')
+    assert batcher.get_values(sheet, 'OKRs') == [['objective'], ['Grow']]
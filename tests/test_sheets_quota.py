@@ -0,0 +1,90 @@
+"""
+QuotaLimiter ordering and 429 handling, with a fast bucket and fake API errors
+"""
+
+import threading
+import time
+
+import gspread
+import pytest
+
+from sheets_quota import BACKGROUND, INTERACTIVE, QuotaLimiter, retry_after_seconds
+
+
+class FakeResponse:
+    def __init__(self, code, headers=None):
+        self.text = 'error'
+        self.headers = headers or {}
+        self._error = {'code': code, 'message': 'error', 'status': 'ERROR'}
+
+    def json(self):
+        return {'error': self._error}
+
+
+def api_error(code, retry_after=None):
+    return gspread.exceptions.APIError(FakeResponse(code, {} if retry_after is None else {'Retry-After': retry_after}))
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_interactive_call_goes_ahead_of_queued_background_syncs():
+    # One token every quarter second, and none left
+    limiter = QuotaLimiter(rate_per_minute=240, burst=1)
+    limiter.acquire()
+    order = []
+
+    def take(name, priority):
+        limiter.acquire(priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=take, args=(f'sync-{i}', BACKGROUND)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: limiter.metrics()['queue_depth'] == 2)
+    threads.append(threading.Thread(target=take, args=('page', INTERACTIVE)))
+    threads[-1].start()
+    wait_until(lambda: limiter.metrics()['queue_depth'] == 3)
+    for thread in threads:
+        thread.join(5)
+
+    assert order[0] == 'page'
+    assert sorted(order[1:]) == ['sync-0', 'sync-1']
+
+
+def test_rate_limited_call_waits_out_retry_after():
+    limiter = QuotaLimiter(rate_per_minute=6000, burst=5)
+    failures = [api_error(429, retry_after='0.3')]
+
+    def read():
+        if failures:
+            raise failures.pop()
+        return 'values'
+
+    started = time.monotonic()
+    assert limiter.call(read) == 'values'
+    assert time.monotonic() - started >= 0.3
+    assert limiter.metrics()['rate_limited'] == 1
+    assert limiter.metrics()['calls'] == 2
+
+
+def test_other_errors_are_not_retried():
+    limiter = QuotaLimiter(rate_per_minute=6000, burst=5)
+    calls = []
+
+    def read():
+        calls.append(1)
+        raise api_error(500)
+
+    with pytest.raises(gspread.exceptions.APIError):
+        limiter.call(read)
+    assert len(calls) == 1
+    assert limiter.metrics()['rate_limited'] == 0
+
+
+@pytest.mark.parametrize('header, seconds', [(None, None), ('2', 2.0), ('-1', 0.0), ('soon', None)])
+def test_retry_after_header(header, seconds):
+    assert retry_after_seconds(api_error(429, retry_after=header)) == seconds
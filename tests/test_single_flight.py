@@ -0,0 +1,76 @@
+"""
+SingleFlight with followers joining a call held open by the test
+"""
+
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+FOLLOWERS = 4
+
+
+def run_together(flight, fn):
+    """
+    Start a leader running fn and FOLLOWERS callers that join it; returns
+    each caller's outcome as ('result', value) or ('error', exception)
+    """
+    release = threading.Event()
+    outcomes = []
+    outcomes_lock = threading.Lock()
+
+    def held():
+        release.wait(5)
+        return fn()
+
+    def caller():
+        try:
+            outcome = ('result', flight.do('sheet', held))
+        except Exception as e:
+            outcome = ('error', e)
+        with outcomes_lock:
+            outcomes.append(outcome)
+
+    threads = [threading.Thread(target=caller) for _ in range(FOLLOWERS + 1)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while flight.stats()['coalesced'] < FOLLOWERS and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def test_followers_share_the_leaders_result():
+    flight = SingleFlight()
+    calls = []
+    outcomes = run_together(flight, lambda: calls.append(1) or 'frame')
+    assert outcomes == [('result', 'frame')] * (FOLLOWERS + 1)
+    assert len(calls) == 1
+    assert flight.stats() == {'executions': 1, 'coalesced': FOLLOWERS, 'in_flight': 0}
+
+
+def test_followers_get_the_leaders_error():
+    flight = SingleFlight()
+    error = RuntimeError("sheet unreachable")
+
+    def fail():
+        raise error
+
+    outcomes = run_together(flight, fail)
+    assert outcomes == [('error', error)] * (FOLLOWERS + 1)
+    # The failure isn't remembered: the next call runs again
+    assert flight.do('sheet', lambda: 'frame') == 'frame'
+    assert flight.stats()['executions'] == 2
+
+
+def test_other_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    with pytest.raises(KeyError):
+        flight.do('b', lambda: {}['missing'])
+    assert flight.stats() == {'executions': 2, 'coalesced': 0, 'in_flight': 0}
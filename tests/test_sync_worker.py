@@ -0,0 +1,58 @@
+"""
+SyncWorker scheduling against a fake DataService
+"""
+
+import threading
+import time
+
+from sync_worker import SyncWorker
+
+
+class FakeConnector:
+    priority = 0
+    sync_interval_seconds = 3600
+
+    def invalidate_cache(self):
+        pass
+
+
+class FakeService:
+    def __init__(self):
+        self.refreshes = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _refresh(self, connector, kind, worksheet_name, columns, key):
+        self.refreshes += 1
+        self.started.set()
+        self.release.wait(5)
+        return True
+
+
+def test_refresh_pressed_during_a_sync_joins_it():
+    service = FakeService()
+    worker = SyncWorker(service)
+    worker.track(FakeConnector(), 'issues', 'Sheet1', None, 'dataset')
+    assert service.started.wait(5)
+
+    worker.request_sync('dataset', time.time())
+    service.release.set()
+    worker.wait_for_first_sync('dataset')
+    time.sleep(0.2)
+    assert service.refreshes == 1
+    assert not worker.is_pending('dataset')
+
+
+def test_refresh_pressed_after_a_sync_runs_another():
+    service = FakeService()
+    service.release.set()
+    worker = SyncWorker(service)
+    worker.track(FakeConnector(), 'issues', 'Sheet1', None, 'dataset')
+    worker.wait_for_first_sync('dataset')
+    time.sleep(0.05)
+
+    worker.request_sync('dataset', time.time())
+    deadline = time.time() + 5
+    while service.refreshes < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert service.refreshes == 2
@@ -10,6 +10,13 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 from connect_google_sheet import GoogleSheetConnector, get_sample_data, get_sample_okr_data
+from data_service import DatasetRequest, data_service, show_freshness, sync_status_caption, sync_worker
+from issue_metrics import DONE_STATUS, issue_cube, issue_filter_mask
+from sheets_quota import quota_caption, sheets_quota
+
+# Issue columns this page reads; the loader parses only these
+ISSUE_COLUMNS = ['cycle', 'status', 'assignee', 'estimate', 'type', 'cycle_time_days']
+OKR_COLUMNS = ['objective', 'key_result', 'owner', 'target', 'current', 'progress', 'status']
 
 # Configure page
 st.set_page_config(
@@ -165,7 +172,13 @@ def main():
         # Quick actions
         st.markdown("### ⚡ Quick Actions")
         if st.button("🔄 Refresh Data", type="secondary"):
+            if 'connector' in st.session_state:
+                st.session_state.connector.invalidate_cache()
             st.rerun()
+        if sync_worker is not None and sync_worker.metrics()['datasets']:
+            st.caption(sync_status_caption(sync_worker.metrics()))
+        if sheets_quota.metrics()['calls']:
+            st.caption(quota_caption(sheets_quota.metrics()))
         
         if st.button("📊 Export Data", type="secondary"):
             st.info("Export functionality coming soon!")
@@ -215,9 +228,18 @@ def load_data(data_source):
             return issues_df, okr_df
         else:
             if 'connector' in st.session_state:
-                issues_df = st.session_state.connector.load_issues_data()
-                okr_df = st.session_state.connector.load_okr_data()
-                return issues_df, okr_df
+                connector = st.session_state.connector
+                # Last good dataset right away; a stale one is refreshed in the background
+                # Issues and OKRs load side by side; the page waits for the slower one
+                loaded = data_service.load_all(connector, {
+                    'issues': DatasetRequest('issues', "Sheet1", ISSUE_COLUMNS),
+                    'OKRs': DatasetRequest('okrs', "OKRs", OKR_COLUMNS),
+                })
+                issues_df, okr_df = loaded['issues'], loaded['OKRs']
+                if issues_df is None:
+                    return None, None
+                show_freshness(connector, issues_df, columns=ISSUE_COLUMNS)
+                return issues_df.frame, okr_df.frame if okr_df is not None else None
             else:
                 st.warning("⚠️ Please connect to Google Sheet first")
                 return None, None
@@ -238,10 +260,12 @@ def render_scrum_dashboard(df):
     with col2:
         st.markdown("") # Spacing
     
-    # Filter data
-    filtered_df = df[df['cycle'] == selected_sprint].copy() if selected_sprint != 'All' else df.copy()
+    # Filter data - cards and charts are slices of the dataset's cube
+    cube = issue_cube(df)
+    sprint_filter = {'cycle': selected_sprint} if selected_sprint != 'All' else {}
+    metrics = cube.metrics(**sprint_filter)
     
-    if filtered_df.empty:
+    if metrics.issues == 0:
         st.warning("⚠️ No data available for selected sprint")
         return
     
@@ -251,20 +275,16 @@ def render_scrum_dashboard(df):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        completed_issues = len(filtered_df[filtered_df['status'] == 'Done'])
-        st.metric("✅ Completed Issues", completed_issues, help="Total issues marked as Done")
+        st.metric("✅ Completed Issues", metrics.completed_issues, help="Total issues marked as Done")
     
     with col2:
-        total_points = filtered_df['estimate'].sum() if 'estimate' in filtered_df.columns else 0
-        st.metric("📊 Total Story Points", int(total_points), help="Sum of all story points in sprint")
+        st.metric("📊 Total Story Points", int(metrics.total_points), help="Sum of all story points in sprint")
     
     with col3:
-        avg_cycle_time = filtered_df['cycle_time_days'].mean() if 'cycle_time_days' in filtered_df.columns else 0
-        st.metric("⏱️ Avg Cycle Time", f"{avg_cycle_time:.1f} days", help="Average time from start to completion")
+        st.metric("⏱️ Avg Cycle Time", f"{metrics.mean_cycle_time:.1f} days", help="Average time from start to completion")
     
     with col4:
-        completion_rate = (completed_issues / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-        st.metric("🎯 Completion Rate", f"{completion_rate:.1f}%", help="Percentage of issues completed")
+        st.metric("🎯 Completion Rate", f"{metrics.completion_rate:.1f}%", help="Percentage of issues completed")
     
     st.markdown("---")
     
@@ -275,7 +295,7 @@ def render_scrum_dashboard(df):
     
     with col1:
         # Sprint velocity
-        velocity_data = df[df['status'] == 'Done'].groupby('cycle')['estimate'].sum().reset_index() if 'cycle' in df.columns and 'estimate' in df.columns else pd.DataFrame()
+        velocity_data = cube.by('cycle', status=DONE_STATUS)['total_points'].rename('estimate').reset_index() if 'cycle' in df.columns and 'estimate' in df.columns else pd.DataFrame()
         
         if not velocity_data.empty:
             fig = px.bar(
@@ -290,7 +310,7 @@ def render_scrum_dashboard(df):
             st.plotly_chart(fig, use_container_width=True)
         
         # Status breakdown
-        status_counts = filtered_df['status'].value_counts()
+        status_counts = cube.by('status', **sprint_filter)['issues']
         fig = px.pie(
             values=status_counts.values,
             names=status_counts.index,
@@ -303,8 +323,8 @@ def render_scrum_dashboard(df):
     
     with col2:
         # Burndown chart simulation
-        total_points = filtered_df['estimate'].sum() if 'estimate' in filtered_df.columns else 100
-        completed_points = filtered_df[filtered_df['status'] == 'Done']['estimate'].sum() if 'estimate' in filtered_df.columns else 50
+        total_points = metrics.total_points if 'estimate' in df.columns else 100
+        completed_points = metrics.completed_points if 'estimate' in df.columns else 50
         
         days = list(range(15))
         ideal_burndown = [total_points - (total_points/14) * day for day in days]
@@ -321,9 +341,9 @@ def render_scrum_dashboard(df):
         )
         st.plotly_chart(fig, use_container_width=True)
         
-        # Cycle time distribution
-        if 'cycle_time_days' in filtered_df.columns:
-            cycle_data = filtered_df.dropna(subset=['cycle_time_days'])
+        # Cycle time distribution - the one chart that needs the issues themselves
+        if 'cycle_time_days' in df.columns:
+            cycle_data = df[issue_filter_mask(df, **sprint_filter)].dropna(subset=['cycle_time_days'])
             if not cycle_data.empty:
                 fig = px.histogram(
                     cycle_data,
@@ -393,18 +413,21 @@ def render_performance_dashboard(df):
         available_types = ['All'] + sorted(list(df['type'].unique())) if 'type' in df.columns else ['All']
         selected_type = st.selectbox("🏷️ Select Type:", available_types, key="perf_type")
     
-    # Apply filters
-    filtered_df = df.copy()
+    # Apply filters - as slices of the dataset's cube rather than of the issues
+    cube = issue_cube(df)
+    perf_filter = {}
     if selected_sprint != 'All':
-        filtered_df = filtered_df[filtered_df['cycle'] == selected_sprint]
+        perf_filter['cycle'] = selected_sprint
     if selected_person != 'All':
-        filtered_df = filtered_df[filtered_df['assignee'] == selected_person]
+        perf_filter['assignee'] = selected_person
     if selected_type != 'All':
-        filtered_df = filtered_df[filtered_df['type'] == selected_type]
+        perf_filter['type'] = selected_type
+    metrics = cube.metrics(**perf_filter)
     
-    if filtered_df.empty:
+    if metrics.issues == 0:
         st.warning("⚠️ No data available for selected filters")
         return
+    by_person = cube.by('assignee', **perf_filter) if 'assignee' in df.columns else None
     
     # Performance metrics
     st.markdown('<div class="section-header">📊 Performance Overview</div>', unsafe_allow_html=True)
@@ -412,24 +435,19 @@ def render_performance_dashboard(df):
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        total_assigned = len(filtered_df)
-        st.metric("📋 Total Assigned", total_assigned)
+        st.metric("📋 Total Assigned", metrics.issues)
     
     with col2:
-        completed_count = len(filtered_df[filtered_df['status'] == 'Done'])
-        st.metric("✅ Completed", completed_count)
+        st.metric("✅ Completed", metrics.completed_issues)
     
     with col3:
-        completion_rate = (completed_count / total_assigned * 100) if total_assigned > 0 else 0
-        st.metric("🎯 Completion Rate", f"{completion_rate:.1f}%")
+        st.metric("🎯 Completion Rate", f"{metrics.completion_rate:.1f}%")
     
     with col4:
-        avg_cycle_time = filtered_df['cycle_time_days'].mean() if 'cycle_time_days' in filtered_df.columns else 0
-        st.metric("⏱️ Avg Cycle Time", f"{avg_cycle_time:.1f} days")
+        st.metric("⏱️ Avg Cycle Time", f"{metrics.mean_cycle_time:.1f} days")
     
     with col5:
-        total_points = filtered_df['estimate'].sum() if 'estimate' in filtered_df.columns else 0
-        st.metric("📈 Total Points", int(total_points))
+        st.metric("📈 Total Points", int(metrics.total_points))
     
     st.markdown("---")
     
@@ -440,11 +458,9 @@ def render_performance_dashboard(df):
     
     with col1:
         # Work completed by person
-        if 'assignee' in filtered_df.columns:
-            completion_data = filtered_df.groupby('assignee').agg({
-                'status': lambda x: (x == 'Done').sum(),
-                'assignee': 'count'
-            }).rename(columns={'status': 'completed', 'assignee': 'total'}).reset_index()
+        if 'assignee' in df.columns:
+            completion_data = by_person[['completed_issues', 'issues']].rename(
+                columns={'completed_issues': 'completed', 'issues': 'total'}).reset_index()
             
             fig = px.bar(
                 completion_data,
@@ -458,11 +474,9 @@ def render_performance_dashboard(df):
             st.plotly_chart(fig, use_container_width=True)
         
         # Cycle time by person
-        if 'assignee' in filtered_df.columns and 'cycle_time_days' in filtered_df.columns:
-            cycle_data = filtered_df.dropna(subset=['cycle_time_days'])
-            if not cycle_data.empty:
-                avg_cycle_time = cycle_data.groupby('assignee')['cycle_time_days'].mean().reset_index()
-                
+        if 'assignee' in df.columns and 'cycle_time_days' in df.columns:
+            avg_cycle_time = by_person['mean_cycle_time'].dropna().rename('cycle_time_days').reset_index()
+            if not avg_cycle_time.empty:
                 fig = px.bar(
                     avg_cycle_time,
                     x='assignee',
@@ -476,10 +490,8 @@ def render_performance_dashboard(df):
     
     with col2:
         # Points comparison
-        if 'assignee' in filtered_df.columns and 'estimate' in filtered_df.columns:
-            points_data = filtered_df.groupby('assignee').agg({
-                'estimate': ['sum', lambda x: x[filtered_df.loc[x.index, 'status'] == 'Done'].sum()]
-            }).round(1)
+        if 'assignee' in df.columns and 'estimate' in df.columns:
+            points_data = by_person[['total_points', 'completed_points']].round(1)
             points_data.columns = ['estimated_points', 'completed_points']
             points_data = points_data.reset_index()
             
@@ -495,9 +507,8 @@ def render_performance_dashboard(df):
             st.plotly_chart(fig, use_container_width=True)
         
         # Workload distribution
-        if 'assignee' in filtered_df.columns:
-            workload_data = filtered_df['assignee'].value_counts().reset_index()
-            workload_data.columns = ['assignee', 'assigned_issues']
+        if 'assignee' in df.columns:
+            workload_data = by_person['issues'].rename('assigned_issues').reset_index()
             
             fig = px.pie(
                 workload_data,
@@ -513,29 +524,23 @@ def render_performance_dashboard(df):
     st.markdown("---")
     st.markdown('<div class="section-header">📋 Detailed Performance Table</div>', unsafe_allow_html=True)
     
-    if 'assignee' in filtered_df.columns:
-        performance_metrics = []
+    if 'assignee' in df.columns:
+        in_progress = cube.by('assignee', status='In Progress', **perf_filter)['issues']
+        performance_metrics = {
+            'Team Member': by_person.index,
+            'Total Assigned': by_person['issues'],
+            'Completed': by_person['completed_issues'],
+            'In Progress': in_progress.reindex(by_person.index, fill_value=0),
+            'Completion Rate': (by_person['completed_issues'] / by_person['issues'] * 100).map('{:.1f}%'.format),
+        }
         
-        for person in filtered_df['assignee'].unique():
-            person_data = filtered_df[filtered_df['assignee'] == person]
-            
-            metrics = {
-                'Team Member': person,
-                'Total Assigned': len(person_data),
-                'Completed': len(person_data[person_data['status'] == 'Done']),
-                'In Progress': len(person_data[person_data['status'] == 'In Progress']),
-                'Completion Rate': f"{(len(person_data[person_data['status'] == 'Done']) / len(person_data) * 100):.1f}%"
-            }
-            
-            if 'estimate' in filtered_df.columns:
-                metrics['Total Points'] = person_data['estimate'].sum()
-                metrics['Completed Points'] = person_data[person_data['status'] == 'Done']['estimate'].sum()
-            
-            if 'cycle_time_days' in filtered_df.columns:
-                avg_cycle = person_data['cycle_time_days'].mean()
-                metrics['Avg Cycle Time'] = f"{avg_cycle:.1f} days" if not pd.isna(avg_cycle) else "N/A"
-            
-            performance_metrics.append(metrics)
+        if 'estimate' in df.columns:
+            performance_metrics['Total Points'] = by_person['total_points']
+            performance_metrics['Completed Points'] = by_person['completed_points']
+        
+        if 'cycle_time_days' in df.columns:
+            performance_metrics['Avg Cycle Time'] = by_person['mean_cycle_time'].map(
+                lambda avg_cycle: f"{avg_cycle:.1f} days" if not pd.isna(avg_cycle) else "N/A")
         
         performance_df = pd.DataFrame(performance_metrics)
         st.dataframe(performance_df, use_container_width=True, hide_index=True)